@@ -5,7 +5,9 @@ import pytest
 pytest_plugins = [
     # Plugins
     'pytest_plugins.auto_vault',
+    'pytest_plugins.collection_plan',
     'pytest_plugins.disable_rp_params',
+    'pytest_plugins.duration_scheduling',
     'pytest_plugins.external_logging',
     'pytest_plugins.fixture_markers',
     'pytest_plugins.infra_dependent_markers',
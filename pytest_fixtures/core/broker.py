@@ -1,4 +1,5 @@
 from contextlib import contextmanager
+from functools import cache
 
 from box import Box
 from broker import Broker
@@ -7,6 +8,7 @@ import pytest
 from robottelo.config import settings
 from robottelo.exceptions import ContentHostError
 from robottelo.hosts import Satellite, lru_sat_ready_rhel
+from robottelo.utils import satellite_scheduler
 
 
 @pytest.fixture(scope='session')
@@ -20,6 +22,14 @@ def _default_sat(align_to_satellite):
     return None
 
 
+@cache
+def _moved_sat(hostname):
+    try:
+        return Satellite.get_host_by_hostname(hostname)
+    except ContentHostError:
+        return Satellite(hostname)
+
+
 @contextmanager
 def _target_sat_imp(request, _default_sat, satellite_factory):
     """This is the actual working part of the following target_sat fixtures"""
@@ -34,6 +44,9 @@ def _target_sat_imp(request, _default_sat, satellite_factory):
         settings.set('server.hostname', installer_sat.hostname)
         yield installer_sat
     else:
+        if _default_sat and satellite_scheduler.moved_hostname not in (None, _default_sat.hostname):
+            # the worker was moved to another Satellite by the load-aware xdist behavior
+            _default_sat = _moved_sat(satellite_scheduler.moved_hostname)
         if _default_sat:
             _default_sat.enable_satellite_ipv6_http_proxy()
         yield _default_sat
@@ -12,13 +12,17 @@ from robottelo import constants
 from robottelo.config import settings
 from robottelo.enums import NetworkType
 from robottelo.hosts import ContentHost, Satellite
+from robottelo.utils import host_pool
 
 
 def host_conf(request):
     """A function that returns arguments for Broker host deployment"""
-    conf = params = {}
-    if hasattr(request, 'param'):
-        params = request.param
+    return host_conf_from_params(getattr(request, 'param', {}), request.config, request.node)
+
+
+def host_conf_from_params(params, config, node):
+    """Return the arguments for Broker host deployment of the fixture parameters of a test node"""
+    conf = {}
     distro = params.get('distro', 'rhel')
     network = params.get('network')
     _rhelver = f"{distro}{params.get('rhel_version', settings.content_host.default_rhel_version)}"
@@ -27,9 +31,9 @@ def host_conf(request):
     deploy_kwargs = {}
     if not any(
         [
-            request.config.getoption('no_containers'),
+            config.getoption('no_containers'),
             params.get('no_containers'),
-            request.node.get_closest_marker('no_containers'),
+            node.get_closest_marker('no_containers'),
         ]
     ):
         deploy_kwargs = settings.content_host.get(_rhelver).to_dict().get('container', {})
@@ -52,8 +56,12 @@ def rhel_contenthost(request):
     """A function-level fixture that provides a content host object parametrized"""
     # Request should be parametrized through pytest_fixtures.fixture_markers
     # unpack params dict
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
-        yield host
+    if pool := host_pool.get_pool():
+        with pool.host(host_conf(request)) as host:
+            yield host
+    else:
+        with Broker(**host_conf(request), host_class=ContentHost) as host:
+            yield host
 
 
 @pytest.fixture(scope='module')
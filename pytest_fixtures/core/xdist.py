@@ -1,6 +1,8 @@
 """Fixtures specific to or relating to pytest's xdist plugin"""
 
+import os
 import random
+import time
 
 from broker import Broker
 import pytest
@@ -8,6 +10,48 @@ import pytest
 from robottelo.config import configure_airgun, configure_nailgun, settings
 from robottelo.hosts import ContentHost, Satellite
 from robottelo.logging import logger
+from robottelo.utils import satellite_scheduler
+
+# session fixtures that keep nothing created on the Satellite a worker is assigned to,
+# any other session fixture of robottelo prevents the worker from moving to another one
+MOVABLE_SESSION_FIXTURES = {
+    'align_to_satellite',
+    '_default_sat',
+    'satellite_factory',
+    'capsule_factory',
+}
+
+_bound_session_fixtures = set()
+_tests_run = 0
+
+
+def _scheduler_session_id(config):
+    """Return the id shared by the xdist workers of the session"""
+    if workerinput := getattr(config, 'workerinput', None):
+        return workerinput['testrunuid']
+    return str(os.getpid())
+
+
+@pytest.hookimpl
+def pytest_fixture_setup(fixturedef, request):
+    """Remember the session fixtures bound to the Satellite of the worker"""
+    if (
+        fixturedef.scope == 'session'
+        and fixturedef.argname not in MOVABLE_SESSION_FIXTURES
+        and fixturedef.func.__module__.startswith(('pytest_fixtures', 'tests'))
+    ):
+        _bound_session_fixtures.add(fixturedef.argname)
+
+
+@pytest.hookimpl
+def pytest_fixture_post_finalizer(fixturedef, request):
+    _bound_session_fixtures.discard(fixturedef.argname)
+
+
+@pytest.hookimpl
+def pytest_runtest_logfinish(nodeid, location):
+    global _tests_run
+    _tests_run += 1
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -27,6 +71,7 @@ def align_to_satellite(request, worker_id, satellite_factory):
         # clear any hostname that may have been previously set
         settings.set("server.hostname", None)
         on_demand_sat = None
+        hosts = []
 
         worker_pos = 0 if worker_id in ["master", "local"] else int(worker_id.replace("gw", ""))
 
@@ -46,6 +91,20 @@ def align_to_satellite(request, worker_id, satellite_factory):
         # attempt to align a worker to a satellite
         if settings.server.xdist_behavior == 'run-on-one' and settings.server.hostnames:
             settings.set("server.hostname", settings.server.hostnames[0])
+        elif settings.server.xdist_behavior == 'load-aware' and settings.server.hostnames:
+            flavors = {
+                host.hostname: getattr(host, '_broker_args', {}).get('deploy_flavor')
+                for host in hosts
+            }
+            settings.set(
+                "server.hostname",
+                satellite_scheduler.assign(
+                    _scheduler_session_id(request.config),
+                    worker_id,
+                    settings.server.hostnames,
+                    flavors=flavors,
+                ),
+            )
         elif settings.server.hostnames and worker_pos < len(settings.server.hostnames):
             settings.set("server.hostname", settings.server.hostnames[worker_pos])
         elif settings.server.xdist_behavior == 'balance' and settings.server.hostnames:
@@ -67,7 +126,36 @@ def align_to_satellite(request, worker_id, satellite_factory):
             configure_airgun()
             configure_nailgun()
         yield
+        if settings.server.xdist_behavior == 'load-aware':
+            satellite_scheduler.release(_scheduler_session_id(request.config), worker_id)
         if on_demand_sat and settings.server.auto_checkin:
             logger.info(f'{worker_id=}: Checking in on-demand Satellite {on_demand_sat.hostname}')
             on_demand_sat.teardown()
             Broker(hosts=[on_demand_sat]).checkin()
+
+
+@pytest.fixture(scope='module', autouse=True)
+def rebalance_satellite(request, worker_id, align_to_satellite):
+    """Move the worker to a less loaded Satellite between test modules
+
+    Only with the load-aware xdist behavior, and when the worker holds no session fixture
+    bound to its current Satellite. The duration of the module is reported to the scheduler.
+    """
+    if settings.server.xdist_behavior != 'load-aware' or not settings.server.hostname:
+        yield
+        return
+    session_id = _scheduler_session_id(request.config)
+    if not _bound_session_fixtures:
+        hostname = satellite_scheduler.rebalance(session_id, worker_id, settings.server.hostnames)
+        if hostname and hostname != settings.server.hostname:
+            logger.info(f'{worker_id=}: Worker was moved to hostname {hostname}')
+            settings.set("server.hostname", hostname)
+            satellite_scheduler.moved_hostname = hostname
+            configure_airgun()
+            configure_nailgun()
+    hostname = settings.server.hostname
+    start, tests_run = time.monotonic(), _tests_run
+    yield
+    satellite_scheduler.report(
+        session_id, hostname, time.monotonic() - start, _tests_run - tests_run
+    )
@@ -0,0 +1,18 @@
+"""Share the collection plan of the expensive collection hooks between the xdist workers
+
+See ``robottelo/utils/collection_plan.py``.
+"""
+
+from robottelo.utils import collection_plan
+
+
+def pytest_collection_finish(session):
+    """Write the plan recorded by this worker, so the waiting workers can replay it"""
+    if plan := collection_plan.get_plan(session.config):
+        plan.write()
+
+
+def pytest_unconfigure(config):
+    """Let the next worker plan the collection when this one failed to"""
+    if collection_plan._plan is not None:
+        collection_plan._plan.release()
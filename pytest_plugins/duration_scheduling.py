@@ -0,0 +1,124 @@
+"""Schedule the tests on the xdist workers longest first, from the durations of past sessions
+
+Enabled with ``performance.duration_scheduling``, replacing the ``--dist`` mode. The durations
+are recorded by the controller, or by the only process without xdist, and stored at the end of
+the session. See ``robottelo/utils/duration_history.py``.
+"""
+
+import os
+import time
+
+import pytest
+from xdist.scheduler import LoadScopeScheduling
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils import duration_history
+
+_durations = {}
+_scheduler = None
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """Send the work units of :func:`duration_history.work_units` longest first
+
+    Like ``--dist loadscope``, a work unit runs on one worker, and a free worker gets the next
+    unit of the queue.
+    """
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.history = duration_history.load()
+        self.units = {}
+        self.predicted_makespan = None
+        self.start_time = None
+
+    def _split_scope(self, nodeid):
+        return self.units.get(nodeid) or super()._split_scope(nodeid)
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # Initial distribution already happened, reschedule on all nodes
+        if self.collection is not None:
+            for node in self.nodes:
+                self._reschedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log('**Different tests collected, aborting run**')
+            return
+
+        self.collection = list(next(iter(self.registered_collections.values())))
+        if not self.collection:
+            return
+
+        units = duration_history.work_units(self.collection, self.history)
+        for unit, _, nodeids in units:
+            self.workqueue[unit] = dict.fromkeys(nodeids, False)
+            self.units.update(dict.fromkeys(nodeids, unit))
+        self.predicted_makespan = duration_history.makespan(
+            [duration for _, duration, _ in units], min(len(self.nodes), len(units))
+        )
+        self.start_time = time.monotonic()
+        self.log(f'Predicted makespan: {self.predicted_makespan:.0f}s')
+
+        # Avoid having more workers than work
+        for _ in range(len(self.nodes) - len(self.workqueue)):
+            unused_node, _ = self.assigned_work.popitem()
+            self.log(f'Shutting down unused node {unused_node}')
+            unused_node.shutdown()
+
+        for node in self.nodes:
+            self._assign_work_unit(node)
+        for node in self.nodes:
+            self._reschedule(node)
+
+        if not self.workqueue:
+            for node in self.nodes:
+                node.shutdown()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    global _scheduler
+    if settings.performance.duration_scheduling:
+        _scheduler = DurationScheduling(config, log)
+        return _scheduler
+    return None
+
+
+def pytest_runtest_logreport(report):
+    """Add the duration of each phase of a test, including its fixtures setup and teardown"""
+    if not settings.performance.duration_scheduling or os.environ.get('PYTEST_XDIST_WORKER'):
+        return
+    test = _durations.setdefault(report.nodeid, {'duration': 0.0, 'heavy': False, 'worker': None})
+    test['duration'] += report.duration
+    test['heavy'] = test['heavy'] or any(
+        marker in report.keywords for marker in duration_history.HEAVY_MARKERS
+    )
+    if node := getattr(report, 'node', None):
+        test['worker'] = node.gateway.id
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report the predicted and actual makespans, and store the durations of the session"""
+    if not _durations or hasattr(config, 'workerinput'):
+        return
+    busy = {}
+    for test in _durations.values():
+        busy[test['worker']] = busy.get(test['worker'], 0.0) + test['duration']
+    summary = f'busiest worker {max(busy.values()):.0f}s'
+    if _scheduler is not None and _scheduler.start_time is not None:
+        summary = (
+            f'predicted makespan {_scheduler.predicted_makespan:.0f}s, '
+            f'actual {time.monotonic() - _scheduler.start_time:.0f}s, {summary}'
+        )
+    terminalreporter.write_line(f'Duration scheduling: {summary}')
+    logger.info(f'Duration scheduling: {summary}')
+    duration_history.update(
+        {
+            nodeid: {'duration': test['duration'], 'heavy': test['heavy']}
+            for nodeid, test in _durations.items()
+        }
+    )
@@ -1,10 +1,14 @@
+from collections import Counter
 from inspect import getmembers, isfunction
+import math
+import os
 import re
 
 import pytest
 
 from robottelo.config import settings
 from robottelo.enums import NetworkType
+from robottelo.utils import host_pool
 
 TARGET_FIXTURES = {
     'rhel_contenthost',
@@ -197,6 +201,40 @@ def pytest_collection_modifyitems(session, items, config):
                 )
 
 
+def pytest_collection_finish(session):
+    """Start the warm pool of content hosts for the ``rhel_contenthost`` tests to run
+
+    Each xdist worker collects all the tests but runs a share of them, so it expects its share of
+    the hosts of each configuration.
+    """
+    size = settings.content_host.warm_pool.size
+    if not size or session.config.option.collectonly:
+        return
+    from pytest_fixtures.core.contenthosts import host_conf_from_params
+
+    demand = Counter()
+    confs = {}
+    for item in session.items:
+        if hasattr(item, 'callspec') and 'rhel_contenthost' in item.callspec.params:
+            conf = host_conf_from_params(
+                item.callspec.params['rhel_contenthost'], session.config, item
+            )
+            key = host_pool.pool_key(conf)
+            confs[key] = conf
+            demand[key] += 1
+    if not demand:
+        return
+    workers = int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', 1))
+    pool = host_pool.start(size)
+    for key, count in demand.items():
+        pool.add_demand(confs[key], math.ceil(count / workers))
+
+
+def pytest_sessionfinish(session):
+    """Check in the content hosts of the warm pool"""
+    host_pool.stop()
+
+
 def pytest_addoption(parser):
     """Add CLI options related to Host-related mark collection"""
     parser.addoption(
@@ -1,10 +1,8 @@
 from collections import defaultdict
-import inspect
-import re
 
 import pytest
 
-from robottelo.utils import slugify_component
+from robottelo.utils import collection_index, collection_plan, slugify_component
 from robottelo.utils.issue_handlers import (
     add_workaround,
     should_deselect,
@@ -17,6 +15,7 @@ def pytest_configure(config):
 
 
 @pytest.hookimpl(trylast=True)
+@collection_plan.planned('issue_handlers', attributes=['issue_data'])
 def pytest_collection_modifyitems(session, items, config):
     """Generate the issue collection
     This collection includes pre-processed `is_open` status for each issue
@@ -25,27 +24,11 @@ def pytest_collection_modifyitems(session, items, config):
     pytest.issue_data = generate_issue_collection(items, config)
 
 
-IS_OPEN = re.compile(
-    # To match `if is_open('SAT:123456'):`
-    r"\s*if\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-NOT_IS_OPEN = re.compile(
-    # To match `if not is_open('SAT:123456'):`
-    r"\s*if\snot\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-COMPONENT = re.compile(
-    # To match :CaseComponent: FooBar
-    r"\s*:CaseComponent:\s*(?P<component>\S*)",
-    re.IGNORECASE,
-)
-
-IMPORTANCE = re.compile(
-    # To match :CaseImportance: Critical
-    r"\s*:CaseImportance:\s*(?P<importance>\S*)",
-    re.IGNORECASE,
-)
+# the sources are searched by robottelo.utils.collection_index
+IS_OPEN = collection_index.WORKAROUND_REGEXES['is_open']
+NOT_IS_OPEN = collection_index.WORKAROUND_REGEXES['not is_open']
+COMPONENT = collection_index.TOKEN_REGEXES['component']
+IMPORTANCE = collection_index.TOKEN_REGEXES['importance']
 
 
 def generate_issue_collection(items, config):  # pragma: no cover
@@ -135,8 +118,7 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 deselect_data[item.location] = issue_key
 
         # Then take the workarounds using `is_open` helper.
-        source = inspect.getsource(item.function)
-        if 'is_open(' in source:
+        if usages := collection_index.workarounds(item.function):
             kwargs = {
                 'filepath': filepath,
                 'lineno': lineno,
@@ -145,17 +127,13 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 'importance': importance_mark,
                 'component_mark': component_slug,
             }
-            add_workaround(collected_data, IS_OPEN.findall(source), 'is_open', **kwargs)
-            add_workaround(collected_data, NOT_IS_OPEN.findall(source), 'not is_open', **kwargs)
+            add_workaround(collected_data, usages['is_open'], 'is_open', **kwargs)
+            add_workaround(collected_data, usages['not is_open'], 'not is_open', **kwargs)
 
     # Take uses of `is_open` from outside of test cases e.g: SetUp methods
     for test_module in test_modules:
-        module_source = inspect.getsource(test_module)
-        component_matches = COMPONENT.findall(module_source)
-        module_component = None
-        if component_matches:
-            module_component = component_matches[0]
-        if 'is_open(' in module_source:
+        module_component = collection_index.module_component(test_module)
+        if usages := collection_index.workarounds(test_module):
             kwargs = {
                 'filepath': test_module.__file__,
                 'lineno': 1,
@@ -168,14 +146,14 @@ def generate_issue_collection(items, config):  # pragma: no cover
 
             add_workaround(
                 collected_data,
-                IS_OPEN.findall(module_source),
+                usages['is_open'],
                 'is_open',
                 validation=validation,
                 **kwargs,
             )
             add_workaround(
                 collected_data,
-                NOT_IS_OPEN.findall(module_source),
+                usages['not is_open'],
                 'not is_open',
                 validation=validation,
                 **kwargs,
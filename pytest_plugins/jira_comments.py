@@ -1,4 +1,5 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import os
 
 import pytest
@@ -7,7 +8,11 @@ from robottelo.config import settings
 from robottelo.constants import JIRA_TESTS_FAILED_LABEL, JIRA_TESTS_PASSED_LABEL
 from robottelo.logging import logger
 from robottelo.utils import parse_comma_separated_list
-from robottelo.utils.issue_handlers.jira import add_comment_on_jira, get_single_jira
+from robottelo.utils.issue_handlers.jira import (
+    add_comment_on_jira,
+    get_data_jira_bulk,
+    get_single_jira,
+)
 
 
 def pytest_addoption(parser):
@@ -89,51 +94,70 @@ def escape_special_characters(text):
     return text
 
 
+def comment_on_issue(issue, tests, data):
+    """Add the results of the tests linked with the issue as a comment, and update its labels"""
+    user = os.environ.get('USER')
+    build_url = os.environ.get('BUILD_URL')
+    # Sort test result based on the outcome.
+    tests.sort(key=lambda x: x['outcome'])
+    all_tests_passed = True
+    comment_body = (
+        f'This is an automated comment from job/user: {build_url if build_url else user} for a Robottelo test run.\n'
+        f'Satellite/Capsule: {settings.server.version.release} Snap: {settings.server.version.snap} \n'
+        f'Result for tests linked with issue: {issue} \n'
+    )
+    for item in tests:
+        color_code = '{color:green}'
+        if item['outcome'] == 'failed':
+            all_tests_passed = False
+            color_code = '{color:red}'
+        # Color code test outcome
+        color_coded_result = f'{color_code}{item["outcome"]}{{color}}'
+        # Escape special characters in the node_id.
+        escaped_node_id = escape_special_characters(item['nodeid'])
+        comment_body += f'{escaped_node_id} : {color_coded_result} \n'
+    try:
+        labels = (
+            [{'add': JIRA_TESTS_PASSED_LABEL}, {'remove': JIRA_TESTS_FAILED_LABEL}]
+            if all_tests_passed
+            else [{'add': JIRA_TESTS_FAILED_LABEL}, {'remove': JIRA_TESTS_PASSED_LABEL}]
+        )
+        data = data or get_single_jira(issue)
+        # Initially set a Pass/Fail label based on the test result
+        # If the state changes add a comment
+        # If the state is already failing, and test is failing, still add a comment
+        # If the state is already passing, and the test passes, don’t add a comment
+        if (data['status'] in settings.jira.issue_status) and (
+            not all_tests_passed or JIRA_TESTS_PASSED_LABEL not in data['labels']
+        ):
+            add_comment_on_jira(issue, comment_body, labels=labels)
+        else:
+            logger.warning(
+                f'Jira comments are currently disabled for {issue} issue. '
+                f'It could be because jira is in {data["status"]} state or that there are no failing tests. \n'
+                'Please update issue_status in jira.conf to override this behaviour.'
+            )
+    except Exception as e:
+        # Handle any errors in adding comments to Jira
+        logger.warning(f'Failed to add comment to Jira issue {issue}: {e}')
+
+
 def pytest_sessionfinish(session, exitstatus):
-    """Add test result comment to related Jira issues."""
+    """Add test result comment to related Jira issues.
+
+    The issues are fetched at once, then commented by ``jira.max_workers`` threads, a failure
+    on one issue doesn't prevent commenting on the others.
+    """
     if hasattr(session.config, 'issue_to_tests_map'):
-        user = os.environ.get('USER')
-        build_url = os.environ.get('BUILD_URL')
-        for issue in session.config.issue_to_tests_map:
-            # Sort test result based on the outcome.
-            session.config.issue_to_tests_map[issue].sort(key=lambda x: x['outcome'])
-            all_tests_passed = True
-            comment_body = (
-                f'This is an automated comment from job/user: {build_url if build_url else user} for a Robottelo test run.\n'
-                f'Satellite/Capsule: {settings.server.version.release} Snap: {settings.server.version.snap} \n'
-                f'Result for tests linked with issue: {issue} \n'
-            )
-            for item in session.config.issue_to_tests_map[issue]:
-                color_code = '{color:green}'
-                if item['outcome'] == 'failed':
-                    all_tests_passed = False
-                    color_code = '{color:red}'
-                # Color code test outcome
-                color_coded_result = f'{color_code}{item["outcome"]}{{color}}'
-                # Escape special characters in the node_id.
-                escaped_node_id = escape_special_characters(item['nodeid'])
-                comment_body += f'{escaped_node_id} : {color_coded_result} \n'
-            try:
-                labels = (
-                    [{'add': JIRA_TESTS_PASSED_LABEL}, {'remove': JIRA_TESTS_FAILED_LABEL}]
-                    if all_tests_passed
-                    else [{'add': JIRA_TESTS_FAILED_LABEL}, {'remove': JIRA_TESTS_PASSED_LABEL}]
-                )
-                data = get_single_jira(issue)
-                # Initially set a Pass/Fail label based on the test result
-                # If the state changes add a comment
-                # If the state is already failing, and test is failing, still add a comment
-                # If the state is already passing, and the test passes, don’t add a comment
-                if (data['status'] in settings.jira.issue_status) and (
-                    not all_tests_passed or JIRA_TESTS_PASSED_LABEL not in data['labels']
-                ):
-                    add_comment_on_jira(issue, comment_body, labels=labels)
-                else:
-                    logger.warning(
-                        f'Jira comments are currently disabled for {issue} issue. '
-                        f'It could be because jira is in {data["status"]} state or that there are no failing tests. \n'
-                        'Please update issue_status in jira.conf to override this behaviour.'
-                    )
-            except Exception as e:
-                # Handle any errors in adding comments to Jira
-                logger.warning(f'Failed to add comment to Jira issue {issue}: {e}')
+        issue_to_tests_map = session.config.issue_to_tests_map
+        try:
+            issues_data = get_data_jira_bulk(issue_to_tests_map)
+        except Exception as e:
+            # Each issue is fetched with its comment
+            logger.warning(f'Failed to fetch the Jira issues to comment on: {e}')
+            issues_data = {}
+        with ThreadPoolExecutor(
+            max_workers=settings.jira.max_workers, thread_name_prefix='jira_comments'
+        ) as executor:
+            for issue, tests in issue_to_tests_map.items():
+                executor.submit(comment_on_issue, issue, tests, issues_data.get(issue.strip()))
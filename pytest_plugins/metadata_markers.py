@@ -1,13 +1,11 @@
 import datetime
-import inspect
-import re
 
 import pytest
 
 from robottelo.config import settings
 from robottelo.hosts import get_sat_rhel_version
 from robottelo.logging import collection_logger as logger
-from robottelo.utils import parse_comma_separated_list
+from robottelo.utils import collection_index, collection_plan, parse_comma_separated_list
 from robottelo.utils.issue_handlers.jira import are_any_jira_open
 
 FMT_XUNIT_TIME = '%Y-%m-%dT%H:%M:%S'
@@ -63,35 +61,12 @@ def pytest_configure(config):
         config.addinivalue_line("markers", marker)
 
 
-component_regex = re.compile(
-    # To match :CaseComponent: FooBar
-    r'\s*:CaseComponent:\s*(?P<component>\S*)',
-    re.IGNORECASE,
-)
-
-importance_regex = re.compile(
-    # To match :CaseImportance: Critical
-    r'\s*:CaseImportance:\s*(?P<importance>\S*)',
-    re.IGNORECASE,
-)
-
-team_regex = re.compile(
-    # To match :Team: Rocket
-    r'\s*:Team:\s*(?P<team>\S*)',
-    re.IGNORECASE,
-)
-
-blocked_by_regex = re.compile(
-    # To match :BlockedBy: SAT-32932
-    r'\s*:BlockedBy:\s*(?P<blocked_by>.*\S*)',
-    re.IGNORECASE,
-)
-
-verifies_regex = re.compile(
-    # To match :Verifies: SAT-32932
-    r'\s*:Verifies:\s*(?P<verifies>.*\S*)',
-    re.IGNORECASE,
-)
+# testimony token regexes, the docstrings are parsed by robottelo.utils.collection_index
+component_regex = collection_index.TOKEN_REGEXES['component']
+importance_regex = collection_index.TOKEN_REGEXES['importance']
+team_regex = collection_index.TOKEN_REGEXES['team']
+blocked_by_regex = collection_index.TOKEN_REGEXES['blocked_by']
+verifies_regex = collection_index.TOKEN_REGEXES['verifies']
 
 
 def handle_verification_issues(item, verifies_marker, verifies_issues):
@@ -134,6 +109,7 @@ def log_and_deselect(item, option):
 
 
 @pytest.hookimpl(tryfirst=True)
+@collection_plan.planned('metadata_markers')
 def pytest_collection_modifyitems(items, config):
     """Add markers and user_properties for testimony token metadata
 
@@ -170,30 +146,26 @@ def pytest_collection_modifyitems(items, config):
 
         # apply the marks for importance, component, and team
         # Find matches from docstrings starting at smallest scope
-        item_docstrings = [
-            d
-            for d in map(inspect.getdoc, (item.function, getattr(item, 'cls', None), item.module))
-            if d is not None
+        # the tokens of each docstring are read from the persistent collection index
+        item_docstring_tokens = [
+            collection_index.docstring_tokens(obj)
+            for obj in (item.function, getattr(item, 'cls', None), item.module)
+            if obj is not None
         ]
+        item_mark_names = {m.name for m in item.iter_markers()}
         blocked_by_marks_to_add = []
         verifies_marks_to_add = []
-        for docstring in item_docstrings:
-            item_mark_names = [m.name for m in item.iter_markers()]
+        for doc_tokens in item_docstring_tokens:
             # Add marker starting at smallest docstring scope
             # only add the mark if it hasn't already been applied at a lower scope
-            doc_component = component_regex.findall(docstring)
-            if doc_component and 'component' not in item_mark_names:
-                item.add_marker(pytest.mark.component(doc_component[0].lower()))
-            doc_importance = importance_regex.findall(docstring)
-            if doc_importance and 'importance' not in item_mark_names:
-                item.add_marker(pytest.mark.importance(doc_importance[0].lower()))
-            doc_team = team_regex.findall(docstring)
-            if doc_team and 'team' not in item_mark_names:
-                item.add_marker(pytest.mark.team(doc_team[0].lower()))
-            doc_verifies = verifies_regex.findall(docstring)
+            for name in ('component', 'importance', 'team'):
+                if name in doc_tokens and name not in item_mark_names:
+                    item.add_marker(getattr(pytest.mark, name)(doc_tokens[name][0].lower()))
+                    item_mark_names.add(name)
+            doc_verifies = doc_tokens.get('verifies')
             if doc_verifies and 'verifies_issues' not in item_mark_names:
                 verifies_marks_to_add.extend(str(b.strip()) for b in doc_verifies[-1].split(','))
-            doc_blocked_by = blocked_by_regex.findall(docstring)
+            doc_blocked_by = doc_tokens.get('blocked_by')
             if doc_blocked_by and 'blocked_by' not in item_mark_names:
                 blocked_by_marks_to_add.extend(
                     str(b.strip()) for b in doc_blocked_by[-1].split(',')
@@ -3,6 +3,7 @@ import pytest
 from robottelo.config import settings
 from robottelo.hosts import get_sat_version
 from robottelo.logging import logger
+from robottelo.utils import collection_plan, normalize_nodeid, normalized_item_name
 from robottelo.utils.report_portal.portal import ReportPortal
 
 
@@ -67,6 +68,7 @@ def pytest_addoption(parser):
 
 
 @pytest.hookimpl(tryfirst=True)
+@collection_plan.planned('rerun_rp')
 def pytest_collection_modifyitems(items, config):
     """
     Collects and modifies test collection based on the pytest options to select the tests marked as
@@ -137,15 +139,12 @@ def pytest_collection_modifyitems(items, config):
     test_args['paths'] = config.args
     for ref_launch in ref_launches:
         _validate_launch(ref_launch)
-        tests.extend(rp.get_tests(launch=ref_launch, **test_args))
+        tests.extend(rp.get_tests(launch=ref_launch, fields=['name'], **test_args))
     # remove inapplicable tests from the current test collection
-    deselected = [
-        i
-        for i in items
-        if f'{i.location[0]}.{i.location[2]}'.replace('::', '.')
-        not in [t['name'].replace('::', '.') for t in tests]
-    ]
-    selected = list(set(items) - set(deselected))
+    rp_test_names = {normalize_nodeid(test['name']) for test in tests}
+    selected, deselected = [], []
+    for item in items:
+        (selected if normalized_item_name(item) in rp_test_names else deselected).append(item)
     logger.debug(
         f'Selected {len(selected)} and deselected {len(deselected)} tests based on latest/given-/ '
         'launch test results.'
@@ -63,7 +63,8 @@ def pytest_collection_modifyitems(items, config):
             'Modifying test collection based on --select-random-tests pytest option. '
             f'Tests collected: {len(items)}, Tests to select randomly: {select_random_tests}, Seed value: {random_seed}'
         )
-        deselected = [item for item in items if item not in selected]
+        selected_items = set(selected)
+        deselected = [item for item in items if item not in selected_items]
         # selected will be empty if no filter option was passed, defaulting to full items list
         items[:] = selected if deselected else items
         config.hook.pytest_deselected(items=deselected)
@@ -1,11 +1,14 @@
 """Generic base class for cli hammer commands."""
 
 import re
+import time
 
+from broker.helpers import Result, translate_timeout
 from wait_for import wait_for
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import hammer, hammer_daemon, schema
+from robottelo.cli.batch import HammerBatch
 from robottelo.config import settings
 from robottelo.exceptions import CLIDataBaseError, CLIError, CLIReturnCodeError
 from robottelo.logging import logger
@@ -24,6 +27,7 @@ class Base:
     command_end = None  # extending commands like for directory to pass
     command_requires_org = False  # True when command requires organization-id
     hostname = None  # Now used for Satellite class hammer execution
+    paginate_exists = False  # True when exists() may only ask list() for the first record
     logger = logger
     _db_error_regex = re.compile(r'.*INSERT INTO|.*SELECT .*FROM|.*violates foreign key')
 
@@ -172,6 +176,20 @@ class Base:
 
         return (username, password)
 
+    @classmethod
+    def _hammer_arguments(cls, command, user=None, password=None, output_format=None):
+        """Return the hammer arguments running ``command`` with the right credentials"""
+        if cls.omitting_credentials:
+            user, password = None, None
+        else:
+            user, password = cls._get_username_password(user, password)
+        return '-v {} {} {} {}'.format(
+            f'-u {user}' if user else "--interactive no",
+            f'-p {password}' if password else "",
+            f'--output={output_format}' if output_format else "",
+            command,
+        )
+
     @classmethod
     def execute(
         cls,
@@ -185,31 +203,53 @@ class Base:
         return_raw_response=None,
     ):
         """Executes the cli ``command`` on the server via ssh"""
-        if cls.omitting_credentials:
-            user, password = None, None
-        else:
-            user, password = cls._get_username_password(user, password)
         time_hammer = settings.performance.time_hammer
-
-        # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
-            settings.robottelo.locale,
-            'time -p' if time_hammer else '',
-            f'-u {user}' if user else "--interactive no",
-            f'-p {password}' if password else "",
-            f'--output={output_format}' if output_format else "",
-            command,
-        )
+        hostname = hostname or cls.hostname or settings.server.hostname
+        hammer_args = cls._hammer_arguments(command, user, password, output_format)
+        backend = settings.performance.hammer_backend
+        if backend == 'daemon' and not hammer_daemon.install(hostname):
+            backend = 'ssh'
+        if backend == 'daemon':
+            timeout_ms = translate_timeout(
+                settings.server.ssh_client.command_timeout if timeout is None else timeout
+            )
+            cmd = hammer_daemon.build_command(
+                hammer_args,
+                locale=settings.robottelo.locale,
+                idle_timeout=settings.performance.hammer_daemon_idle_timeout,
+                timeout=max(timeout_ms // 1000, 1),
+            )
+        else:
+            # add time to measure hammer performance
+            cmd = 'LANG={} {} hammer {}'.format(
+                settings.robottelo.locale,
+                'time -p' if time_hammer else '',
+                hammer_args,
+            )
+        start = time.monotonic()
         response = ssh.command(
             cmd,
-            hostname=hostname or cls.hostname or settings.server.hostname,
+            hostname=hostname,
             output_format=output_format,
             timeout=timeout,
         )
+        if time_hammer:
+            cls.logger.info(
+                f'hammer {cls.command_base} {cls.command_sub} took '
+                f'{time.monotonic() - start:.3f}s using the {backend} backend'
+            )
         if return_raw_response:
             return response
         return cls._handle_response(response, ignore_stderr=ignore_stderr)
 
+    @classmethod
+    def batch(cls, timeout=None, raise_on_error=True):
+        """Return a :class:`robottelo.cli.batch.HammerBatch` running on this class hostname
+
+        Commands added to the batch are executed in a single ssh call when the context exits.
+        """
+        return HammerBatch(hostname=cls.hostname, timeout=timeout, raise_on_error=raise_on_error)
+
     @classmethod
     def sm_execute(cls, command, hostname=None, timeout=None, **kwargs):
         """Executes the satellite-maintain cli commands on the server via ssh"""
@@ -235,6 +275,10 @@ class Base:
         if search is not None and 'search' not in options:
             options.update({'search': f'{search[0]}=\\"{search[1]}\\"'})
 
+        if cls.paginate_exists:
+            # only the first match is needed, don't pull every record
+            return next(cls.paginate(options, page_size=1), [])
+
         result = cls.list(options)
         if result:
             result = result[0]
@@ -284,6 +328,66 @@ class Base:
 
         return cls.execute(cls._construct_command(options), output_format=output_format)
 
+    @classmethod
+    def paginate(cls, options=None, page_size=None, output_format='csv'):
+        """Lazily yield the records of :meth:`list`, walking ``--page`` and ``--per-page``
+
+        Pages are only requested while the records are consumed, so stopping early saves the
+        remaining calls. The last page is the first one holding less than ``page_size`` records.
+
+        :param int page_size: records per page, defaults to
+            ``settings.performance.hammer_page_size``
+        """
+        options = dict(options or {})
+        page_size = page_size or settings.performance.hammer_page_size
+        # many subclasses override list() without the output_format parameter
+        list_kwargs = {} if output_format == 'csv' else {'output_format': output_format}
+        page = 1
+        while True:
+            records = cls.list({**options, 'page': page, 'per-page': page_size}, **list_kwargs)
+            records = records or []
+            yield from records
+            if len(records) < page_size:
+                return
+            page += 1
+
+    @classmethod
+    def iter_list(
+        cls, options=None, per_page=True, output_format='csv', row_cls=dict, timeout=None
+    ):
+        """Like :meth:`list`, but yield the records while the output is being received
+
+        The output is parsed incrementally with :func:`robottelo.cli.hammer.iter_csv` or
+        :func:`robottelo.cli.hammer.iter_json`, which keeps memory flat for very large listings.
+        Errors are raised once the output is exhausted, exactly like :meth:`execute` does.
+
+        :param row_cls: ``dict``, or ``tuple`` to get compact
+            :class:`robottelo.cli.hammer.HammerRow` records sharing the normalized header
+        """
+        if output_format not in ('csv', 'json'):
+            raise CLIError(f'iter_list supports csv or json output, not {output_format}')
+        cls.command_sub = 'list'
+
+        if options is None:
+            options = {}
+
+        if 'per-page' not in options and per_page:
+            options['per-page'] = 10000
+
+        command_sub = cls.command_sub
+        hammer_args = cls._hammer_arguments(
+            cls._construct_command(options), output_format=output_format
+        )
+        output = ssh.stream(
+            f'LANG={settings.robottelo.locale} hammer {hammer_args}',
+            hostname=cls.hostname or settings.server.hostname,
+            timeout=timeout,
+        )
+        parse = hammer.iter_csv if output_format == 'csv' else hammer.iter_json
+        yield from parse(output, row_cls=row_cls)
+        cls.command_sub = command_sub
+        cls._handle_response(Result(status=output.status, stdout=[], stderr=output.stderr))
+
     @classmethod
     def puppetclasses(cls, options=None):
         """
@@ -355,19 +459,27 @@ class Base:
 
     @classmethod
     def _construct_command(cls, options=None):
-        """Build a hammer cli command based on the options passed"""
-        tail = ''
+        """Build a hammer cli command based on the options passed
 
+        When ``settings.performance.validate_hammer_options`` is enabled, the options are
+        checked against the hammer help of the Satellite first, see :mod:`robottelo.cli.schema`.
+        """
         if options is None:
             options = {}
 
+        if settings.performance.validate_hammer_options:
+            schema.validate(
+                cls.hostname or settings.server.hostname, cls.command_base, cls.command_sub, options
+            )
+
+        tail = []
         for key, val in options.items():
-            if val is None:
+            if val is None or val is False:
                 continue
             if val is True:
-                tail += f' --{key}'
-            elif val is not False:
-                if isinstance(val, list):
-                    val = ','.join(str(el) for el in val)
-                tail += f' --{key}="{val}"'
-        return f"{cls.command_base or ''} {cls.command_sub or ''} {tail.strip()} {cls.command_end or ''}"
+                tail.append(f'--{key}')
+                continue
+            if isinstance(val, list):
+                val = ','.join(str(el) for el in val)
+            tail.append(f'--{key}="{val}"')
+        return f"{cls.command_base or ''} {cls.command_sub or ''} {' '.join(tail)} {cls.command_end or ''}"
@@ -0,0 +1,254 @@
+"""Run several hammer commands in a single ssh call.
+
+Usage::
+
+    with target_sat.cli.Org.batch() as batch:
+        org = batch.add(target_sat.cli.Org, 'create', {'name': 'org1'}, output_format='csv')
+        product = batch.add(
+            target_sat.cli.Product,
+            'create',
+            {'name': 'prod1', 'organization-id': org.ref('id')},
+            output_format='csv',
+        )
+        lce = batch.add(target_sat.cli.LifecycleEnvironment, 'list', {'organization': 'Default'})
+    org.result[0]['id'], product.result[0]['name'], lce.result
+
+All the commands added to the batch are shipped to the Satellite as one shell script when the
+context exits. Their stdout, stderr and exit code are returned separately, so each
+:class:`BatchCommand` gets its result parsed with :func:`robottelo.cli.hammer.parse_csv` or
+:func:`robottelo.cli.hammer.parse_json` and checked by ``Base._handle_response``, exactly as if
+the command was run with ``Base.execute``.
+
+Options can reference a value printed by an earlier command of the same batch with
+:meth:`BatchCommand.ref`. The value is extracted on the Satellite, so dependent commands still
+run in the same ssh call. A command whose dependency failed is not run and fails with
+:data:`BATCH_SKIPPED_STATUS`.
+"""
+
+import base64
+import re
+
+from broker.helpers import Result
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.config import settings
+from robottelo.exceptions import CLIBaseError, CLIError
+from robottelo.logging import logger
+
+BATCH_DIR = '/var/tmp'
+BATCH_MARKER = '@@ROBOTTELO-BATCH'
+BATCH_SKIPPED_STATUS = 255
+
+# print the value of a key of the first record of a csv or json hammer output,
+# keys are normalized the same way as hammer.parse_csv and hammer.parse_json do
+_EXTRACT_SOURCE = (
+    'file, format, key = ARGV; data = File.read(file); '
+    'norm = ->(k) { k.to_s.tr(%q( ), %q(-)).downcase }; '
+    'if format == %q(json) then '
+    'i = data.index(%Q(\\n}\\n{)); data = data[i + 3..] if i; '
+    'row = JSON.parse(data); row = row.first if row.is_a?(Array); '
+    'else row = CSV.parse(data, headers: true).first.to_h end; '
+    'value = row.find { |k, _| norm.(k) == key }&.last; '
+    'abort(%Q(no #{key} in output of #{file})) if value.nil?; print value'
+)
+
+
+class BatchRef:
+    """A value from the output of a batched command, used as an option of a later command"""
+
+    def __init__(self, command, key):
+        self.command = command
+        self.key = key
+
+    @property
+    def variable(self):
+        key = re.sub(r'\W', '_', self.key)
+        return f'R{self.command.index}_{key}'
+
+    def __str__(self):
+        # the value is resolved by the remote shell before running the dependent command
+        return f'${{{self.variable}}}'
+
+
+class BatchCommand:
+    """A hammer command added to a :class:`HammerBatch`"""
+
+    def __init__(self, index, cli_cls, subcommand, options, output_format, command):
+        self.index = index
+        self.cli_cls = cli_cls
+        self.subcommand = subcommand
+        self.options = options
+        self.output_format = output_format
+        self.command = command
+        self.response = None
+        self.error = None
+        self._result = None
+        self.refs = [
+            value
+            for option in options.values()
+            for value in (option if isinstance(option, list) else [option])
+            if isinstance(value, BatchRef)
+        ]
+
+    def ref(self, key='id'):
+        """Reference ``key`` of the first record printed by this command
+
+        Only commands run with ``output_format`` ``csv`` or ``json`` can be referenced.
+        """
+        if self.output_format not in ('csv', 'json'):
+            raise CLIError(
+                f'Only csv or json output can be referenced, {self} uses {self.output_format}'
+            )
+        return BatchRef(self, key)
+
+    @property
+    def result(self):
+        """Parsed output of the command, raises the hammer error if the command failed"""
+        if self.error is not None:
+            raise self.error
+        if self.response is None:
+            raise CLIError(f'{self} was not executed yet')
+        return self._result
+
+    def __repr__(self):
+        return f'<BatchCommand {self.index}: {self.cli_cls.command_base} {self.subcommand}>'
+
+
+class HammerBatch:
+    """Collect hammer commands and run them in a single ssh call
+
+    :param str hostname: the Satellite to run the commands on, defaults to the hostname of the
+        first added cli class, then to ``settings.server.hostname``
+    :param int timeout: timeout of the whole batch
+    :param bool raise_on_error: raise the error of the first failed command once the batch is
+        executed, otherwise errors are only raised when accessing ``BatchCommand.result``
+    """
+
+    def __init__(self, hostname=None, timeout=None, raise_on_error=True):
+        self.hostname = hostname
+        self.timeout = timeout
+        self.raise_on_error = raise_on_error
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+
+    def add(self, cli_cls, subcommand, options=None, output_format=None):
+        """Add ``hammer <cli_cls.command_base> <subcommand> <options>`` to the batch
+
+        :return: a :class:`BatchCommand`, its ``result`` is available once the batch ran
+        """
+        options = options or {}
+        cli_cls.command_sub = subcommand
+        command = cli_cls._hammer_arguments(
+            cli_cls._construct_command(options), output_format=output_format
+        )
+        batch_command = BatchCommand(
+            len(self.commands), cli_cls, subcommand, options, output_format, command
+        )
+        for ref in batch_command.refs:
+            if ref.command not in self.commands:
+                raise CLIError(f'{batch_command} references a command from another batch')
+        self.commands.append(batch_command)
+        return batch_command
+
+    def build_script(self):
+        """Return the shell script running all the batched commands"""
+        lines = [
+            f'B=$(mktemp -d {BATCH_DIR}/robottelo-batch.XXXXXX) || exit 1',
+            f"extract() {{ ruby -rjson -rcsv -e '{_EXTRACT_SOURCE}' \"$@\"; }}",
+            'touch ' + ' '.join(f'$B/{cmd.index}.out $B/{cmd.index}.err' for cmd in self.commands),
+        ]
+        for cmd in self.commands:
+            out, err, rc = (f'$B/{cmd.index}.{ext}' for ext in ('out', 'err', 'rc'))
+            run = f'LANG={settings.robottelo.locale} hammer {cmd.command} >{out} 2>>{err}; echo $? >{rc}'
+            conditions = []
+            for ref in cmd.refs:
+                source = ref.command
+                conditions.append(
+                    f'[ "$(cat $B/{source.index}.rc)" = 0 ] && '
+                    f'{ref.variable}=$(extract $B/{source.index}.out '
+                    f'{source.output_format} {ref.key} 2>>{err})'
+                )
+            if conditions:
+                lines.append(
+                    f'if {" && ".join(conditions)}; then {run}; '
+                    f'else echo "skipped, a referenced command failed" >>{err}; '
+                    f'echo {BATCH_SKIPPED_STATUS} >{rc}; fi'
+                )
+            else:
+                lines.append(run)
+        for cmd in self.commands:
+            lines.append(
+                f'echo "{BATCH_MARKER} {cmd.index} $(cat $B/{cmd.index}.rc)"; '
+                f'base64 -w0 $B/{cmd.index}.out; echo; '
+                f'base64 -w0 $B/{cmd.index}.err; echo'
+            )
+        lines.append('rm -rf $B')
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _split_output(stdout):
+        """Return a mapping of command index to its ``(status, stdout, stderr)``
+
+        A malformed record, e.g. an empty rc file of a killed hammer or an output cut off by the
+        ssh timeout, is left out so that the command gets the batch failure.
+        """
+        outputs = {}
+        lines = stdout.splitlines()
+        for i, line in enumerate(lines):
+            if not line.startswith(BATCH_MARKER):
+                continue
+            try:
+                _, index, status = line.split()
+                outputs[int(index)] = (
+                    int(status),
+                    base64.b64decode(lines[i + 1], validate=True).decode(),
+                    base64.b64decode(lines[i + 2], validate=True).decode(),
+                )
+            except (ValueError, IndexError):
+                logger.warning(f'Ignoring malformed hammer batch output record: {line}')
+        return outputs
+
+    def _handle_command_response(self, cmd, response):
+        """Parse and check a command output the same way ``Base.execute`` does"""
+        cmd.response = response
+        if response.status == 0 and response.stdout:
+            if cmd.output_format == 'csv':
+                response.stdout = hammer.parse_csv(response.stdout)
+            elif cmd.output_format == 'json':
+                response.stdout = hammer.parse_json(response.stdout)
+        elif response.status == 0 and cmd.output_format == 'csv':
+            response.stdout = {}
+        cmd.cli_cls.command_sub = cmd.subcommand
+        try:
+            result = cmd.cli_cls._handle_response(response)
+        except CLIBaseError as err:
+            cmd.error = err
+            return
+        if cmd.subcommand == 'info' and cmd.output_format is None:
+            result = hammer.parse_info(result)
+        cmd._result = result
+
+    def execute(self):
+        """Run all the batched commands, return the list of :class:`BatchCommand`"""
+        if not self.commands:
+            return self.commands
+        hostname = self.hostname or self.commands[0].cli_cls.hostname or settings.server.hostname
+        response = ssh.command(self.build_script(), hostname=hostname, timeout=self.timeout)
+        outputs = self._split_output(response.stdout or '')
+        for cmd in self.commands:
+            status, stdout, stderr = outputs.get(
+                cmd.index, (BATCH_SKIPPED_STATUS, '', f'batch failed:\n{response.stderr}')
+            )
+            self._handle_command_response(cmd, Result(status=status, stdout=stdout, stderr=stderr))
+        if self.raise_on_error:
+            for cmd in self.commands:
+                if cmd.error is not None:
+                    raise cmd.error
+        return self.commands
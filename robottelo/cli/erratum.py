@@ -21,3 +21,4 @@ class Erratum(Base):
     """Manipulates Foreman's erratum."""
 
     command_base = 'erratum'
+    paginate_exists = True
@@ -50,6 +50,181 @@ def parse_csv(output):
         raise
 
 
+class HammerRow(tuple):
+    """Compact row of a hammer list output
+
+    Values are stored in a plain tuple and the normalized header is shared by every row of the
+    same output, which avoids one dictionary per row for very large listings. Rows can still be
+    indexed by column name like the dictionaries returned by :func:`parse_csv`::
+
+        row['name'], row.get('content-view'), dict(row.items())
+
+    Use :func:`row_type` to build the class for a given header.
+    """
+
+    __slots__ = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        index = self._index.get(key)
+        return default if index is None or index >= len(self) else tuple.__getitem__(self, index)
+
+    def keys(self):
+        return list(self._index)
+
+    def items(self):
+        return list(zip(self._index, self, strict=False))
+
+    def as_dict(self):
+        return dict(self.items())
+
+
+def row_type(keys):
+    """Return a :class:`HammerRow` subclass sharing the normalized ``keys`` header"""
+    return type(
+        'HammerRow', (HammerRow,), {'__slots__': (), '_index': {k: i for i, k in enumerate(keys)}}
+    )
+
+
+def _make_row(keys, row_cls):
+    """Return a callable building a row of ``row_cls`` (``dict`` or ``tuple``) from values"""
+    if row_cls is dict:
+
+        def make(values):
+            row = dict(zip(keys, values, strict=False))
+            # conform to csv.DictReader for short and long rows
+            if len(values) < len(keys):
+                row.update(dict.fromkeys(keys[len(values) :]))
+            elif len(values) > len(keys):
+                row[None] = values[len(keys) :]
+            return row
+
+        return make
+    return row_type(keys)
+
+
+def _iter_lines(chunks):
+    """Yield the lines of text received in arbitrary chunks, split like ``str.splitlines``"""
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.splitlines(keepends=True)
+        # the last line may continue in the next chunk
+        pending = lines.pop() if lines and not lines[-1].endswith('\n') else ''
+        for line in lines:
+            yield line.splitlines()[0]
+    if pending:
+        yield from pending.splitlines()
+
+
+def iter_csv(chunks, row_cls=dict):
+    """Parse CSV output from Hammer CLI as it is received and yield one row at a time
+
+    The header is normalized once, rows are the same dictionaries :func:`parse_csv` returns.
+
+    :param chunks: iterable of ``str`` chunks, e.g. :class:`robottelo.ssh.CommandStream`, or a
+        whole output
+    :param row_cls: ``dict``, or ``tuple`` to get compact :class:`HammerRow` records
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    reader = csv.reader(_iter_lines(chunks))
+    try:
+        header = next(reader, None)
+        if header is None:
+            return
+        make_row = _make_row([_normalize(key) for key in header], row_cls)
+        for values in reader:
+            # skip empty lines like csv.DictReader does
+            if values:
+                yield make_row(values)
+    except csv.Error as err:
+        logger.error(f'Exception while parsing CSV output at line {reader.line_num}: {err}')
+        raise
+
+
+_JSON_SEPARATOR_REGEX = re.compile(r'[\s,\]]')
+
+
+def iter_json(chunks, row_cls=dict):
+    """Parse a JSON list output from Hammer CLI as it is received and yield one item at a time
+
+    Items are normalized like :func:`parse_json` does, keys of the items are normalized once per
+    distinct set of keys. An output that is not a list is parsed with :func:`parse_json` once
+    fully received and yielded as a single item.
+
+    :param chunks: iterable of ``str`` chunks or a whole output
+    :param row_cls: ``dict``, or ``tuple`` to get compact :class:`HammerRow` records
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    chunks = iter(chunks)
+    decoder = json.JSONDecoder()
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        if buffer.strip():
+            break
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+    if not buffer.startswith('['):
+        parsed = parse_json(buffer + ''.join(chunks))
+        yield from parsed if isinstance(parsed, list) else [parsed]
+        return
+    position = 1
+    makers = {}
+    exhausted = False
+    while True:
+        while True:
+            # skip whitespace and separators between items
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # the item is not fully received yet
+                break
+            # unlike strings, objects and arrays, a number (even 1.5e3 read as 1) may go on in
+            # the next chunk, unless the separator after it is already received
+            if (
+                not exhausted
+                and not isinstance(item, dict | list | str)
+                and not _JSON_SEPARATOR_REGEX.search(buffer, end)
+            ):
+                break
+            position = end
+            if isinstance(item, dict):
+                raw_keys = tuple(item)
+                if raw_keys not in makers:
+                    makers[raw_keys] = _make_row([_normalize(key) for key in raw_keys], row_cls)
+                yield makers[raw_keys]([_normalize_obj(value) for value in item.values()])
+            else:
+                yield _normalize_obj(item)
+        buffer = buffer[position:]
+        position = 0
+        if exhausted:
+            if buffer.strip():
+                # let json report the malformed output
+                json.loads(f'[{buffer}')
+            return
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+        else:
+            buffer += chunk
+
+
 def parse_help(output):
     """Parse the help output from a hammer command and return a dictionary
     mapping the subcommands and options accepted by that command.
@@ -96,14 +271,15 @@ def parse_help(output):
             if match.group('name') is None:
                 contents['options'][-1]['help'] += ' {}'.format(match.group('help'))
             else:
-                contents['options'].append(
-                    {
-                        'name': match.group('name'),
-                        'shortname': match.group('shortname'),
-                        'value': match.group('value'),
-                        'help': match.group('help'),
-                    }
-                )
+                option = {
+                    'name': match.group('name'),
+                    'shortname': match.group('shortname'),
+                    'value': match.group('value'),
+                    'help': match.group('help'),
+                }
+                if match.group('deprecation_name'):
+                    option['deprecation_name'] = match.group('deprecation_name')
+                contents['options'].append(option)
 
     # handle multiple options disguised as one, e.g. --hostgroup[s|-ids|-titles]
     grouped_option_regex = re.compile(r'^(?P<prefix>[\w-]+)\[(?P<postfixes>\S+)\]$')
@@ -0,0 +1,186 @@
+"""Resident hammer process used as an alternative execution backend for hammer commands.
+
+Most of the wall time of a small ``hammer ... info`` or ``hammer ... list`` call is spent
+booting Ruby and requiring the hammer plugins, not waiting for the server. When
+``settings.performance.hammer_backend`` is set to ``daemon``, :meth:`robottelo.cli.base.Base.execute`
+routes commands through a small Ruby process left running on the Satellite. That process
+requires ``hammer_cli`` and all its modules once, then forks a child for every request. The
+child runs the regular hammer entry point with the request arguments and has its stdout,
+stderr and exit code captured separately.
+
+Every command is still a single ssh call, wrapped by :func:`build_command`, so the result
+object has the usual ``stdout``, ``stderr`` and ``status`` attributes expected by
+``Base._handle_response``. The wrapper starts the daemon when it is not running. It falls back
+to a plain ``hammer`` call when the daemon cannot be started or dies before picking the request
+up. Once picked up, the request is never run again: the wrapper waits for the forked child, up
+to the command timeout, and fails if the child is gone without an exit code. The daemon exits
+by itself after ``settings.performance.hammer_daemon_idle_timeout`` seconds without requests.
+
+The hammer arguments, credentials included, are only readable by the ssh user: the daemon
+directory and the requests are created with mode 0700.
+"""
+
+from robottelo import ssh
+from robottelo.logging import logger
+
+DAEMON_DIR = '/var/tmp/robottelo-hammer'
+DAEMON_SCRIPT = f'{DAEMON_DIR}/daemon.rb'
+DAEMON_FIFO = f'{DAEMON_DIR}/requests'
+DAEMON_PID = f'{DAEMON_DIR}/daemon.pid'
+DAEMON_LOG = f'{DAEMON_DIR}/daemon.log'
+DAEMON_START_TIMEOUT = 30  # seconds
+DAEMON_POLL_INTERVAL = 0.05  # seconds
+DAEMON_COMMAND_TIMEOUT = 300  # seconds
+# exit status of the wrapper when the result of a command is unknown
+DAEMON_FAILURE_STATUS = 255
+
+DAEMON_SOURCE = r"""
+# Preload hammer once and fork a child per request read from the fifo.
+# A request is the path of a directory holding the NUL separated hammer arguments in "args".
+# The parent marks it "started" before forking, the child writes its "pid", "out" and "err",
+# and the exit code to "rc" when it exits. The parent writes "rc" if the child could not.
+fifo_path, hammer_bin, idle_timeout = ARGV[0], ARGV[1], ARGV[2].to_i
+# open the fifo first, so requests sent while hammer is being loaded are buffered
+fifo = File.open(fifo_path, 'r+')
+begin
+  require 'hammer_cli'
+  HammerCLI::Settings.load_from_defaults
+  HammerCLI::Modules.load_all
+rescue StandardError, LoadError => e
+  warn "hammer preload failed, requests will load it themselves: #{e}"
+end
+
+def write_rc(request, code)
+  rc = File.join(request, 'rc')
+  return if File.exist?(rc)
+  File.write("#{rc}.#{Process.pid}", code.to_s)
+  File.rename("#{rc}.#{Process.pid}", rc)
+end
+
+def serve(request, hammer_bin)
+  # from now on, the wrapper won't run the request itself
+  File.write(File.join(request, 'started'), '')
+  pid = fork do
+    File.write(File.join(request, 'pid'), Process.pid.to_s)
+    at_exit { write_rc(request, $!.is_a?(SystemExit) ? $!.status : ($! ? 1 : 0)) }
+    args = File.binread(File.join(request, 'args')).split("\0")
+    $stdout.reopen(File.join(request, 'out'), 'w')
+    $stderr.reopen(File.join(request, 'err'), 'w')
+    ARGV.replace(args)
+    $0 = hammer_bin
+    load hammer_bin
+  end
+  Thread.new do
+    _, status = Process.wait2(pid)
+    write_rc(request, status.exitstatus || 1)
+  end
+end
+
+workers = []
+loop do
+  break if IO.select([fifo], nil, nil, idle_timeout).nil?
+  request = fifo.gets.to_s.strip
+  workers << serve(request, hammer_bin) unless request.empty?
+  workers.select!(&:alive?)
+end
+# stop accepting new requests, then serve whatever got queued meanwhile
+File.unlink(fifo_path) rescue nil
+while IO.select([fifo], nil, nil, 0.5)
+  request = fifo.gets.to_s.strip
+  workers << serve(request, hammer_bin) unless request.empty?
+end
+workers.each(&:join)
+"""
+
+WRAPPER_TEMPLATE = """\
+umask 077
+# a zombie is not alive, e.g. the daemon killed but not reaped yet
+alive() {{ [ -n "$1" ] && kill -0 "$1" 2>/dev/null && ! grep -qs '^State:.*Z' /proc/$1/status; }}
+running() {{ [ -p {fifo} ] && alive "$(cat {pid} 2>/dev/null)"; }}
+fallback() {{ exec env LANG={locale} hammer {args}; }}
+fail() {{ echo "hammer daemon: $1" >&2; rm -rf $R; exit {failure_status}; }}
+if ! running; then
+  exec 9>{dir}/start.lock && flock 9
+  if ! running; then
+    rm -f {fifo} && mkfifo {fifo}
+    LANG={locale} setsid nohup ruby {script} {fifo} "$(command -v hammer)" {idle_timeout} \\
+      >{log} 2>&1 </dev/null 9>&- &
+    echo $! > {pid}
+  fi
+  exec 9>&-
+fi
+P=$(cat {pid} 2>/dev/null)
+R=$(mktemp -d {dir}/req.XXXXXX) || fallback
+printf '%s\\0' {args} > $R/args
+timeout {start_timeout} sh -c 'echo "$1" > {fifo}' - $R || {{ rm -rf $R; fallback; }}
+DEADLINE=$(( $(date +%s) + {timeout} ))
+while [ ! -f $R/rc ]; do
+  if [ $(date +%s) -ge $DEADLINE ]; then
+    [ -f $R/pid ] && kill "$(cat $R/pid)" 2>/dev/null
+    fail 'timed out waiting for the command'
+  fi
+  if ! alive "$P" && [ ! -f $R/rc ]; then
+    # not picked up, so never run: run it here
+    [ -f $R/started ] || {{ rm -rf $R; fallback; }}
+    # picked up: wait for the child, but never run the command again
+    alive "$(cat $R/pid 2>/dev/null)" || [ -f $R/rc ] || \\
+      fail 'died while running the command, its result is unknown'
+  fi
+  sleep {poll_interval}
+done
+cat $R/out
+cat $R/err >&2
+RC=$(cat $R/rc)
+rm -rf $R
+exit $RC
+"""
+
+# hostname: whether the daemon script was uploaded there
+_installed_on = {}
+
+
+def install(hostname):
+    """Upload the daemon script to ``hostname``, once per process
+
+    :return: whether the script is on the host, a failed upload is not tried again
+    """
+    if hostname not in _installed_on:
+        result = ssh.command(
+            f"mkdir -p -m 0700 {DAEMON_DIR} && chmod 0700 {DAEMON_DIR} && "
+            f"cat > {DAEMON_SCRIPT} <<'ROBOTTELO_EOF'\n"
+            f"{DAEMON_SOURCE}\nROBOTTELO_EOF",
+            hostname=hostname,
+        )
+        _installed_on[hostname] = result.status == 0
+        if result.status != 0:
+            logger.warning(
+                f'Could not install the hammer daemon on {hostname}, hammer is run directly: '
+                f'{result.stderr}'
+            )
+    return _installed_on[hostname]
+
+
+def build_command(hammer_args, locale, idle_timeout, timeout=DAEMON_COMMAND_TIMEOUT):
+    """Wrap ``hammer_args`` so they are executed by the resident hammer process
+
+    :param str hammer_args: everything that would follow ``hammer`` on the command line, already
+        shell quoted
+    :param str locale: value of ``LANG`` for the daemon and for the fallback call
+    :param int idle_timeout: seconds without requests after which the daemon exits
+    :param int timeout: seconds to wait for the command, the child is killed after that
+    :return: a shell script printing hammer's stdout and stderr and exiting with its status
+    """
+    return WRAPPER_TEMPLATE.format(
+        dir=DAEMON_DIR,
+        script=DAEMON_SCRIPT,
+        fifo=DAEMON_FIFO,
+        pid=DAEMON_PID,
+        log=DAEMON_LOG,
+        start_timeout=DAEMON_START_TIMEOUT,
+        poll_interval=DAEMON_POLL_INTERVAL,
+        idle_timeout=idle_timeout,
+        timeout=timeout,
+        failure_status=DAEMON_FAILURE_STATUS,
+        locale=locale,
+        args=hammer_args,
+    )
@@ -47,6 +47,7 @@ class Host(Base):
     """Manipulates Foreman's hosts."""
 
     command_base = 'host'
+    paginate_exists = True
 
     @classmethod
     def ansible_roles_play(cls, options):
@@ -0,0 +1,59 @@
+"""Lazily populated namespace of hammer cli classes bound to a host.
+
+``Satellite.cli`` and ``Capsule.cli`` return a :class:`CLINamespace`. A cli class is only imported
+and subclassed with the host ``hostname`` the first time it is accessed::
+
+    target_sat.cli.Org.list()  # imports robottelo.cli.org and binds Org to target_sat
+
+The module of every class is looked up in :data:`robottelo.cli.registry.CLI_CLASSES`, generated
+by ``scripts/generate_cli_registry.py``. Bound classes are cached by the namespace, each
+namespace has its own, so that :meth:`CLINamespace.set_omitting_credentials` only affects it.
+"""
+
+import importlib
+
+from robottelo.cli.registry import CLI_CLASSES
+
+
+class CLINamespace:
+    """Attribute access to the cli classes bound to ``hostname``
+
+    :param str hostname: the host the hammer commands are run on
+    :param str module_prefix: only expose classes from modules starting with this prefix, e.g.
+        ``robottelo.cli.sm_`` for the satellite-maintain commands of a Capsule
+    """
+
+    def __init__(self, hostname, module_prefix='robottelo.cli.'):
+        self._hostname = hostname
+        self._names = [
+            name for name, module in CLI_CLASSES.items() if module.startswith(module_prefix)
+        ]
+        self._omitting_credentials = False
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in self._names:
+            raise AttributeError(f'{type(self).__name__} has no cli class {name!r}')
+        cli_cls = getattr(importlib.import_module(CLI_CLASSES[name]), name)
+        # create a copy of the class and set our hostname as a class attribute
+        bound = type(
+            name,
+            (cli_cls,),
+            {'hostname': self._hostname, 'omitting_credentials': self._omitting_credentials},
+        )
+        # later lookups of the same name don't go through __getattr__ anymore
+        setattr(self, name, bound)
+        return bound
+
+    def __dir__(self):
+        return [*super().__dir__(), *self._names]
+
+    def __iter__(self):
+        """Iterate over the names of all the available cli classes, without importing them"""
+        return iter(self._names)
+
+    def set_omitting_credentials(self, value):
+        """Run the commands of the classes of this namespace without (or with) credentials"""
+        self._omitting_credentials = value
+        for name in self._names:
+            if name in self.__dict__:
+                self.__dict__[name].omitting_credentials = value
@@ -23,3 +23,4 @@ class Package(Base):
     """
 
     command_base = 'package'
+    paginate_exists = True
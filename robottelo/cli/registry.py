@@ -0,0 +1,105 @@
+"""Static index of the hammer cli classes, mapping each class name to its module.
+
+Generated by scripts/generate_cli_registry.py, do not edit by hand.
+"""
+
+CLI_CLASSES = {
+    'ACS': 'robottelo.cli.acs',
+    'ACSBulk': 'robottelo.cli.acs',
+    'ActivationKey': 'robottelo.cli.activationkey',
+    'Admin': 'robottelo.cli.admin',
+    'Advanced': 'robottelo.cli.sm_advanced',
+    'AdvancedByTag': 'robottelo.cli.sm_advanced_by_tag',
+    'Ansible': 'robottelo.cli.ansible',
+    'Architecture': 'robottelo.cli.architecture',
+    'Arfreport': 'robottelo.cli.arfreport',
+    'Auth': 'robottelo.cli.auth',
+    'AuthLogin': 'robottelo.cli.auth',
+    'Backup': 'robottelo.cli.sm_backup',
+    'Base': 'robottelo.cli.base',
+    'Bootdisk': 'robottelo.cli.bootdisk',
+    'Capsule': 'robottelo.cli.capsule',
+    'ComputeProfile': 'robottelo.cli.computeprofile',
+    'ComputeResource': 'robottelo.cli.computeresource',
+    'ConfigReport': 'robottelo.cli.report',
+    'ContentCredential': 'robottelo.cli.content_credentials',
+    'ContentExport': 'robottelo.cli.content_export',
+    'ContentImport': 'robottelo.cli.content_import',
+    'ContentView': 'robottelo.cli.contentview',
+    'ContentViewFilter': 'robottelo.cli.contentview',
+    'ContentViewFilterRule': 'robottelo.cli.contentview',
+    'Defaults': 'robottelo.cli.defaults',
+    'DiscoveredHost': 'robottelo.cli.discoveredhost',
+    'DiscoveryRule': 'robottelo.cli.discoveryrule',
+    'Docker': 'robottelo.cli.docker',
+    'DockerManifest': 'robottelo.cli.docker',
+    'DockerTag': 'robottelo.cli.docker',
+    'Domain': 'robottelo.cli.domain',
+    'Environment': 'robottelo.cli.environment',
+    'Erratum': 'robottelo.cli.erratum',
+    'ExternalAuthSource': 'robottelo.cli.ldapauthsource',
+    'Fact': 'robottelo.cli.fact',
+    'File': 'robottelo.cli.file',
+    'Filter': 'robottelo.cli.filter',
+    'FlatpakRemote': 'robottelo.cli.flatpak_remote',
+    'GPGKey': 'robottelo.cli.gpgkey',
+    'GlobalParameter': 'robottelo.cli.globalparam',
+    'Health': 'robottelo.cli.sm_health',
+    'Host': 'robottelo.cli.host',
+    'HostCollection': 'robottelo.cli.hostcollection',
+    'HostGroup': 'robottelo.cli.hostgroup',
+    'HostInterface': 'robottelo.cli.host',
+    'HostRegistration': 'robottelo.cli.host_registration',
+    'HostTraces': 'robottelo.cli.host',
+    'HttpProxy': 'robottelo.cli.http_proxy',
+    'Insights': 'robottelo.cli.insights',
+    'JobInvocation': 'robottelo.cli.job_invocation',
+    'JobTemplate': 'robottelo.cli.job_template',
+    'LDAPAuthSource': 'robottelo.cli.ldapauthsource',
+    'LifecycleEnvironment': 'robottelo.cli.lifecycleenvironment',
+    'Location': 'robottelo.cli.location',
+    'MaintenanceMode': 'robottelo.cli.sm_maintenance_mode',
+    'Medium': 'robottelo.cli.medium',
+    'Model': 'robottelo.cli.model',
+    'ModuleStream': 'robottelo.cli.module_stream',
+    'OperatingSys': 'robottelo.cli.operatingsys',
+    'Org': 'robottelo.cli.org',
+    'OstreeBranch': 'robottelo.cli.ostreebranch',
+    'Package': 'robottelo.cli.package',
+    'Packages': 'robottelo.cli.sm_packages',
+    'PartitionTable': 'robottelo.cli.partitiontable',
+    'Product': 'robottelo.cli.product',
+    'Proxy': 'robottelo.cli.proxy',
+    'Puppet': 'robottelo.cli.puppet',
+    'Realm': 'robottelo.cli.realm',
+    'RecurringLogic': 'robottelo.cli.recurring_logic',
+    'RemoteExecutionFeature': 'robottelo.cli.rex_feature',
+    'ReportTemplate': 'robottelo.cli.report_template',
+    'Repository': 'robottelo.cli.repository',
+    'RepositorySet': 'robottelo.cli.repository_set',
+    'Restore': 'robottelo.cli.sm_restore',
+    'Role': 'robottelo.cli.role',
+    'SatelliteMaintainReport': 'robottelo.cli.sm_report',
+    'Scapcontent': 'robottelo.cli.scapcontent',
+    'Scappolicy': 'robottelo.cli.scap_policy',
+    'Service': 'robottelo.cli.sm_service',
+    'Settings': 'robottelo.cli.settings',
+    'SimpleContentAccess': 'robottelo.cli.simple_content_access',
+    'SmartClassParameter': 'robottelo.cli.scparams',
+    'Srpm': 'robottelo.cli.srpm',
+    'Subnet': 'robottelo.cli.subnet',
+    'Subscription': 'robottelo.cli.subscription',
+    'SyncPlan': 'robottelo.cli.syncplan',
+    'TailoringFiles': 'robottelo.cli.scap_tailoring_files',
+    'Task': 'robottelo.cli.task',
+    'Template': 'robottelo.cli.template',
+    'TemplateInput': 'robottelo.cli.template_input',
+    'TemplateSync': 'robottelo.cli.template_sync',
+    'Update': 'robottelo.cli.sm_update',
+    'Upgrade': 'robottelo.cli.sm_upgrade',
+    'User': 'robottelo.cli.user',
+    'UserGroup': 'robottelo.cli.usergroup',
+    'UserGroupExternal': 'robottelo.cli.usergroup',
+    'VirtWhoConfig': 'robottelo.cli.virt_who_config',
+    'Webhook': 'robottelo.cli.webhook',
+}
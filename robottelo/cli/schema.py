@@ -0,0 +1,216 @@
+"""Hammer option schemas used to validate command options before they are sent to the Satellite.
+
+Without a schema, a typo in an option name or a wrong value type is only reported by hammer
+itself, after a full ssh round trip. When ``settings.performance.validate_hammer_options`` is
+enabled, :meth:`robottelo.cli.base.Base._construct_command` checks the options of every command
+against the options listed by ``hammer full-help`` and raises :class:`CLIError` locally.
+
+The help of all hammer commands is fetched with a single ``hammer full-help`` call and stored in
+:mod:`robottelo.utils.schema_cache`, keyed by the version of the Satellite package and a
+checksum of the installed hammer packages. It is loaded once per process and hostname, so only
+the fingerprint lookup is an extra ssh call.
+"""
+
+import re
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.config import settings
+from robottelo.exceptions import CLIError
+from robottelo.logging import logger
+from robottelo.utils import schema_cache
+
+SCHEMA_CACHE_KIND = 'hammer'
+SCHEMA_FULL_HELP_TIMEOUT = 600  # seconds
+# print the Satellite version, then a checksum of the installed hammer packages and plugins
+FINGERPRINT_COMMAND = (
+    'rpm -q --qf "%{VERSION}-%{RELEASE}\\n" satellite foreman | grep -m1 -v "not installed"'
+    " && rpm -qa 'rubygem-hammer*' | sort | sha256sum | cut -c1-16"
+)
+# values accepted by hammer for BOOLEAN options
+BOOLEAN_VALUES = {'true', 'false', 'yes', 'no', '1', '0', 't', 'f', 'y', 'n'}
+
+_COMMAND_HEADER_REGEX = re.compile(r'^(hammer( [\w-]+)*)( >)?$')
+_POSSIBLE_VALUES_REGEX = re.compile(r"Possible value\(s\): ((?:'[^']*'(?:, )?)+)")
+_NUMBER_REGEX = re.compile(r'^-?\d+$')
+
+
+def parse_full_help(output):
+    """Split the ``hammer full-help`` output and parse the help of every command
+
+    :return: a mapping of the full command, e.g. ``hammer organization create``, to the
+        :func:`robottelo.cli.hammer.parse_help` contents of that command
+    """
+    commands = {}
+    command, lines = None, []
+    output_lines = output.splitlines()
+    for index, line in enumerate(output_lines):
+        next_line = output_lines[index + 1] if index + 1 < len(output_lines) else ''
+        match = _COMMAND_HEADER_REGEX.match(line)
+        # a command header is underlined with dashes
+        if match and next_line.startswith('---') and set(next_line) == {'-'}:
+            if command:
+                commands[command] = hammer.parse_help('\n'.join(lines))
+            command, lines = match.group(1), []
+        elif command:
+            lines.append(line)
+    if command:
+        commands[command] = hammer.parse_help('\n'.join(lines))
+    return commands
+
+
+def _option_types(help_contents):
+    """Return a mapping of option name to its value type, or to its list of possible values"""
+    types = {}
+    for option in help_contents['options']:
+        possible = _POSSIBLE_VALUES_REGEX.search(option['help'] or '')
+        if option['value'] == 'ENUM' and possible:
+            value_type = re.findall(r"'([^']*)'", possible.group(1))
+        else:
+            value_type = option['value']
+        types[option['name']] = value_type
+        # the deprecated name of an option is still accepted by hammer
+        if option.get('deprecation_name'):
+            types[option['deprecation_name']] = value_type
+    return types
+
+
+class CommandSchema:
+    """Options accepted by a single hammer command
+
+    :param str command: the full command, e.g. ``hammer organization create``
+    :param dict options: mapping of option name to its value type as printed by hammer help
+        (``NUMBER``, ``BOOLEAN``, ``VALUE``...), to a list of possible values or to ``None``
+    """
+
+    __slots__ = ('command', 'options')
+
+    def __init__(self, command, options):
+        self.command = command
+        self.options = options
+
+    def _check_value(self, name, value):
+        value_type = self.options[name]
+        if value is True or value is False or value is None or not isinstance(value, int | str):
+            # flags, omitted options and references resolved by the shell
+            return None
+        if isinstance(value, str) and '$' in value:
+            return None
+        if value_type == 'NUMBER' and not _NUMBER_REGEX.match(str(value)):
+            return f'--{name} expects a number, got {value!r}'
+        if value_type == 'BOOLEAN' and str(value).lower() not in BOOLEAN_VALUES:
+            return f'--{name} expects a boolean, got {value!r}'
+        if isinstance(value_type, list) and value_type and str(value) not in value_type:
+            return f'--{name} expects one of {", ".join(value_type)}, got {value!r}'
+        return None
+
+    def validate(self, options):
+        """Raise :class:`CLIError` listing every unknown option or invalid value"""
+        errors = []
+        for name, value in options.items():
+            # never sent, see Base._construct_command
+            if value is None or value is False:
+                continue
+            if name not in self.options:
+                errors.append(f'unknown option --{name}')
+                continue
+            values = value if isinstance(value, list) else [value]
+            if self.options[name] == 'LIST':
+                continue
+            errors.extend(filter(None, (self._check_value(name, val) for val in values)))
+        if errors:
+            raise CLIError(f'Invalid options for "{self.command}": {"; ".join(errors)}')
+
+
+class HammerSchema:
+    """Parsed hammer help of every command of a Satellite
+
+    :param str version: version of the Satellite the help was read from
+    :param str checksum: checksum of the hammer packages installed on that Satellite
+    :param dict commands: mapping of full command to its
+        :func:`robottelo.cli.hammer.parse_help` contents, see :func:`parse_full_help`
+    """
+
+    def __init__(self, version, checksum, commands):
+        self.version = version
+        self.checksum = checksum
+        self.commands = commands
+        self._compiled = {}
+
+    def command(self, command_base, command_sub):
+        """Return the :class:`CommandSchema` of ``hammer <command_base> <command_sub>``
+
+        Returns ``None`` for commands that are not known, e.g. from a plugin not installed on the
+        Satellite the schema was read from.
+        """
+        key = (command_base, command_sub)
+        if key not in self._compiled:
+            command = ' '.join(filter(None, ('hammer', command_base, command_sub)))
+            contents = self.commands.get(command)
+            self._compiled[key] = (
+                None if contents is None else CommandSchema(command, _option_types(contents))
+            )
+        return self._compiled[key]
+
+    def command_tree(self, command='hammer'):
+        """Return the nested help of ``command`` and all its subcommands
+
+        This is the format of ``tests/foreman/data/hammer_commands.json``.
+        """
+        contents = {
+            'options': list(self.commands[command]['options']),
+            'subcommands': [dict(sub) for sub in self.commands[command]['subcommands']],
+        }
+        for subcommand in contents['subcommands']:
+            full_command = f'{command} {subcommand["name"]}'
+            if full_command in self.commands:
+                subcommand.update(self.command_tree(full_command))
+        return contents
+
+    @classmethod
+    def load(cls, version, checksum):
+        """Return the schema stored for ``version`` and ``checksum``, or ``None``"""
+        commands = schema_cache.load(SCHEMA_CACHE_KIND, version, checksum)
+        return None if commands is None else cls(version, checksum, commands)
+
+    def save(self):
+        return schema_cache.store(SCHEMA_CACHE_KIND, self.version, self.checksum, self.commands)
+
+
+_schemas = {}
+
+
+def get_schema(hostname):
+    """Return the :class:`HammerSchema` of ``hostname``, fetching it when not cached yet
+
+    Returns ``None`` when the schema cannot be read, commands are not validated then.
+    """
+    if hostname in _schemas:
+        return _schemas[hostname]
+    schema = None
+    fingerprint = ssh.command(FINGERPRINT_COMMAND, hostname=hostname)
+    lines = fingerprint.stdout.split() if fingerprint.status == 0 else []
+    if len(lines) == 2:
+        version, checksum = lines
+        schema = HammerSchema.load(version, checksum)
+        if schema is None:
+            output = ssh.command(
+                f'LANG={settings.robottelo.locale} hammer full-help',
+                hostname=hostname,
+                timeout=SCHEMA_FULL_HELP_TIMEOUT,
+            )
+            if output.status == 0:
+                schema = HammerSchema(version, checksum, parse_full_help(output.stdout))
+                schema.save()
+    if schema is None:
+        logger.warning(f'Unable to read the hammer schema of {hostname}, options are not validated')
+    _schemas[hostname] = schema
+    return schema
+
+
+def validate(hostname, command_base, command_sub, options):
+    """Validate ``options`` of ``hammer <command_base> <command_sub>`` run on ``hostname``"""
+    schema = get_schema(hostname)
+    command = schema and schema.command(command_base, command_sub)
+    if command is not None:
+        command.validate(options)
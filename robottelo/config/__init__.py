@@ -146,10 +146,13 @@ def configure_nailgun():
         ``robottelo.entity_mixins.Entity`` for more information on the effects
         of this.
     * Set a default value for ``nailgun.entities.GPGKey.content``.
+    * Send the requests through keep-alive sessions, see :mod:`robottelo.utils.http_pool`.
     """
     from nailgun import entities, entity_mixins
     from nailgun.config import ServerConfig
 
+    from robottelo.utils.http_pool import install_nailgun_transport
+
     entity_mixins.CREATE_MISSING = True
     entity_mixins.DEFAULT_SERVER_CONFIG = ServerConfig(
         get_url(), get_credentials(), verify=settings.server.verify_ca
@@ -164,6 +167,7 @@ def configure_nailgun():
         )
 
     entities.GPGKey.__init__ = patched_gpgkey_init
+    install_nailgun_transport()
 
 
 configure_nailgun()
@@ -17,8 +17,13 @@ VALIDATORS = dict(
         Validator('server.version.source', default='internal', is_in=['internal', 'ga', 'nightly']),
         Validator('server.version.rhel_version', must_exist=True, cast=str),
         Validator(
-            'server.xdist_behavior', must_exist=True, is_in=['run-on-one', 'balance', 'on-demand']
+            'server.xdist_behavior',
+            must_exist=True,
+            is_in=['run-on-one', 'balance', 'on-demand', 'load-aware'],
         ),
+        Validator('server.scheduler.probe_interval', default=60),
+        Validator('server.scheduler.weights', default={}, is_type_of=dict),
+        Validator('server.scheduler.rebalance_threshold', default=1.0),
         Validator('server.auto_checkin', default=False, is_type_of=bool),
         (
             Validator('server.ssh_key', must_exist=True)
@@ -42,6 +47,14 @@ VALIDATORS = dict(
             default=NetworkType.IPV4.value,
         ),
         Validator('server.is_ipv6', is_type_of=bool, must_exist=False),
+        Validator('server.ssh_client.pool.enabled', default=True, is_type_of=bool),
+        Validator('server.ssh_client.pool.max_channels', default=1, gte=1, cast=int),
+        Validator('server.ssh_client.pool.idle_timeout', default=300, cast=int),
+        Validator('server.ssh_client.pool.keepalive_interval', default=60, cast=int),
+        Validator('server.http_pool.enabled', default=True, is_type_of=bool),
+        Validator('server.http_pool.maxsize', default=10, gte=1, cast=int),
+        Validator('server.http_pool.retries', default=3, gte=0, cast=int),
+        Validator('server.http_pool.backoff_factor', default=0.5, gte=0, cast=float),
     ],
     content_host=[
         Validator('content_host.default_rhel_version', must_exist=True),
@@ -50,6 +63,7 @@ VALIDATORS = dict(
             cast=NetworkType,
             default=NetworkType.IPV4.value,
         ),
+        Validator('content_host.warm_pool.size', default=0, gte=0),
     ],
     subscription=[
         Validator('subscription.rhn_username', must_exist=True),
@@ -254,6 +268,11 @@ VALIDATORS = dict(
         Validator('jira.issue_status', default=["Testing", "Release Pending"]),
         Validator('jira.cache_file', default='jira_status_cache.json'),
         Validator('jira.cache_ttl_days', default=7, is_type_of=int),
+        Validator('jira.cache_refresh_hours', default=24, gte=0),
+        Validator('jira.chunk_size', default=50, gte=1),
+        Validator('jira.max_results', default=100, gte=1),
+        Validator('jira.max_workers', default=4, gte=1),
+        Validator('jira.requests_per_second', default=5, gt=0),
     ],
     ldap=[
         Validator(
@@ -320,7 +339,17 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
-    performance=[Validator('performance.time_hammer', default=False)],
+    performance=[
+        Validator('performance.time_hammer', default=False),
+        Validator('performance.hammer_backend', default='ssh', is_in=['ssh', 'daemon']),
+        Validator('performance.hammer_daemon_idle_timeout', default=1800, cast=int),
+        Validator('performance.hammer_page_size', default=1000, gte=1, cast=int),
+        Validator('performance.validate_hammer_options', default=False, is_type_of=bool),
+        Validator('performance.collection_index', default=True, is_type_of=bool),
+        Validator('performance.collection_plan', default=False, is_type_of=bool),
+        Validator('performance.host_facts_ttl', default=0, gte=0, cast=int),
+        Validator('performance.duration_scheduling', default=False, is_type_of=bool),
+    ],
     report_portal=[
         Validator(
             'report_portal.portal_url',
@@ -329,6 +358,9 @@ VALIDATORS = dict(
             must_exist=True,
         ),
         Validator('report_portal.fail_threshold', default=20),
+        Validator('report_portal.page_size', default=300, gte=1),
+        Validator('report_portal.max_workers', default=4, gte=1),
+        Validator('report_portal.cache_ttl', default=0, gte=0),
     ],
     rh_cloud=[Validator('rh_cloud.token', required=True)],
     repos=[
@@ -424,9 +456,16 @@ VALIDATORS = dict(
             cast=lambda x: list(map(str, x)),
         ),
         Validator('robottelo.shared_resource_wait', default=60, cast=float),
+        Validator('robottelo.shared_resource_backend', default='file', is_in=['file', 'redis']),
     ],
     shared_function=[
-        Validator('shared_function.storage', is_in=('file', 'redis'), default='file'),
+        Validator('shared_function.storage', is_in=('file', 'mmap', 'redis'), default='file'),
+        Validator(
+            'shared_function.codec',
+            is_in=('json', 'json.zlib', 'pickle', 'msgpack'),
+            default='json',
+        ),
+        Validator('shared_function.allow_pickle', default=False, is_type_of=bool),
         Validator('shared_function.share_timeout', lte=86400, default=86400),
         Validator('shared_function.scope', default=None),
         Validator('shared_function.enabled', default=False),
@@ -436,6 +475,7 @@ VALIDATORS = dict(
         Validator('shared_function.redis_db', default=0),
         Validator('shared_function.call_retries', default=2),
         Validator('shared_function.redis_password', default=None),
+        Validator('shared_function.memo_size', gte=0, default=256),
     ],
     upgrade=[
         Validator('upgrade.capsule_ak', must_exist=True),
@@ -299,9 +299,9 @@ class CLIFactory:
     @lru_cache
     def _find_entity_class(self, entity_name):
         entity_name = entity_name.replace('_', '').lower()
-        for name, class_obj in self._satellite.cli.__dict__.items():
+        for name in self._satellite.cli:
             if entity_name == name.lower():
-                return class_obj
+                return getattr(self._satellite.cli, name)
         return None
 
     def make_content_credential(self, options=None):
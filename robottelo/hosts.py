@@ -3,13 +3,13 @@ from configparser import ConfigParser
 import contextlib
 from contextlib import contextmanager
 from datetime import UTC, datetime
-from functools import cached_property, lru_cache
-import importlib
+from functools import cached_property, lru_cache, partialmethod
 import io
 import json
 from pathlib import Path, PurePath
 import random
 import re
+import socket
 from tempfile import NamedTemporaryFile
 import time
 from urllib.parse import urljoin, urlparse, urlunsplit
@@ -30,7 +30,7 @@ from wrapanapi.entities.vm import VmState
 import yaml
 
 from robottelo import constants
-from robottelo.cli.base import Base
+from robottelo.cli.namespace import CLINamespace
 from robottelo.config import (
     configure_airgun,
     configure_nailgun,
@@ -68,8 +68,9 @@ from robottelo.host_helpers import (
     SatelliteMixins,
 )
 from robottelo.logging import logger
-from robottelo.utils import validate_ssh_pub_key
+from robottelo.utils import host_facts, schema_cache, validate_ssh_pub_key
 from robottelo.utils.datafactory import valid_emails_list
+from robottelo.utils.http_pool import install_nailgun_transport
 from robottelo.utils.installer import InstallerCommand
 
 POWER_OPERATIONS = {
@@ -92,14 +93,40 @@ def lru_sat_ready_rhel(rhel_ver):
     return Broker(**deploy_args, host_class=Satellite).checkout()
 
 
+_CONNECTION_ERRORS = (ConnectionError, TimeoutError, TimedOutError, socket.gaierror)
+
+
+def _read_satellite_fact(name, description):
+    """Return the ``name`` property of the default Satellite, or ``None`` if it can't be read
+
+    The properties are cached by :mod:`robottelo.utils.host_facts`. A Satellite that can't be
+    connected to is remembered there for a while, so the next callers use the configuration at
+    once.
+    """
+    hostname = settings.server.get('hostname')
+    if host_facts.is_unreachable(hostname):
+        logger.warning('Failed to get %s: %s was unreachable recently', description, hostname)
+        return None
+    try:
+        return getattr(Satellite(), name)
+    except _CONNECTION_ERRORS as err:
+        logger.warning('Failed to get %s: %s', description, err)
+        host_facts.set_unreachable(hostname)
+        return None
+    except (AuthenticationError, ContentHostError, BoxKeyError) as err:
+        logger.warning('Failed to get %s: %s', description, err)
+        # e.g. wait_for_connection() giving up, not a configuration error
+        if isinstance(err.__cause__, _CONNECTION_ERRORS):
+            host_facts.set_unreachable(hostname)
+        return None
+
+
 def get_sat_version():
     """Try to read sat_version from envvar SATELLITE_VERSION
     if not available fallback to ssh connection to get it."""
 
-    try:
-        sat_version = Satellite().version
-    except (AuthenticationError, ContentHostError, BoxKeyError) as err:
-        logger.warning('Failed to get Satellite version: %s', err)
+    sat_version = _read_satellite_fact('version', 'Satellite version')
+    if sat_version is None:
         if sat_version := str(settings.server.version.get('release')) == 'stream':
             sat_version = str(settings.robottelo.get('satellite_version'))
         if not sat_version:
@@ -111,14 +138,13 @@ def get_sat_rhel_version():
     """Try to read rhel_version from Satellite host
     if not available fallback to robottelo configuration."""
 
-    try:
-        return Satellite().os_version
-    except (AuthenticationError, ContentHostError, BoxKeyError) as err:
-        logger.warning('Failed to get RHEL version from Satellite: %s', err)
-        if hasattr(settings.server.version, 'rhel_version'):
-            rhel_version = str(settings.server.version.rhel_version)
-        elif hasattr(settings.robottelo, 'rhel_version'):
-            rhel_version = settings.robottelo.rhel_version
+    rhel_version = _read_satellite_fact('os_version', 'RHEL version from Satellite')
+    if rhel_version is not None:
+        return rhel_version
+    if hasattr(settings.server.version, 'rhel_version'):
+        rhel_version = str(settings.server.version.rhel_version)
+    elif hasattr(settings.robottelo, 'rhel_version'):
+        rhel_version = settings.robottelo.rhel_version
     return Version(rhel_version)
 
 
@@ -127,6 +153,9 @@ class ContentHost(Host, ContentHostMixins):
     default_timeout = settings.server.ssh_client.command_timeout
     # Extend the keep_keys tuple from the parent class
     keep_keys = (*Host.keep_keys, 'net_type', 'blank')
+    # share the facts read from the host through robottelo.utils.host_facts, only for hosts
+    # whose hostname is not reused for a different system
+    persist_facts = False
 
     def __init__(self, hostname, auth=None, **kwargs):
         """ContentHost object with optional ssh connection
@@ -273,9 +302,18 @@ class ContentHost(Host, ContentHostMixins):
                 break
         return r_release
 
+    def _fact(self, name, read):
+        """Return the ``name`` fact of this host, stored by host_facts if ``persist_facts``"""
+        if self.persist_facts:
+            return host_facts.cached(self.hostname, name, read)
+        return read()
+
     @cached_property
     def _os_release(self):
         """Process os-release file for distro and version information"""
+        return self._fact('os_release', self._read_os_release)
+
+    def _read_os_release(self):
         facts = {}
         regex = r'^(["\'])(.*)(\1)$'
         result = self.execute('cat /etc/os-release')
@@ -346,6 +384,8 @@ class ContentHost(Host, ContentHostMixins):
         for name in self.list_cached_properties():
             with contextlib.suppress(KeyError):  # ignore if property is not cached
                 del self.__dict__[name]
+        if self.persist_facts:
+            host_facts.invalidate(self.hostname)
 
     def setup(self):
         logger.debug('START: setting up host %s', self)
@@ -367,6 +407,9 @@ class ContentHost(Host, ContentHostMixins):
             self.unregister()
             if type(self) is not Satellite:  # do not delete Satellite's host record
                 self.delete_host_record()
+        if self.persist_facts:
+            # the hostname may be given to another system once this one is checked in
+            host_facts.invalidate(self.hostname)
 
         logger.debug('END: tearing down host %s', self)
 
@@ -1699,6 +1742,7 @@ class Capsule(ContentHost, CapsuleMixins):
     rex_key_path = '~foreman-proxy/.ssh/id_rsa_foreman_proxy.pub'
     product_rpm_name = 'satellite-capsule'
     upstream_rpm_name = 'foreman-proxy'
+    persist_facts = True
 
     def __init__(self, hostname, **kwargs):
         kwargs.setdefault('net_type', settings.capsule.network_type)
@@ -1746,7 +1790,9 @@ class Capsule(ContentHost, CapsuleMixins):
         :return: True if no downstream satellite RPMS are installed
         :rtype: bool
         """
-        return self.execute(f'rpm -q {self.product_rpm_name}').status != 0
+        return self._fact(
+            'is_upstream', lambda: self.execute(f'rpm -q {self.product_rpm_name}').status != 0
+        )
 
     @cached_property
     def is_stream(self):
@@ -1757,14 +1803,20 @@ class Capsule(ContentHost, CapsuleMixins):
         """
         if self.is_upstream:
             return False
-        return (
-            'stream' in self.execute(f'rpm -q --qf "%{{RELEASE}}" {self.product_rpm_name}').stdout
+        return self._fact(
+            'is_stream',
+            lambda: (
+                'stream'
+                in self.execute(f'rpm -q --qf "%{{RELEASE}}" {self.product_rpm_name}').stdout
+            ),
         )
 
     @cached_property
     def version(self):
         rpm_name = self.upstream_rpm_name if self.is_upstream else self.product_rpm_name
-        return self.execute(f'rpm -q --qf "%{{VERSION}}" {rpm_name}').stdout
+        return self._fact(
+            'version', lambda: self.execute(f'rpm -q --qf "%{{VERSION}}" {rpm_name}').stdout
+        )
 
     @cached_property
     def url(self):
@@ -1929,28 +1981,9 @@ class Capsule(ContentHost, CapsuleMixins):
 
     @property
     def cli(self):
-        """Import only satellite-maintain robottelo cli entities and wrap them under self.cli"""
-        self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if (
-                file.suffix == '.py'
-                and not file.name.startswith('_')
-                and file.name.startswith('sm_')
-            ):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(name, (obj,), {'hostname': self.hostname})
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """satellite-maintain robottelo cli entities bound to this host, imported on first use"""
+        if not isinstance(getattr(self, '_cli', None), CLINamespace):
+            self._cli = CLINamespace(self.hostname, module_prefix='robottelo.cli.sm_')
         return self._cli
 
     def enable_satellite_or_capsule_module_for_rhel8(self):
@@ -1973,6 +2006,34 @@ class Capsule(ContentHost, CapsuleMixins):
         assert self.execute(f'dnf -y install {self.product_rpm_name}').status == 0
 
 
+class APINamespace:
+    """Attribute access to the nailgun entities bound to a nailgun ``ServerConfig``
+
+    An entity class is only subclassed with the server configuration injected into its
+    ``__init__`` the first time it is accessed, then reused.
+    """
+
+    def __init__(self, server_config):
+        self._server_config = server_config
+
+    def __getattr__(self, name):
+        from nailgun import entities
+        from nailgun.entity_mixins import Entity
+
+        entity = None if name.startswith('_') else getattr(entities, name, None)
+        if not (isinstance(entity, type) and issubclass(entity, Entity)):
+            raise AttributeError(f'{type(self).__name__} has no nailgun entity {name!r}')
+        # create a copy of the class and inject our server config into the __init__
+        bound = type(
+            name,
+            (entity,),
+            {'__init__': partialmethod(entity.__init__, server_config=self._server_config)},
+        )
+        # later lookups of the same name don't go through __getattr__ anymore
+        setattr(self, name, bound)
+        return bound
+
+
 class Satellite(Capsule, SatelliteMixins):
     product_rpm_name = 'satellite'
     upstream_rpm_name = 'foreman'
@@ -1983,9 +2044,9 @@ class Satellite(Capsule, SatelliteMixins):
         self.port = kwargs.get('port', settings.server.port)
         kwargs.setdefault('net_type', settings.server.network_type)
         super().__init__(hostname=hostname, **kwargs)
-        # create dummy classes for later population
-        self._api = type('api', (), {'_configured': False})
-        self._cli = type('cli', (), {'_configured': False})
+        # populated on first use by the api and cli properties
+        self._api = None
+        self._cli = None
         self._apidoc = None
         self.record_property = None
 
@@ -1997,90 +2058,60 @@ class Satellite(Capsule, SatelliteMixins):
 
         pip_main(['uninstall', '-y', 'nailgun'])
         pip_main(['install', f'https://github.com/SatelliteQE/nailgun/archive/{new_version}.zip'])
-        self._api = type('api', (), {'_configured': False})
+        self._api = None
         to_clear = [k for k in sys.modules if 'nailgun' in k]
         [sys.modules.pop(k) for k in to_clear]
 
     @property
     def api(self):
-        """Import all nailgun entities and wrap them under self.api"""
-        if not self._api:
-            self._api = type('api', (), {'_configured': False})
-        if self._api._configured:
-            return self._api
-        from nailgun import entities as _entities  # use a private import
-        from nailgun.config import ServerConfig
-        from nailgun.entity_mixins import Entity
-
-        def inject_config(cls, server_config):
-            """inject a nailgun server config into the init of nailgun entity classes"""
-            import functools
-
-            class DecClass(cls):
-                __init__ = functools.partialmethod(cls.__init__, server_config=server_config)
-
-            return DecClass
-
-        # set the server configuration to point to this satellite
-        self.nailgun_cfg = ServerConfig(
-            auth=(settings.server.admin_username, settings.server.admin_password),
-            url=f'{self.url}',
-            verify=settings.server.verify_ca,
-        )
-        # add each nailgun entity to self.api, injecting our server config
-        for name, obj in _entities.__dict__.items():
-            try:
-                if Entity in obj.mro():
-                    #  create a copy of the class and inject our server config into the __init__
-                    new_cls = type(name, (obj,), {})
-                    setattr(self._api, name, inject_config(new_cls, self.nailgun_cfg))
-            except AttributeError:
-                # not everything has an mro method, we don't care about them
-                pass
-        self._api._configured = True
+        """Nailgun entities bound to this satellite, each specialized on first use"""
+        if self._api is None:
+            from nailgun.config import ServerConfig
+
+            install_nailgun_transport()
+            # set the server configuration to point to this satellite
+            self.nailgun_cfg = ServerConfig(
+                auth=(settings.server.admin_username, settings.server.admin_password),
+                url=f'{self.url}',
+                verify=settings.server.verify_ca,
+            )
+            self._api = APINamespace(self.nailgun_cfg)
         return self._api
 
     @property
     def apidoc(self):
-        """Provide Satellite's apidoc via apypie"""
+        """Provide Satellite's apidoc via apypie
+
+        The apidoc is stored in :mod:`robottelo.utils.schema_cache`, keyed by the Satellite
+        version and the apipie checksum of its API, and only downloaded when not cached yet.
+        """
         if not self._apidoc:
-            self._apidoc = apypie.Api(
-                uri=self.url,
-                username=settings.server.admin_username,
-                password=settings.server.admin_password,
-                api_version=2,
-                verify_ssl=settings.server.verify_ca,
-            ).apidoc
+            checksum = requests.get(
+                f'{self.url}/api/status',
+                auth=(settings.server.admin_username, settings.server.admin_password),
+                verify=settings.server.verify_ca,
+                timeout=60,
+            ).headers.get('apipie-checksum')
+            if checksum:
+                self._apidoc = schema_cache.load('apidoc', self.version, checksum)
+            if not self._apidoc:
+                self._apidoc = apypie.Api(
+                    uri=self.url,
+                    username=settings.server.admin_username,
+                    password=settings.server.admin_password,
+                    api_version=2,
+                    verify_ssl=settings.server.verify_ca,
+                ).apidoc
+                if checksum:
+                    schema_cache.store('apidoc', self.version, checksum, self._apidoc)
         return self._apidoc
 
     @property
     def cli(self):
-        """Import all robottelo cli entities and wrap them under self.cli"""
-        if not self._cli:
-            self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if file.suffix == '.py' and not file.name.startswith('_'):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(
-                                name,
-                                (obj,),
-                                {
-                                    'hostname': self.hostname,
-                                    'omitting_credentials': self.omitting_credentials,
-                                },
-                            )
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """Robottelo cli entities bound to this satellite, each imported on first use"""
+        if self._cli is None:
+            self._cli = CLINamespace(self.hostname)
+            self._cli.set_omitting_credentials(self.omitting_credentials)
         return self._cli
 
     @contextmanager
@@ -2089,23 +2120,13 @@ class Satellite(Capsule, SatelliteMixins):
         if change:
             self.omitting_credentials = True
             # if CLI is already created
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = True
+            if self._cli is not None:
+                self._cli.set_omitting_credentials(True)
         yield
         if change:
             self.omitting_credentials = False
-            if self._cli._configured:
-                for name, obj in self._cli.__dict__.items():
-                    with contextlib.suppress(
-                        AttributeError
-                    ):  # not everything has an mro method, we don't care about them
-                        if Base in obj.mro():
-                            getattr(self._cli, name).omitting_credentials = False
+            if self._cli is not None:
+                self._cli.set_omitting_credentials(False)
 
     @contextmanager
     def ui_session(self, testname=None, user=None, password=None, url=None, login=True):
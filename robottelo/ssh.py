@@ -1,6 +1,30 @@
 """Utility module to handle the shared ssh connection."""
 
+import codecs
+from contextlib import contextmanager
+import select
+import time
+
+from broker.helpers import translate_timeout
+
 from robottelo.cli import hammer
+from robottelo.logging import logger
+from robottelo.utils.ssh_pool import get_pool, pool_enabled
+
+STREAM_POLL_INTERVAL = 0.1  # seconds
+
+
+def _client_kwargs(hostname=None, username=None, password=None, port=22, net_type=None):
+    from robottelo.config import settings
+
+    return {
+        'hostname': hostname or settings.server.hostname,
+        'username': username or settings.server.ssh_username,
+        'password': password or settings.server.ssh_password,
+        'port': port or settings.server.ssh_client.port,
+        # TODO(ogajduse): we better get rid of the ssh module entirely
+        'net_type': net_type or settings.server.network_type,
+    }
 
 
 def get_client(
@@ -14,18 +38,23 @@ def get_client(
 
     Processes ssh credentials in the order: password, key_filename, ssh_key
     Config validation enforces one of the three must be set in settings.server
+
+    The host object is never shared through :mod:`robottelo.utils.ssh_pool`: the caller may keep
+    it and run commands at any time, which would not be safe on a pooled connection.
     """
-    from robottelo.config import settings
     from robottelo.hosts import ContentHost
 
-    return ContentHost(
-        hostname=hostname or settings.server.hostname,
-        username=username or settings.server.ssh_username,
-        password=password or settings.server.ssh_password,
-        port=port or settings.server.ssh_client.port,
-        # TODO(ogajduse): we better get rid of the ssh module entirely
-        net_type=net_type or settings.server.network_type,
-    )
+    return ContentHost(**_client_kwargs(hostname, username, password, port, net_type))
+
+
+@contextmanager
+def _borrow_client(**kwargs):
+    """Yield a pooled host holding a channel on it, or a throwaway one when pooling is off"""
+    if pool_enabled():
+        with get_pool().connection(**_client_kwargs(**kwargs)) as client:
+            yield client
+    else:
+        yield get_client(**kwargs)
 
 
 def command(
@@ -47,14 +76,14 @@ def command(
     :param int timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
     """
-    client = get_client(
+    with _borrow_client(
         hostname=hostname,
         username=username,
         password=password,
         port=port,
         net_type=net_type,
-    )
-    result = client.execute(cmd, timeout=timeout)
+    ) as client:
+        result = client.execute(cmd, timeout=timeout)
 
     if output_format and result.status == 0:
         if output_format == 'csv':
@@ -62,3 +91,107 @@ def command(
         if output_format == 'json':
             result.stdout = hammer.parse_json(result.stdout) if result.stdout else None
     return result
+
+
+class CommandStream:
+    """Iterate over the stdout of a command while it is being received
+
+    Iterating runs the command and yields decoded ``str`` chunks as they arrive from the ssh
+    channel, so large outputs can be parsed without being held in memory as a whole.
+    ``status`` and ``stderr`` are set once the iteration is over. Hosts whose ssh backend does
+    not expose a raw channel fall back to a regular ``execute`` and yield the whole stdout at once.
+
+    :param str cmd: The command to run
+    :param int timeout: Time to wait for the ssh command to finish.
+    :param client_kwargs: passed through to :func:`get_client`
+    """
+
+    def __init__(self, cmd, timeout=None, **client_kwargs):
+        self.cmd = cmd
+        self.timeout = timeout
+        self.client_kwargs = client_kwargs
+        self.status = None
+        self.stderr = None
+
+    def __iter__(self):
+        with _borrow_client(**self.client_kwargs) as client:
+            raw_session = getattr(client.session, 'session', None)
+            if not hasattr(raw_session, 'open_session'):
+                result = client.execute(self.cmd, timeout=self.timeout)
+                self.status, self.stderr = result.status, result.stderr
+                if result.stdout:
+                    yield result.stdout
+                return
+            yield from self._read_channel(client, raw_session)
+
+    def _read_channel(self, client, raw_session):
+        """Read stdout and stderr in turn, so neither stream fills its window while waiting"""
+        from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
+
+        logger.debug(f'{client.hostname} streaming command: {self.cmd}')
+        timeout = translate_timeout(
+            client.default_timeout if self.timeout is None else self.timeout
+        )
+        deadline = time.monotonic() + timeout / 1000 if timeout else None
+        # the session is borrowed from the pool, give it back as it was
+        previous_timeout, blocking = raw_session.get_timeout(), raw_session.get_blocking()
+        raw_session.set_timeout(timeout)
+        channel = raw_session.open_session()
+        try:
+            channel.execute(self.cmd)
+            raw_session.set_blocking(False)
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            stderr = []
+            while True:
+                size, data = channel.read()
+                err_size, err_data = channel.read_stderr()
+                if size > 0 and (chunk := decoder.decode(data)):
+                    yield chunk
+                if err_size > 0:
+                    stderr.append(err_data)
+                if size > 0 or err_size > 0:
+                    continue
+                if LIBSSH2_ERROR_EAGAIN not in (size, err_size) and channel.eof():
+                    break
+                if deadline and time.monotonic() > deadline:
+                    raise TimeoutError(f'{client.hostname} command timed out: {self.cmd}')
+                self._wait_socket(client)
+            if chunk := decoder.decode(b'', final=True):
+                yield chunk
+            self.stderr = b''.join(stderr).decode('utf-8', errors='replace')
+        finally:
+            raw_session.set_blocking(True)
+            channel.close()
+            channel.wait_closed()
+            raw_session.set_blocking(blocking)
+            raw_session.set_timeout(previous_timeout)
+        self.status = channel.get_exit_status()
+
+    @staticmethod
+    def _wait_socket(client):
+        """Wait for data from the ssh socket of the host, or a moment when it is not known"""
+        if sock := getattr(client.session, 'sock', None):
+            select.select([sock], [], [], STREAM_POLL_INTERVAL)
+        else:
+            time.sleep(STREAM_POLL_INTERVAL)
+
+
+def stream(
+    cmd,
+    hostname=None,
+    username=None,
+    password=None,
+    timeout=None,
+    port=22,
+    net_type=None,
+):
+    """Return a :class:`CommandStream` running ``cmd`` on the remote hostname"""
+    return CommandStream(
+        cmd,
+        timeout=timeout,
+        hostname=hostname,
+        username=username,
+        password=password,
+        port=port,
+        net_type=net_type,
+    )
@@ -66,3 +66,17 @@ def parse_comma_separated_list(option_value):
             return False
         return [item.strip() for item in option_value.split(',')]
     return None
+
+
+def normalize_nodeid(nodeid):
+    """Return a test node id, or a Report Portal test name, in a form comparable to the others
+
+    e.g. ``tests/foreman/api/test_host.py::TestHost::test_create[rhel9]`` and
+    ``tests/foreman/api/test_host.py.TestHost.test_create[rhel9]`` are the same test.
+    """
+    return nodeid.replace('::', '.')
+
+
+def normalized_item_name(item):
+    """Return the normalized name of a collected pytest item, see :func:`normalize_nodeid`"""
+    return normalize_nodeid(f'{item.location[0]}.{item.location[2]}')
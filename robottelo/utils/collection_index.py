@@ -0,0 +1,228 @@
+"""Persistent index of the testimony tokens and ``is_open`` usages of the test modules.
+
+During collection, ``pytest_plugins/metadata_markers.py`` reads the CaseComponent,
+CaseImportance, Team, BlockedBy and Verifies tokens from the docstrings of every item, and
+``pytest_plugins/issue_handlers.py`` looks for ``is_open`` usages in the source of every test and
+test module. Both used to run their regexes again for each parametrized item, on every xdist
+worker and in every session.
+
+Each test module is now parsed once with :mod:`ast` and its tokens and ``is_open`` usages are
+stored under ``robottelo_tmp_dir``, in one file per module. An entry is reused as long as the
+modification time and size of the module are unchanged, or its content checksum is, so only the
+modules edited since the last session are parsed again. All the xdist workers share the entries,
+which are written atomically::
+
+    from robottelo.utils import collection_index
+
+    collection_index.docstring_tokens(item.function)  # {'component': ['Repositories'], ...}
+    collection_index.workarounds(item.function)  # {'is_open': [['BZ', '1234']], ...}
+
+Objects not found in the index, e.g. generated classes or functions decorated in another module,
+are read with :mod:`inspect` like before. Set ``performance.collection_index`` to false to always
+read them with :mod:`inspect`.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import threading
+
+from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.logging import collection_logger as logger
+
+INDEX_DIR = Path(robottelo_tmp_dir) / 'collection_index'
+# bump when the regexes or the format of the entries change, older entries are ignored then
+INDEX_VERSION = 1
+
+TOKEN_REGEXES = {
+    # To match :CaseComponent: FooBar
+    'component': re.compile(r'\s*:CaseComponent:\s*(?P<component>\S*)', re.IGNORECASE),
+    # To match :CaseImportance: Critical
+    'importance': re.compile(r'\s*:CaseImportance:\s*(?P<importance>\S*)', re.IGNORECASE),
+    # To match :Team: Rocket
+    'team': re.compile(r'\s*:Team:\s*(?P<team>\S*)', re.IGNORECASE),
+    # To match :BlockedBy: SAT-32932
+    'blocked_by': re.compile(r'\s*:BlockedBy:\s*(?P<blocked_by>.*\S*)', re.IGNORECASE),
+    # To match :Verifies: SAT-32932
+    'verifies': re.compile(r'\s*:Verifies:\s*(?P<verifies>.*\S*)', re.IGNORECASE),
+}
+
+WORKAROUND_REGEXES = {
+    # To match `if is_open('SAT:123456'):`
+    'is_open': re.compile(r"\s*if\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"),
+    # To match `if not is_open('SAT:123456'):`
+    'not is_open': re.compile(r"\s*if\snot\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"),
+}
+
+_entries = {}
+_lock = threading.Lock()
+
+
+def parse_tokens(docstring):
+    """Return the testimony tokens found in ``docstring``, by token name"""
+    tokens = {}
+    for name, regex in TOKEN_REGEXES.items():
+        if matches := regex.findall(docstring or ''):
+            tokens[name] = matches
+    return tokens
+
+
+def parse_workarounds(source):
+    """Return the ``is_open`` and ``not is_open`` usages found in ``source``, by usage"""
+    if 'is_open(' not in source:
+        return {}
+    return {
+        usage: [list(match) for match in regex.findall(source)]
+        for usage, regex in WORKAROUND_REGEXES.items()
+    }
+
+
+def parse_module(source):
+    """Index the docstrings and ``is_open`` usages of the classes and functions of ``source``
+
+    :return: a dict with the tokens of every docstring and the workarounds of every function,
+        keyed by qualified name (the empty name is the module itself), and the first
+        CaseComponent found anywhere in the module
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    docstrings = {'': parse_tokens(ast.get_docstring(tree))}
+    workarounds = {'': parse_workarounds(source)}
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef):
+                continue
+            qualname = f'{prefix}{child.name}'
+            docstring = ast.get_docstring(child)
+            if docstring is not None:
+                docstrings[qualname] = parse_tokens(docstring)
+            if isinstance(child, ast.ClassDef):
+                visit(child, f'{qualname}.')
+            else:
+                # the source of a function as returned by inspect.getsource, with its decorators
+                start = min(decorated.lineno for decorated in [child, *child.decorator_list])
+                workarounds[qualname] = parse_workarounds(
+                    ''.join(lines[start - 1 : child.end_lineno])
+                )
+
+    visit(tree, '')
+    module_component = TOKEN_REGEXES['component'].findall(source)
+    return {
+        'docstrings': docstrings,
+        'workarounds': workarounds,
+        'component': module_component[0] if module_component else None,
+    }
+
+
+def entry_path(path):
+    """Return the path of the index entry of the module at ``path``"""
+    return INDEX_DIR / f'{hashlib.sha1(str(path).encode()).hexdigest()}.json'
+
+
+def _store(cache_file, data):
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f'.{cache_file.name}.{os.getpid()}.{threading.get_ident()}')
+    tmp_file.write_text(json.dumps(data))
+    os.replace(tmp_file, cache_file)
+
+
+def get_entry(path):
+    """Return the index entry of the module at ``path``, parsing it if it changed
+
+    Returns ``None`` when the module cannot be read or parsed.
+    """
+    path = Path(path).resolve()
+    with _lock:
+        if path in _entries:
+            return _entries[path]
+    cache_file = entry_path(path)
+    try:
+        stat = path.stat()
+        try:
+            cached = json.loads(cache_file.read_text())
+        except (OSError, ValueError):
+            cached = {}
+        if cached.get('version') != INDEX_VERSION:
+            cached = {}
+        if (cached.get('mtime_ns'), cached.get('size')) == (stat.st_mtime_ns, stat.st_size):
+            entry = cached['entry']
+        else:
+            content = path.read_bytes()
+            checksum = hashlib.sha256(content).hexdigest()
+            if cached.get('sha256') == checksum:
+                # touched but not modified
+                entry = cached['entry']
+            else:
+                logger.debug(f'Indexing testimony tokens of {path}')
+                entry = parse_module(content.decode())
+            _store(
+                cache_file,
+                {
+                    'version': INDEX_VERSION,
+                    'path': str(path),
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'sha256': checksum,
+                    'entry': entry,
+                },
+            )
+    except (OSError, SyntaxError, UnicodeDecodeError) as err:
+        logger.warning(f'Unable to index {path}: {err}')
+        entry = None
+    with _lock:
+        return _entries.setdefault(path, entry)
+
+
+def _locate(obj):
+    """Return the index entry of the module defining ``obj`` and the qualified name of ``obj``
+
+    Returns ``None`` as entry when ``obj`` cannot be looked up in the index.
+    """
+    if not settings.performance.collection_index:
+        return None, None
+    if inspect.ismodule(obj):
+        filename, qualname = getattr(obj, '__file__', None), ''
+    else:
+        module = sys.modules.get(getattr(obj, '__module__', None))
+        filename, qualname = getattr(module, '__file__', None), getattr(obj, '__qualname__', '')
+        code = getattr(inspect.unwrap(obj), '__code__', None)
+        if '<locals>' in qualname or (code is not None and code.co_filename != filename):
+            return None, None
+    if not filename or not filename.endswith('.py'):
+        return None, None
+    return get_entry(filename), qualname
+
+
+def docstring_tokens(obj):
+    """Return the testimony tokens of the docstring of a module, class or function
+
+    Equivalent to :func:`parse_tokens` of :func:`inspect.getdoc`, looked up in the index.
+    """
+    entry, qualname = _locate(obj)
+    if entry is not None and qualname in entry['docstrings']:
+        return entry['docstrings'][qualname]
+    # not indexed, or without a docstring of its own which inspect.getdoc may find in a parent
+    return parse_tokens(inspect.getdoc(obj))
+
+
+def workarounds(obj):
+    """Return the ``is_open`` usages in the source of a module or function, by usage"""
+    entry, qualname = _locate(obj)
+    if entry is not None and qualname in entry['workarounds']:
+        return entry['workarounds'][qualname]
+    return parse_workarounds(inspect.getsource(obj))
+
+
+def module_component(module):
+    """Return the first CaseComponent found in the source of ``module``"""
+    entry, _ = _locate(module)
+    if entry is not None:
+        return entry['component']
+    matches = TOKEN_REGEXES['component'].findall(inspect.getsource(module))
+    return matches[0] if matches else None
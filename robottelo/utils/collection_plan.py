@@ -0,0 +1,222 @@
+"""Collection plan shared by the xdist workers of a session.
+
+Every xdist worker collects the tests on its own, and used to run the expensive
+``pytest_collection_modifyitems`` hooks on its own too: testimony markers, Jira status lookups,
+Report Portal queries and ssh calls to the Satellite. With ``performance.collection_plan``
+enabled, the hooks decorated with :func:`planned` only run in the first worker reaching them,
+which records what they did to the items: the deselected and reordered items, the markers and
+``user_properties`` they added and the ``pytest`` attributes they set. The other workers wait
+for that plan and replay it instead of running the hooks::
+
+    @pytest.hookimpl(tryfirst=True)
+    @collection_plan.planned('metadata_markers')
+    def pytest_collection_modifyitems(items, config): ...
+
+The plan is written under ``robottelo_tmp_dir`` when the collection of the planning worker is
+finished, see ``pytest_plugins/collection_plan.py``. A step is only replayed on exactly the same
+items it was recorded on, otherwise the hook runs like without a plan. A step whose markers,
+properties or attributes would not come back the same from json is not recorded at all, the hook
+then runs in every worker. Without xdist, the hooks always run.
+"""
+
+from collections import defaultdict
+import copy
+import fcntl
+import functools
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import time
+
+import pytest
+
+from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.logging import collection_logger as logger
+
+PLAN_DIR = Path(robottelo_tmp_dir) / 'collection_plan'
+# plans of older sessions are removed when a new plan is written
+PLAN_MAX_AGE = 86400  # seconds
+
+_plan = None
+
+
+def _digest(items):
+    return hashlib.sha1('\n'.join(item.nodeid for item in items).encode()).hexdigest()
+
+
+def _marks(item, start):
+    return [[mark.name, list(mark.args), mark.kwargs] for mark in item.own_markers[start:]]
+
+
+def _check_json(value, path):
+    """Raise ``TypeError`` when ``value`` would not be decoded the same from json"""
+    if value is None or type(value) in (str, int, float, bool):
+        return
+    if type(value) is list:
+        for index, element in enumerate(value):
+            _check_json(element, f'{path}[{index}]')
+    elif type(value) is dict:
+        for key, element in value.items():
+            if type(key) is not str:
+                raise TypeError(f'{path} has the key {key!r}, which is not a string')
+            _check_json(element, f'{path}[{key!r}]')
+    else:
+        raise TypeError(f'{path} is a {type(value).__name__}, not a json value')
+
+
+def _encode_attribute(value):
+    """Encode a ``pytest`` attribute, keeping track of a ``defaultdict`` and its default value"""
+    if not isinstance(value, defaultdict):
+        return {'value': value}
+    encoded = {'value': dict(value), 'defaultdict': True}
+    if value.default_factory is not None:
+        encoded['default'] = value.default_factory()
+    return encoded
+
+
+def _decode_attribute(encoded):
+    value = encoded['value']
+    if encoded.get('defaultdict'):
+        factory = None
+        if 'default' in encoded:
+            factory = functools.partial(copy.deepcopy, encoded['default'])
+        value = defaultdict(factory, value)
+    return value
+
+
+class CollectionPlan:
+    """Recorded effects of the planned collection hooks of a session
+
+    :param pathlib.Path path: the plan file, shared by all the workers of the session
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.steps = {}
+        self.replaying = False
+        self._lock_fd = None
+
+    def acquire(self):
+        """Wait for the planning worker, load its plan or become the planning worker"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = os.open(self.path.with_suffix('.lock'), os.O_RDWR | os.O_CREAT)
+        # held by the planning worker until its plan is written
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        if self.path.exists():
+            self.steps = json.loads(self.path.read_text())
+            self.replaying = True
+            self.release()
+            logger.info(f'Replaying the collection plan {self.path}')
+        else:
+            logger.info(f'Recording the collection plan {self.path}')
+
+    def release(self):
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def write(self):
+        """Write the recorded plan for the other workers"""
+        if self.replaying:
+            return
+        for old_plan in self.path.parent.glob('*.json'):
+            if time.time() - old_plan.stat().st_mtime > PLAN_MAX_AGE:
+                old_plan.unlink(missing_ok=True)
+        tmp_path = self.path.with_name(f'.{self.path.name}.{os.getpid()}')
+        tmp_path.write_text(json.dumps(self.steps))
+        os.replace(tmp_path, self.path)
+        self.release()
+
+    def record(self, name, hook, items, attributes, *args):
+        """Run ``hook`` and record its effects on ``items`` as step ``name``"""
+        digest = _digest(items)
+        collected = list(items)
+        before = [(len(item.own_markers), len(item.user_properties)) for item in collected]
+        result = hook(*args)
+        kept = {id(item) for item in items}
+        step = {
+            'digest': digest,
+            'order': [item.nodeid for item in items],
+            'deselected': [item.nodeid for item in collected if id(item) not in kept],
+            'markers': {},
+            'user_properties': {},
+            'attributes': {
+                name: _encode_attribute(getattr(pytest, name, None)) for name in attributes
+            },
+        }
+        for item, (markers, properties) in zip(collected, before, strict=True):
+            if marks := _marks(item, markers):
+                step['markers'][item.nodeid] = marks
+            if props := item.user_properties[properties:]:
+                step['user_properties'][item.nodeid] = [list(prop) for prop in props]
+        try:
+            _check_json(step, name)
+        except TypeError as err:
+            logger.warning(f'Collection plan step {name} is run by every worker: {err}')
+            step = {'digest': None, 'unplanned': str(err)}
+        self.steps[name] = step
+        return result
+
+    def replay(self, name, items, config):
+        """Apply the recorded step ``name`` to ``items``
+
+        :return: ``False`` when the step was not recorded on the same items
+        """
+        step = self.steps.get(name)
+        if step is not None and 'unplanned' in step:
+            return False
+        if step is None or step['digest'] != _digest(items):
+            logger.warning(f'Collection plan step {name} does not match the collected tests')
+            return False
+        by_nodeid = {item.nodeid: item for item in items}
+        for nodeid, marks in step['markers'].items():
+            for mark_name, args, kwargs in marks:
+                by_nodeid[nodeid].add_marker(getattr(pytest.mark, mark_name)(*args, **kwargs))
+        for nodeid, properties in step['user_properties'].items():
+            by_nodeid[nodeid].user_properties.extend(tuple(prop) for prop in properties)
+        for attribute, value in step['attributes'].items():
+            setattr(pytest, attribute, _decode_attribute(value))
+        if step['deselected']:
+            config.hook.pytest_deselected(items=[by_nodeid[n] for n in step['deselected']])
+        items[:] = [by_nodeid[nodeid] for nodeid in step['order']]
+        return True
+
+
+def get_plan(config):
+    """Return the collection plan of the session, or ``None`` when not planning"""
+    global _plan
+    workerinput = getattr(config, 'workerinput', None)
+    if workerinput is None or not settings.performance.collection_plan:
+        return None
+    if _plan is None:
+        _plan = CollectionPlan(PLAN_DIR / f'{workerinput["testrunuid"]}.json')
+        _plan.acquire()
+    return _plan
+
+
+def planned(name, attributes=()):
+    """Run a ``pytest_collection_modifyitems`` hook once per session, see the module docstring
+
+    :param str name: name of the plan step, unique among the planned hooks
+    :param attributes: names of the ``pytest`` module attributes set by the hook, shared with
+        the other workers as json, a ``defaultdict`` is restored with its default value
+    """
+
+    def decorator(hook):
+        signature = inspect.signature(hook)
+
+        @functools.wraps(hook)
+        def wrapper(*args):
+            arguments = signature.bind(*args).arguments
+            plan = get_plan(arguments['config'])
+            if plan is None:
+                return hook(*args)
+            if plan.replaying and plan.replay(name, arguments['items'], arguments['config']):
+                return None
+            return plan.record(name, hook, arguments['items'], attributes, *args)
+
+        return wrapper
+
+    return decorator
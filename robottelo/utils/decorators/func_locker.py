@@ -1,4 +1,4 @@
-"""Implements test function locking, using pytest_services file locking
+"""Implements test function locking, using fcntl.flock file locks
 
 Usage::
 
@@ -38,15 +38,38 @@ Usage::
        def test_that_conflict_with_test_to_lock(self)
             with locking_function(self.test_to_lock):
                 # do some operations that conflict with test_to_lock
+
+    # callers only reading the locked state can hold the lock together, while a
+    # caller locking in exclusive mode waits for all of them
+    @lock_function(mode=LOCK_MODE_SHARED)
+    def read_shared_state():
+        pass
+
+    # callers with different keys never wait for each other, the key function
+    # receives the arguments of the locked function
+    @lock_function(shard_key=lambda org, **kwargs: str(org.id))
+    def setup_org_content(org, **kwargs):
+        pass
+
+The time spent waiting for and holding every locked function is recorded, see
+get_lock_stats, and logged when the process exits.
+
+A lock not acquired within its timeout raises FunctionLockerError, formerly
+zc.lockfile.LockError when the locks came from pytest_services: callers catching
+that exception must catch FunctionLockerError instead.
 """
 
+import atexit
+from collections import defaultdict
 from contextlib import contextmanager
+import fcntl
 import functools
-import inspect
 import os
+from random import random
+import sys
 import tempfile
-
-from pytest_services.locks import file_lock
+import threading
+import time
 
 from robottelo.config import settings
 from robottelo.logging import logger
@@ -57,9 +80,23 @@ LOCK_DIR = None
 LOCK_DEFAULT_TIMEOUT = 1800  # 30 minutes
 LOCK_FILE_NAME_EXT = 'lock'
 LOCK_DEFAULT_SCOPE = None
+LOCK_MODE_EXCLUSIVE = 'exclusive'
+LOCK_MODE_SHARED = 'shared'
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
+_lock_stats = defaultdict(
+    lambda: {
+        'acquired': 0,
+        'contended': 0,
+        'wait_time': 0.0,
+        'max_wait_time': 0.0,
+        'hold_time': 0.0,
+        'max_hold_time': 0.0,
+    }
+)
+_lock_stats_lock = threading.Lock()
+
 
 class FunctionLockerError(Exception):
     """the default function locker error"""
@@ -147,14 +184,81 @@ def _get_function_name(function, class_name=None):
     return '.'.join(names)
 
 
-def _get_function_name_lock_path(function_name, scope=None, scope_kwargs=None, scope_context=None):
+def _get_function_name_lock_path(
+    function_name, scope=None, scope_kwargs=None, scope_context=None, shard_key=None
+):
     """Return the path of the file to lock"""
+    file_name = function_name if shard_key is None else f'{function_name}.{shard_key}'
     return os.path.join(
         _get_scope_path(scope, scope_kwargs=scope_kwargs, scope_context=scope_context),
-        f'{function_name}.{LOCK_FILE_NAME_EXT}',
+        f'{file_name}.{LOCK_FILE_NAME_EXT}',
     )
 
 
+def _record_lock_stats(function_name, wait_time, hold_time, contended):
+    with _lock_stats_lock:
+        stats = _lock_stats[function_name]
+        stats['acquired'] += 1
+        stats['contended'] += int(contended)
+        stats['wait_time'] += wait_time
+        stats['max_wait_time'] = max(stats['max_wait_time'], wait_time)
+        stats['hold_time'] += hold_time
+        stats['max_hold_time'] = max(stats['max_hold_time'], hold_time)
+
+
+def get_lock_stats():
+    """Return the lock statistics of this process by locked function name
+
+    Every entry counts the acquisitions of the lock, how many of them had to wait for another
+    holder, and the total and maximum seconds spent waiting for the lock and holding it.
+    """
+    with _lock_stats_lock:
+        return {name: dict(stats) for name, stats in _lock_stats.items()}
+
+
+@atexit.register
+def _log_lock_stats():
+    for name, stats in sorted(get_lock_stats().items(), key=lambda item: -item[1]['wait_time']):
+        logger.info(
+            f'lock {name}: acquired {stats["acquired"]} times, {stats["contended"]} contended, '
+            f'waited {stats["wait_time"]:.1f}s (max {stats["max_wait_time"]:.1f}s), '
+            f'held {stats["hold_time"]:.1f}s (max {stats["max_hold_time"]:.1f}s)'
+        )
+
+
+@contextmanager
+def _file_lock(lock_file_path, function_name, mode=LOCK_MODE_EXCLUSIVE, timeout=None):
+    """Lock the file in shared or exclusive mode, and record the wait and hold times
+
+    :raises FunctionLockerError: when the lock is not acquired in ``timeout`` seconds
+    """
+    if mode not in (LOCK_MODE_EXCLUSIVE, LOCK_MODE_SHARED):
+        raise FunctionLockerError(f'Unknown lock mode {mode!r}')
+    flags = (fcntl.LOCK_SH if mode == LOCK_MODE_SHARED else fcntl.LOCK_EX) | fcntl.LOCK_NB
+    start = time.monotonic()
+    contended = False
+    with open(os.open(lock_file_path, os.O_RDWR | os.O_CREAT, 0o666), 'r+') as handler:
+        while True:
+            try:
+                fcntl.flock(handler.fileno(), flags)
+                break
+            except OSError as err:
+                contended = True
+                if timeout is not None and time.monotonic() - start >= timeout:
+                    raise FunctionLockerError(
+                        f'Could not lock {lock_file_path} in {timeout} seconds'
+                    ) from err
+                time.sleep(random() * 0.1 + 0.05)
+        acquired = time.monotonic()
+        try:
+            yield handler
+        finally:
+            fcntl.flock(handler.fileno(), fcntl.LOCK_UN)
+            _record_lock_stats(
+                function_name, acquired - start, time.monotonic() - acquired, contended
+            )
+
+
 def _check_deadlock(lock_file_path, process_id):
     """To prevent process deadlock, raise exception if the file content is the
     same as process_id
@@ -194,6 +298,8 @@ def lock_function(
     scope_context=None,
     scope_kwargs=None,
     timeout=LOCK_DEFAULT_TIMEOUT,
+    mode=LOCK_MODE_EXCLUSIVE,
+    shard_key=None,
 ):
     """Generic function locker, lock any decorated function. Any parallel
      pytest xdist worker will wait for this function to finish
@@ -203,6 +309,8 @@ def lock_function(
     :type scope_kwargs: dict
     :type scope_context: str
     :type timeout: int
+    :type mode: str
+    :type shard_key: callable
 
     :param function: the function that is intended to be locked
     :param scope: this parameter will define the namespace of locking
@@ -210,14 +318,22 @@ def lock_function(
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
     :param timeout: the time in seconds to wait for acquiring the lock
+    :param mode: LOCK_MODE_EXCLUSIVE, or LOCK_MODE_SHARED to let other shared
+           callers hold the lock at the same time
+    :param shard_key: called with the arguments of the function, returns a
+           string, only the calls with the same key are locked together
     """
     class_names = []
     class_name = None
     index = 1
-    while class_name != '<module>' and index <= _DEFAULT_CLASS_NAME_DEPTH:
+    # the names of the enclosing class bodies, read without building the frame
+    # records of inspect.getouterframes
+    frame = sys._getframe(1)
+    while class_name != '<module>' and index <= _DEFAULT_CLASS_NAME_DEPTH and frame:
         if class_name:
             class_names.append(class_name)
-        class_name = inspect.getouterframes(inspect.currentframe())[index][3]
+        class_name = frame.f_code.co_name
+        frame = frame.f_back
         index += 1
 
     class_names.reverse()
@@ -231,17 +347,23 @@ def lock_function(
         def function_wrapper(*args, **kwargs):
             function_name = _get_function_name(func, class_name=class_name)
             lock_file_path = _get_function_name_lock_path(
-                function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
+                function_name,
+                scope=scope,
+                scope_kwargs=scope_kwargs,
+                scope_context=scope_context,
+                shard_key=shard_key(*args, **kwargs) if shard_key else None,
             )
             process_id = str(os.getpid())
             # to prevent dead lock when recursively calling this function
             # check if the same process is trying to acquire the lock
             _check_deadlock(lock_file_path, process_id)
 
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+            with _file_lock(lock_file_path, function_name, mode=mode, timeout=timeout) as handler:
                 logger.info(
                     f'process id: {process_id} lock function using file path: {lock_file_path}'
                 )
+                if mode == LOCK_MODE_SHARED:
+                    return func(*args, **kwargs)
                 # write the process id that locked this function
                 _write_content(handler, process_id)
                 # call the locked function
@@ -270,6 +392,8 @@ def locking_function(
     scope_context=None,
     scope_kwargs=None,
     timeout=LOCK_DEFAULT_TIMEOUT,
+    mode=LOCK_MODE_EXCLUSIVE,
+    shard_key=None,
 ):
     """Lock a function in combination with a scope and scope_context.
     Any parallel pytest xdist worker will wait for this function to finish.
@@ -279,6 +403,8 @@ def locking_function(
     :type scope_kwargs: dict
     :type scope_context: str
     :type timeout: int
+    :type mode: str
+    :type shard_key: str
 
     :param function: the function that is intended to be locked
     :param scope: this parameter will define the namespace of locking
@@ -286,23 +412,33 @@ def locking_function(
            lock in combination with scope and function.
     :param scope_kwargs: kwargs to be passed to scope if is a callable
     :param timeout: the time in seconds to wait for acquiring the lock
+    :param mode: LOCK_MODE_EXCLUSIVE, or LOCK_MODE_SHARED to let other shared
+           callers hold the lock at the same time
+    :param shard_key: only the callers with the same key are locked together
     """
     if not getattr(function, '__function_locked__', False):
         raise FunctionLockerError('Cannot ensure locking when using a non locked function')
     class_name = getattr(function, '__class_name__', None)
     function_name = _get_function_name(function, class_name=class_name)
     lock_file_path = _get_function_name_lock_path(
-        function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
+        function_name,
+        scope=scope,
+        scope_kwargs=scope_kwargs,
+        scope_context=scope_context,
+        shard_key=shard_key,
     )
     process_id = str(os.getpid())
     # to prevent dead lock when recursively calling this function
     # check if the same process is trying to acquire the lock
     _check_deadlock(lock_file_path, process_id)
 
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+    with _file_lock(lock_file_path, function_name, mode=mode, timeout=timeout) as handler:
         logger.info(
             f'process id: {process_id} - lock function name:{function_name}  - using file path: {lock_file_path}'
         )
+        if mode == LOCK_MODE_SHARED:
+            yield handler
+            return
         # write the process id that locked this function
         _write_content(handler, process_id)
         # let the locked code run
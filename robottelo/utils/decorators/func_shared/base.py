@@ -1,14 +1,117 @@
+"""Base storage handler and the codecs of the stored values.
+
+A value is encoded with the codec chosen by the writer, ``json`` by default, and
+the name of any other codec is written in front of the encoded value, so each
+key is decoded with the codec it was written with, whatever the codec of the
+reader. Values written without codec name are json, as before codecs existed.
+
+Loading a pickle runs code chosen by its writer, so pickle values are only read
+when pickle is the codec of the reader, the configured default codec, or when
+the ``shared_function.allow_pickle`` setting is on.
+
+Available codecs:
+
+    json: plain json text
+    json.zlib: zlib compressed json, for large results
+    pickle: pickle protocol 5, keeps tuples, sets and any picklable object
+    msgpack: binary json-like, when the optional msgpack package is installed
+"""
+
 import json
+import pickle
+import zlib
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+CODEC_JSON = 'json'
+CODEC_JSON_ZLIB = 'json.zlib'
+CODEC_PICKLE = 'pickle'
+CODEC_MSGPACK = 'msgpack'
+
+DEFAULT_CODEC = CODEC_JSON
+ALLOW_PICKLE = False
+
+# the encoded values of other codecs than json start with this header followed
+# by the codec name and a new line, a json text never starts with a null byte
+CODEC_HEADER = b'\x00codec:'
+
+
+def _json_dumps(data):
+    return json.dumps(data).encode()
+
+
+def _json_zlib_dumps(data):
+    return zlib.compress(_json_dumps(data), 1)
+
+
+def _json_zlib_loads(data):
+    return json.loads(zlib.decompress(data))
+
+
+def _pickle_dumps(data):
+    return pickle.dumps(data, protocol=5)
+
+
+_codecs = {
+    CODEC_JSON: (_json_dumps, json.loads),
+    CODEC_JSON_ZLIB: (_json_zlib_dumps, _json_zlib_loads),
+    CODEC_PICKLE: (_pickle_dumps, pickle.loads),
+}
+if msgpack is not None:
+    _codecs[CODEC_MSGPACK] = (msgpack.packb, msgpack.unpackb)
+
+
+def register_codec(name, dumps, loads):
+    """Register a codec, dumps return bytes from data and loads the reverse"""
+    _codecs[name] = (dumps, loads)
+
+
+def get_codecs():
+    """Return the names of the available codecs"""
+    return list(_codecs)
 
 
 class BaseStorageHandler:
-    @staticmethod
-    def encode(data):
-        return json.dumps(data)
+    codec = None
+
+    def encode(self, data, codec=None):
+        """Return the data encoded as bytes with codec, the handler or the default codec
+
+        :raises ValueError: when the codec is not available
+        """
+        codec = codec or self.codec or DEFAULT_CODEC
+        if codec not in _codecs:
+            raise ValueError(f'Shared function codec "{codec}" not available')
+        dumps, _ = _codecs[codec]
+        if codec == CODEC_JSON:
+            return dumps(data)
+        return b''.join([CODEC_HEADER, codec.encode(), b'\n', dumps(data)])
+
+    def decode(self, data, codec=None):
+        """Return the data decoded with the codec it was encoded with
 
-    @staticmethod
-    def decode(data):
-        return json.loads(data)
+        :param codec: the codec the reader expects, which allows reading pickle values
+        :raises ValueError: when the codec is not available, or is pickle and not trusted
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        if not data.startswith(CODEC_HEADER):
+            return json.loads(data)
+        value_codec, _, data = data[len(CODEC_HEADER) :].partition(b'\n')
+        value_codec = value_codec.decode()
+        if value_codec not in _codecs:
+            raise ValueError(f'Shared function codec "{value_codec}" not available')
+        if (
+            value_codec == CODEC_PICKLE
+            and not ALLOW_PICKLE
+            and CODEC_PICKLE not in (codec, self.codec, DEFAULT_CODEC)
+        ):
+            raise ValueError('Shared function value stored with pickle, which is not allowed')
+        _, loads = _codecs[value_codec]
+        return loads(data)
 
     def lock(self, lock_key):
         """Return the storage locker context manager"""
@@ -18,10 +121,10 @@ class BaseStorageHandler:
         """called when the lock is acquired to do some added action"""
         raise NotImplementedError
 
-    def get(self, key):
-        """Return the key value"""
+    def get(self, key, codec=None):
+        """Return the key value, ``codec`` is passed to :meth:`decode`"""
         raise NotImplementedError
 
-    def set(self, key, value):
+    def set(self, key, value, codec=None):
         """Write the value of key to storage"""
         raise NotImplementedError
@@ -73,27 +73,29 @@ class FileStorageHandler(BaseStorageHandler):
         handler.write(str(os.getpid()))
         handler.flush()
 
-    def get(self, key):
+    def get(self, key, codec=None):
         """Return the key value
         :type key: str
+        :type codec: str
         """
         value = None
         key_file_path = self.get_key_file_path(key)
         if os.path.exists(key_file_path):
-            with open(key_file_path) as file_handler:
+            with open(key_file_path, 'rb') as file_handler:
                 value = file_handler.read()
 
         if value is not None:
-            value = self.decode(value)
+            value = self.decode(value, codec=codec)
         return value
 
-    def set(self, key, value):
+    def set(self, key, value, codec=None):
         """Write the value of key
 
         :type key: str
         :type value: object
+        :type codec: str
         """
-        value = self.encode(value)
+        value = self.encode(value, codec=codec)
         key_file_path = self.get_key_file_path(key)
-        with open(key_file_path, 'w') as file_handler:
+        with open(key_file_path, 'wb') as file_handler:
             file_handler.write(value)
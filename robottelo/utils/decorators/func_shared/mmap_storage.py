@@ -0,0 +1,213 @@
+"""Single file key value storage handler.
+
+All the keys are stored in one append only file, read through mmap, instead of
+one file per key: a process opens the store file once and looks up the keys in
+an index of the records, updated from the records appended since its last read.
+
+Each record is: crc32 of the key and the value, key length, value length, key,
+value. The last record of a key is its value. A record that does not match its
+crc32 is an append in progress, or an append interrupted by a crashed process,
+that the next writer truncates. The store is rewritten with only the last
+records of the keys when the replaced records take more than half of it.
+
+The keys are locked with a POSIX lock of one byte of the lock file, at an offset
+computed from the key, and the appends with a lock of the first byte.
+"""
+
+from contextlib import contextmanager
+import fcntl
+import hashlib
+import mmap
+import os
+from random import random
+import struct
+import threading
+import time
+import zlib
+
+from robottelo.utils.decorators.func_shared.base import BaseStorageHandler
+from robottelo.utils.decorators.func_shared.file_storage import _get_root_dir
+
+STORE_FILE_NAME = 'shared_functions.store'
+LOCK_TIMEOUT = 7200
+# the store is not compacted before the replaced records take this number of bytes
+COMPACT_MIN_SIZE = 1024 * 1024
+
+_RECORD_HEADER = struct.Struct('<III')
+_APPEND_LOCK_OFFSET = 0
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _key_lock_offset(key):
+    return 1 + int.from_bytes(hashlib.sha1(key.encode()).digest()[:6], 'big')
+
+
+class _Store:
+    """The store file as seen by this process"""
+
+    def __init__(self, path):
+        self.path = path
+        # POSIX locks are released when any descriptor of the file is closed by
+        # the process, the lock file is never closed
+        self._lock_fd = os.open(f'{path}.lock', os.O_RDWR | os.O_CREAT, 0o666)
+        self._lock = threading.RLock()
+        self._fd = None
+        self._inode = None
+        self._map = None
+        self._index = {}
+        self._scanned = 0
+        self._replaced = 0
+
+    @contextmanager
+    def range_lock(self, offset, operation, timeout=None):
+        """Lock one byte of the lock file at offset
+
+        :raises TimeoutError: when not locked in timeout seconds
+        """
+        start = time.monotonic()
+        while True:
+            try:
+                fcntl.lockf(self._lock_fd, operation | fcntl.LOCK_NB, 1, offset)
+                break
+            except OSError as err:
+                if timeout is not None and time.monotonic() - start >= timeout:
+                    raise TimeoutError(
+                        f'Could not lock {self.path} at {offset} in {timeout} seconds'
+                    ) from err
+                time.sleep(random() * 0.1 + 0.05)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, offset)
+
+    def _close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._index = {}
+        self._scanned = 0
+        self._replaced = 0
+
+    def _sync(self):
+        """Index the records appended since the last call, return the store size"""
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if self._fd is None or inode != self._inode:
+            # first read, or the store was compacted by another process
+            self._close()
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o666)
+            self._inode = os.fstat(self._fd).st_ino
+        size = os.fstat(self._fd).st_size
+        if size == self._scanned:
+            return size
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+        position = self._scanned
+        while position + _RECORD_HEADER.size <= size:
+            crc, key_length, value_length = _RECORD_HEADER.unpack_from(self._map, position)
+            start = position + _RECORD_HEADER.size
+            end = start + key_length + value_length
+            if end > size or zlib.crc32(self._map[start:end]) != crc:
+                break
+            key = self._map[start : start + key_length].decode()
+            if key in self._index:
+                self._replaced += self._index[key][1] + key_length + _RECORD_HEADER.size
+            self._index[key] = (start + key_length, value_length)
+            position = end
+        self._scanned = position
+        return size
+
+    def _compact(self):
+        tmp_path = os.path.join(
+            os.path.dirname(self.path), f'.{os.path.basename(self.path)}.{os.getpid()}'
+        )
+        with open(tmp_path, 'wb') as store:
+            for key in self._index:
+                store.write(_record(key, self._value(key)))
+        os.replace(tmp_path, self.path)
+        self._sync()
+
+    def _value(self, key):
+        offset, length = self._index[key]
+        return self._map[offset : offset + length]
+
+    def get(self, key):
+        with self._lock, self.range_lock(_APPEND_LOCK_OFFSET, fcntl.LOCK_SH):
+            self._sync()
+            return self._value(key) if key in self._index else None
+
+    def append(self, key, value):
+        with self._lock, self.range_lock(_APPEND_LOCK_OFFSET, fcntl.LOCK_EX):
+            if self._sync() > self._scanned:
+                # the record of an interrupted append
+                os.ftruncate(self._fd, self._scanned)
+            if self._replaced > COMPACT_MIN_SIZE and self._replaced > self._scanned // 2:
+                self._compact()
+            os.write(self._fd, _record(key, value))
+            self._sync()
+
+
+def _record(key, value):
+    key = key.encode()
+    return b''.join(
+        [_RECORD_HEADER.pack(zlib.crc32(key + value), len(key), len(value)), key, value]
+    )
+
+
+def _get_store(path):
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = _Store(path)
+        return _stores[path]
+
+
+class MmapStorageHandler(BaseStorageHandler):
+    """Key value storage handler keeping all the keys in a single file."""
+
+    def __init__(self, root_dir=None, create=True, lock_timeout=None):
+        if root_dir is None:
+            root_dir = _get_root_dir()
+
+        if create and not os.path.exists(root_dir):
+            os.makedirs(root_dir)
+
+        self._lock_timeout = LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+        self._store = _get_store(os.path.join(root_dir, STORE_FILE_NAME))
+
+    def lock(self, key):
+        """Return the storage locker context manager"""
+        return self._store.range_lock(
+            _key_lock_offset(key), fcntl.LOCK_EX, timeout=self._lock_timeout
+        )
+
+    def when_lock_acquired(self, data):
+        # do nothing
+        pass
+
+    def get(self, key, codec=None):
+        """Return the key value
+
+        :type key: str
+        :type codec: str
+        """
+        value = self._store.get(key)
+        if value is not None:
+            value = self.decode(value, codec=codec)
+        return value
+
+    def set(self, key, value, codec=None):
+        """Write the value of key
+
+        :type key: str
+        :type value: object
+        :type codec: str
+        """
+        self._store.append(key, self.encode(value, codec=codec))
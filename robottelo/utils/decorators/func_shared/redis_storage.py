@@ -43,21 +43,23 @@ class RedisStorageHandler(BaseStorageHandler):
         # do nothing
         pass
 
-    def get(self, key):
+    def get(self, key, codec=None):
         """Return the key value
 
         :type key: str
+        :type codec: str
         """
         value = self.client.get(key)
         if value is not None:
-            value = self.decode(value)
+            value = self.decode(value, codec=codec)
         return value
 
-    def set(self, key, value):
+    def set(self, key, value, codec=None):
         """Write the value of key
 
         :type key: str
         :type value: object
+        :type codec: str
         """
-        value = self.encode(value)
+        value = self.encode(value, codec=codec)
         self.client.set(key, value)
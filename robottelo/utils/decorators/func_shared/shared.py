@@ -83,8 +83,16 @@ Usage::
             # create a virtual machine
 
             return dict(org=cls.org, repo=cls.repo}
+
+Note: Once ready, the stored results are also kept in memory by each process
+    until they expire, later calls in the same process return them without
+    locking and reading the storage. The number of results kept is limited by
+    shared_function.memo_size, the least recently used results are dropped
+    first. Call clear_memo to read the storage again.
 """
 
+from collections import OrderedDict, defaultdict
+import copy
 import datetime
 import functools
 import hashlib
@@ -92,6 +100,7 @@ from importlib import import_module
 import inspect
 import os
 import sys
+import threading
 import traceback
 import uuid
 
@@ -99,11 +108,21 @@ from nailgun.entities import Entity
 
 from robottelo.config import setting_is_set, settings
 from robottelo.logging import logger
-from robottelo.utils.decorators.func_shared import file_storage, redis_storage
+from robottelo.utils.decorators.func_shared import (
+    base,
+    file_storage,
+    mmap_storage,
+    redis_storage,
+)
 from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.utils.decorators.func_shared.mmap_storage import MmapStorageHandler
 from robottelo.utils.decorators.func_shared.redis_storage import RedisStorageHandler
 
-_storage_handlers = {'file': FileStorageHandler, 'redis': RedisStorageHandler}
+_storage_handlers = {
+    'file': FileStorageHandler,
+    'mmap': MmapStorageHandler,
+    'redis': RedisStorageHandler,
+}
 
 DEFAULT_STORAGE_HANDLER = 'file'
 # by default using the shared data is disabled
@@ -112,6 +131,8 @@ NAMESPACE_SCOPE = None
 # after 24 hours the shared function data will became not valid
 SHARE_DEFAULT_TIMEOUT = 86400
 DEFAULT_CALL_RETRIES = 2
+# the maximum number of results kept in memory, 0 to disable
+MEMO_SIZE = 256
 
 _configured = False
 
@@ -138,13 +159,18 @@ def _check_config():
     global NAMESPACE_SCOPE
     global SHARE_DEFAULT_TIMEOUT
     global DEFAULT_CALL_RETRIES
+    global MEMO_SIZE
     if not _configured and setting_is_set('shared_function'):
         DEFAULT_STORAGE_HANDLER = settings.shared_function.storage
         ENABLED = settings.shared_function.enabled
         NAMESPACE_SCOPE = settings.shared_function.scope
         SHARE_DEFAULT_TIMEOUT = settings.shared_function.share_timeout
         DEFAULT_CALL_RETRIES = settings.shared_function.call_retries
+        MEMO_SIZE = settings.shared_function.memo_size
+        base.DEFAULT_CODEC = settings.shared_function.codec
+        base.ALLOW_PICKLE = settings.shared_function.allow_pickle
         file_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        mmap_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
         redis_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
         redis_storage.REDIS_HOST = settings.shared_function.redis_host
         redis_storage.REDIS_PORT = settings.shared_function.redis_port
@@ -187,6 +213,44 @@ def _get_default_storage_handler():
     return _storage_handlers.get(DEFAULT_STORAGE_HANDLER)()
 
 
+# stored values by key with their expiration timestamp, least recently used first
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+# prevent the threads of this process to compute the same function at the same time
+_key_locks = defaultdict(threading.Lock)
+
+
+def _memo_get(key):
+    """Return the stored value of key kept in memory, or None when not kept or expired"""
+    with _memo_lock:
+        entry = _memo.get(key)
+        if entry is None:
+            return None
+        value, expire_timestamp = entry
+        if datetime.datetime.now(datetime.UTC).timestamp() >= expire_timestamp:
+            del _memo[key]
+            return None
+        _memo.move_to_end(key)
+        return value
+
+
+def _memo_set(key, value, expire_timestamp):
+    """Keep the stored value of key in memory until expire_timestamp"""
+    if MEMO_SIZE <= 0:
+        return
+    with _memo_lock:
+        _memo[key] = (value, expire_timestamp)
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def clear_memo():
+    """Forget the results kept in memory, the next calls read them from storage"""
+    with _memo_lock:
+        _memo.clear()
+
+
 class SharedFunctionError(Exception):
     """Shared function related exception"""
 
@@ -213,6 +277,7 @@ class _SharedFunction:
         timeout=SHARE_DEFAULT_TIMEOUT,
         inject=False,
         injected_kw='_inject',
+        codec=None,
     ):
         if storage_handler is None:
             storage_handler = _get_default_storage_handler()
@@ -235,6 +300,7 @@ class _SharedFunction:
         self._max_retries = retries
         self._transaction = uuid.uuid4().hex
         self._share_timeout = timeout
+        self._codec = codec
 
     @property
     def storage(self):
@@ -284,38 +350,34 @@ class _SharedFunction:
         return result, exp, traceback_text
 
     def _has_result_expired(self, creation_datetime):
-        expire_datetime = creation_datetime + datetime.timedelta(seconds=self._share_timeout)
-        return datetime.datetime.now(datetime.UTC) >= expire_datetime
+        return datetime.datetime.now(datetime.UTC) >= self._expire_datetime(creation_datetime)
 
-    def __call__(self):
+    def _expire_datetime(self, creation_datetime):
+        return creation_datetime + datetime.timedelta(seconds=self._share_timeout)
+
+    def _get_or_call(self):
+        """Return the stored value, calling the function if not stored or expired
+
+        :return: the stored value, whether the function was called by this process and the
+            exception raised by the function
+        """
         # this lock prevent any other process to run the function,
         # and if an other process is running the function, I should wait it
         # to finish
         # note: when results are ready this lock has a very short time
+        exp = None
         with self.storage.lock(self.key) as data:
             self.storage.when_lock_acquired(data)
             # first must investigate, call the function or use the results
-            result = None
-            error = None
-            traceback_text = ''
-            error_class_name = None
-            exp = None
-            pid = None
-            value = self.storage.get(self.key)
+            value = self.storage.get(self.key, codec=self._codec)
             if value is None:
                 call_function = True
             else:
-                state = value['state']
-                result = value['result']
-                error = value['error']
-                traceback_text = value.get('traceback', '')
-                error_class_name = value.get('error_class_name')
-                pid = value['pid']
                 creation_datetime = datetime.datetime.strptime(
                     value['creation_datetime'], _DATETIME_FORMAT
                 ).replace(tzinfo=datetime.UTC)
 
-                if state in [_STATE_READY, _STATE_FAILED] and not self._has_result_expired(
+                if value['state'] in [_STATE_READY, _STATE_FAILED] and not self._has_result_expired(
                     creation_datetime
                 ):
                     call_function = False
@@ -324,7 +386,7 @@ class _SharedFunction:
 
             if call_function is True:
                 result, exp, traceback_text = self._call_function()
-                creation_datetime = datetime.datetime.now(datetime.UTC).strftime(_DATETIME_FORMAT)
+                creation_datetime = datetime.datetime.now(datetime.UTC).replace(microsecond=0)
                 if exp:
                     error = str(exp) or 'error occurred'
                     error_class_name = f'{exp.__class__.__module__}.{exp.__class__.__name__}'
@@ -336,20 +398,46 @@ class _SharedFunction:
                         error_class_name=error_class_name,
                         traceback=traceback_text,
                         pid=os.getpid(),
-                        creation_datetime=creation_datetime,
+                        creation_datetime=creation_datetime.strftime(_DATETIME_FORMAT),
                     )
                 else:
-                    error = None
                     result = self._encode_result_kwargs(result)
                     value = dict(
                         state=_STATE_READY,
                         id=self.transaction,
                         result=result,
-                        error=error,
+                        error=None,
                         pid=os.getpid(),
-                        creation_datetime=creation_datetime,
+                        creation_datetime=creation_datetime.strftime(_DATETIME_FORMAT),
                     )
-                self.storage.set(self.key, value)
+                self.storage.set(self.key, value, codec=self._codec)
+
+        _memo_set(
+            self.key, copy.deepcopy(value), self._expire_datetime(creation_datetime).timestamp()
+        )
+        return value, call_function, exp
+
+    def __call__(self):
+        # double-checked: the results kept in memory are used without any lock,
+        # then only one thread of this process looks at the storage
+        value = _memo_get(self.key)
+        call_function = False
+        exp = None
+        if value is None:
+            with _memo_lock:
+                key_lock = _key_locks[self.key]
+            with key_lock:
+                value = _memo_get(self.key)
+                if value is None:
+                    value, call_function, exp = self._get_or_call()
+        if not call_function:
+            # the caller may modify the result, keep the one in memory intact
+            value = copy.deepcopy(value)
+        result = value['result']
+        error = value['error']
+        traceback_text = value.get('traceback', '')
+        error_class_name = value.get('error_class_name')
+        pid = value['pid']
 
         if call_function and exp:
             # i'am in the first launched process
@@ -473,6 +561,7 @@ def shared(
     function_kw=None,
     inject=False,
     injected_kw='_injected',
+    codec=None,
 ):
     r"""Generic function sharing, share the results of any decorated function.
     Any parallel pytest xdist worker will wait for this function to finish
@@ -486,6 +575,7 @@ def shared(
     :type function_kw: list
     :type inject: bool
     :type injected_kw: str
+    :type codec: str
 
     :param function_: the function that is intended to be shared
     :param scope: this parameter will define the namespace of data sharing
@@ -503,6 +593,9 @@ def shared(
         \**kwargs
     :param injected_kw: the kw arg to set to True to inform the function that
         the kwargs was injected from a saved storage
+    :param codec: the codec used to store the results, by default the
+        shared_function.codec setting, see func_shared.base for the codecs,
+        results stored with pickle are only read back when it is pickle
     """
     _check_config()
     class_names = []
@@ -541,6 +634,7 @@ def shared(
                 retries=retries,
                 inject=inject,
                 injected_kw=injected_kw,
+                codec=codec,
             )
 
             return shared_object()
@@ -0,0 +1,130 @@
+"""History of the test durations, used to schedule the longest work first.
+
+The duration of a test is the time of its setup, call and teardown, so it includes the
+fixtures it sets up, e.g. the Satellites of ``satellite_factory`` or the content hosts. The
+durations of the past sessions are stored in one file under ``robottelo_tmp_dir``, as an
+exponential moving average per test node id, with whether the test is heavy, i.e. marked
+``factory_instance`` or ``content_host``.
+
+The tests are scheduled in work units, see ``pytest_plugins/duration_scheduling.py``: a test
+module using any heavy test is one work unit, so its heavy module fixtures are set up by one
+worker only, and the other modules are split by class like ``--dist loadscope``. The units are
+sent longest first, and :func:`makespan` predicts when the last worker finishes.
+"""
+
+import fcntl
+import heapq
+import json
+import os
+from pathlib import Path
+
+from robottelo.config import robottelo_tmp_dir
+from robottelo.logging import logger
+
+HISTORY_PATH = Path(robottelo_tmp_dir) / 'test_durations.json'
+HEAVY_MARKERS = ('factory_instance', 'content_host')
+# predicted duration of a test without history, in a module without history
+DEFAULT_DURATION = 10.0
+# weight of the last duration in the moving average
+SMOOTHING = 0.5
+
+
+def load(path=None):
+    """Return the durations history by test node id"""
+    path = path or HISTORY_PATH
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    except ValueError as err:
+        logger.warning(f'Ignoring unreadable test durations history {path}: {err}')
+        return {}
+
+
+def update(durations, path=None):
+    """Merge the durations of a session into the history
+
+    :param dict durations: ``{nodeid: {'duration': seconds, 'heavy': bool}}``
+    """
+    path = path or HISTORY_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_fd = os.open(path.with_suffix('.lock'), os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        history = load(path)
+        for nodeid, test in durations.items():
+            if previous := history.get(nodeid):
+                test = dict(
+                    test,
+                    duration=SMOOTHING * test['duration'] + (1 - SMOOTHING) * previous['duration'],
+                )
+            history[nodeid] = test
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}')
+        tmp_path.write_text(json.dumps(history))
+        os.replace(tmp_path, path)
+    finally:
+        os.close(lock_fd)
+
+
+def module_of(nodeid):
+    return nodeid.split('::', 1)[0]
+
+
+def class_of(nodeid):
+    """Return the node id of the class of a test, or of its module, like ``--dist loadscope``"""
+    if nodeid.count('::') > 1:
+        return nodeid.rsplit('::', 1)[0]
+    return module_of(nodeid)
+
+
+def predict(nodeids, history):
+    """Return the predicted duration of each test
+
+    A test without history is predicted as the mean of the other tests of its module.
+    """
+    known = {}
+    for nodeid in nodeids:
+        if nodeid in history:
+            known.setdefault(module_of(nodeid), []).append(history[nodeid]['duration'])
+    return {
+        nodeid: history[nodeid]['duration']
+        if nodeid in history
+        else (
+            sum(known[module_of(nodeid)]) / len(known[module_of(nodeid)])
+            if module_of(nodeid) in known
+            else DEFAULT_DURATION
+        )
+        for nodeid in nodeids
+    }
+
+
+def work_units(nodeids, history):
+    """Group the tests in work units, see the module docstring
+
+    :return: ``[(unit, predicted duration, [nodeids])]`` longest first
+    """
+    heavy_modules = {
+        module_of(nodeid) for nodeid in nodeids if history.get(nodeid, {}).get('heavy')
+    }
+    predicted = predict(nodeids, history)
+    units = {}
+    for nodeid in nodeids:
+        module = module_of(nodeid)
+        units.setdefault(module if module in heavy_modules else class_of(nodeid), []).append(nodeid)
+    return sorted(
+        (
+            (unit, sum(predicted[nodeid] for nodeid in tests), tests)
+            for unit, tests in units.items()
+        ),
+        key=lambda unit: -unit[1],
+    )
+
+
+def makespan(durations, workers):
+    """Return the time the last worker finishes, units sent longest first to the first free worker"""
+    if not durations:
+        return 0.0
+    loads = [0.0] * max(workers, 1)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
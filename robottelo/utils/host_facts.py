@@ -0,0 +1,120 @@
+"""Persistent cache of the facts of the Satellites and Capsules under test.
+
+The version, the RHEL release and the distribution of a Satellite are read over ssh, and they
+are needed while the tests are collected: by ``get_sat_version``/``get_sat_rhel_version``, at
+the import of some test modules and by the collection hooks, on every xdist worker. The facts
+are stored under ``robottelo_tmp_dir`` in one file per hostname, shared by the workers and the
+next sessions, and expire after ``performance.host_facts_ttl`` seconds, 0 by default, which
+disables the cache::
+
+    from robottelo.utils import host_facts
+
+    version = host_facts.cached(sat.hostname, 'version', lambda: read_version(sat))
+
+A host that cannot be connected to is remembered as well, see :func:`set_unreachable`, so the other
+callers fall back to the configured versions right away instead of waiting for the ssh timeout.
+
+Call :func:`invalidate`, or ``ContentHost.clean_cached_properties``, after changing a fact of a
+host, e.g. upgrading it. A host changed outside robottelo keeps its stored facts until they
+expire, so only enable the cache for hosts which don't change between sessions.
+"""
+
+from contextlib import contextmanager
+import fcntl
+import json
+import os
+from pathlib import Path
+import re
+import time
+
+from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.logging import logger
+
+FACTS_DIR = Path(robottelo_tmp_dir) / 'host_facts'
+UNREACHABLE_FACT = 'unreachable'
+# a host failing to answer is not tried again before this number of seconds
+UNREACHABLE_TTL = 300
+
+
+def facts_path(hostname):
+    """Return the path of the facts file of ``hostname``"""
+    name = re.sub(r'[^\w.-]', '_', hostname)
+    return FACTS_DIR / f'{name}.json'
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    except ValueError as err:
+        logger.warning(f'Ignoring unreadable host facts file {path}: {err}')
+        return {}
+
+
+@contextmanager
+def _locked_facts(hostname):
+    """Yield the facts of ``hostname`` for update, and write them back atomically"""
+    path = facts_path(hostname)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_fd = os.open(path.with_suffix('.lock'), os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        facts = _read(path)
+        yield facts
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}')
+        tmp_path.write_text(json.dumps(facts))
+        os.replace(tmp_path, path)
+    finally:
+        os.close(lock_fd)
+
+
+def get(hostname, name, ttl=None):
+    """Return the ``name`` fact of ``hostname``, or ``None`` when not stored or expired
+
+    :param int ttl: maximum age of the fact in seconds, ``performance.host_facts_ttl`` by default
+    """
+    ttl = settings.performance.host_facts_ttl if ttl is None else ttl
+    if not ttl or not hostname:
+        return None
+    fact = _read(facts_path(hostname)).get(name)
+    if fact is None or time.time() - fact['time'] > ttl:
+        return None
+    return fact['value']
+
+
+def store(hostname, name, value):
+    """Store ``value`` as the ``name`` fact of ``hostname``, it must be json compatible"""
+    if not settings.performance.host_facts_ttl or not hostname:
+        return
+    with _locked_facts(hostname) as facts:
+        facts[name] = {'value': value, 'time': time.time()}
+
+
+def cached(hostname, name, compute):
+    """Return the ``name`` fact of ``hostname``, storing the result of ``compute()`` if needed"""
+    value = get(hostname, name)
+    if value is None:
+        value = compute()
+        # an empty output means the fact could not be read, try again next time
+        if value not in (None, ''):
+            store(hostname, name, value)
+    return value
+
+
+def invalidate(hostname, *names):
+    """Remove the ``names`` facts of ``hostname``, or all of them when no name is given"""
+    if not facts_path(hostname).exists():
+        return
+    with _locked_facts(hostname) as facts:
+        for name in names or list(facts):
+            facts.pop(name, None)
+
+
+def set_unreachable(hostname):
+    """Remember that ``hostname`` cannot be reached for :data:`UNREACHABLE_TTL` seconds"""
+    store(hostname, UNREACHABLE_FACT, True)
+
+
+def is_unreachable(hostname):
+    return bool(get(hostname, UNREACHABLE_FACT, ttl=UNREACHABLE_TTL))
@@ -0,0 +1,185 @@
+"""Warm pool of content hosts checked out ahead of the tests needing them.
+
+A function scoped content host used to be checked out when its test started and checked in
+when it finished, and provisioning it often took longer than the test. With
+``content_host.warm_pool.size`` set, each xdist worker checks out up to that many content hosts
+in background threads, for the host configurations its tests will request, and hands them out
+to the ``rhel_contenthost`` fixture instantly::
+
+    with pool.host(host_conf(request)) as host:
+        yield host
+
+The expected number of hosts of each configuration is read from the parametrization of the
+collected tests, see ``pytest_plugins/fixture_markers.py``, divided by the number of xdist
+workers. A host is never given to two tests: the used hosts are torn down when their test
+finishes and checked in in the background, while the hosts that were not used, once no more
+test needs them or at the end of the session, are checked in without teardown.
+"""
+
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json
+import threading
+
+from broker import Broker
+
+from robottelo.logging import logger
+
+_pool = None
+
+
+def pool_key(conf):
+    """Return the key of a host configuration, as built by ``host_conf``"""
+    return json.dumps(conf, sort_keys=True, default=str)
+
+
+def _checkout(conf):
+    from robottelo.hosts import ContentHost
+
+    host = Broker(**conf, host_class=ContentHost).checkout()
+    try:
+        host.setup()
+    except Exception:
+        Broker(hosts=[host]).checkin()
+        raise
+    return host
+
+
+def _checkin(host):
+    Broker(hosts=[host]).checkin()
+
+
+class ContentHostPool:
+    """Content hosts checked out in advance by host configuration
+
+    :param int size: maximum number of hosts checked out in advance
+    :param checkout: function checking out and setting up a host from its configuration
+    :param checkin: function checking in a host
+    """
+
+    def __init__(self, size, checkout=_checkout, checkin=_checkin):
+        self.size = size
+        self._checkout = checkout
+        self._checkin = checkin
+        self._condition = threading.Condition()
+        self._confs = {}
+        self._ready = defaultdict(deque)
+        self._provisioning = Counter()
+        self._demand = Counter()
+        self._failed = set()
+        self._closed = False
+        self._provisioners = ThreadPoolExecutor(max_workers=size, thread_name_prefix='host_pool')
+        self._checkins = ThreadPoolExecutor(max_workers=size, thread_name_prefix='host_checkin')
+
+    def add_demand(self, conf, count=1):
+        """Expect ``count`` more requests of a host of configuration ``conf``"""
+        key = pool_key(conf)
+        with self._condition:
+            self._confs[key] = conf
+            self._demand[key] += count
+            self._fill()
+
+    def _fill(self):
+        """Check out hosts for the configurations expecting more than ready or in progress"""
+        while not self._closed:
+            in_advance = sum(map(len, self._ready.values())) + sum(self._provisioning.values())
+            deficits = {
+                key: demand - len(self._ready[key]) - self._provisioning[key]
+                for key, demand in self._demand.items()
+                if key not in self._failed
+            }
+            key = max(deficits, key=deficits.get, default=None)
+            if in_advance >= self.size or key is None or deficits[key] <= 0:
+                return
+            self._provisioning[key] += 1
+            self._provisioners.submit(self._provision, key)
+
+    def _provision(self, key):
+        host = None
+        try:
+            host = self._checkout(self._confs[key])
+        except Exception as err:  # noqa: BLE001
+            logger.warning(f'Warm pool could not check out a host for {key}: {err}')
+        with self._condition:
+            self._provisioning[key] -= 1
+            if host is None:
+                # the tests will check out their hosts themselves
+                self._failed.add(key)
+            elif self._closed or len(self._ready[key]) >= self._demand[key]:
+                self._checkins.submit(self._checkin, host)
+            else:
+                self._ready[key].append(host)
+            self._condition.notify_all()
+            self._fill()
+
+    def acquire(self, conf):
+        """Return a host of configuration ``conf``, from the pool when one is ready or coming"""
+        key = pool_key(conf)
+        with self._condition:
+            self._confs.setdefault(key, conf)
+            self._condition.wait_for(
+                lambda: self._ready[key] or not self._provisioning[key] or self._closed
+            )
+            if self._demand[key] > 0:
+                self._demand[key] -= 1
+            host = self._ready[key].popleft() if self._ready[key] else None
+            # no more test of this configuration is expected
+            while len(self._ready[key]) > self._demand[key]:
+                self._checkins.submit(self._checkin, self._ready[key].pop())
+            self._fill()
+        if host is None:
+            logger.debug(f'Warm pool has no host ready for {key}')
+            host = self._checkout(conf)
+        return host
+
+    def release(self, host):
+        """Tear down a used host and check it in in the background
+
+        Like the Broker context manager, a host with ``_skip_context_checkin`` set is kept.
+        """
+        try:
+            host.teardown()
+        finally:
+            if not getattr(host, '_skip_context_checkin', False):
+                self._checkins.submit(self._checkin, host)
+
+    @contextmanager
+    def host(self, conf):
+        """Yield a host of configuration ``conf`` and release it"""
+        host = self.acquire(conf)
+        try:
+            yield host
+        finally:
+            self.release(host)
+
+    def close(self):
+        """Check in the hosts not used, and wait for all the check ins"""
+        with self._condition:
+            self._closed = True
+            for hosts in self._ready.values():
+                while hosts:
+                    self._checkins.submit(self._checkin, hosts.pop())
+            self._condition.notify_all()
+        self._provisioners.shutdown(wait=True)
+        self._checkins.shutdown(wait=True)
+
+
+def get_pool():
+    """Return the warm pool of this process, or ``None`` when not enabled"""
+    return _pool
+
+
+def start(size):
+    """Create the warm pool of this process"""
+    global _pool
+    if size and _pool is None:
+        _pool = ContentHostPool(size)
+    return _pool
+
+
+def stop():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
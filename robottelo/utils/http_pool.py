@@ -0,0 +1,255 @@
+"""Per-process pool of keep-alive HTTP sessions used for the nailgun API calls.
+
+``nailgun.client`` sends every request through the ``requests.get``/``requests.post``...
+shortcuts, which create a new session, and therefore a new TCP connection and TLS handshake, for
+every single API call. :func:`install_nailgun_transport` points ``nailgun.client`` to
+:class:`NailgunTransport` instead, which sends the requests through one ``requests.Session`` per
+server, so connections are kept alive and reused by all the entities of a worker::
+
+    from robottelo.utils.http_pool import get_pool
+
+    get_pool().session('https://sat.example.com')  # the session used for that Satellite
+
+Sessions never store cookies, every request is authenticated on its own exactly like before.
+Requests answered with 429, 502 or 503 are retried with an exponential backoff, honoring the
+``Retry-After`` header. The latency of every endpoint is recorded in a :class:`LatencyHistogram`,
+logged when the worker exits::
+
+    get_pool().stats()['latency']['GET /api/hosts/:id']  # {'count': 12, 'p50': 0.25, ...}
+
+Each xdist worker is a separate process, so each worker owns its own pool, it is rebuilt
+transparently after a fork.
+"""
+
+import atexit
+from bisect import bisect_left
+from http.cookiejar import DefaultCookiePolicy
+import os
+import re
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from robottelo.logging import logger
+
+POOL_DEFAULT_MAXSIZE = 10
+POOL_DEFAULT_RETRIES = 3
+POOL_DEFAULT_BACKOFF_FACTOR = 0.5  # seconds, doubled on every retry
+POOL_RETRY_STATUSES = (429, 502, 503)
+# upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float('inf'))
+
+# ids, uuids and other numbers in API paths, replaced to group requests per endpoint
+_PATH_ID_REGEX = re.compile(r'/(\d+|[0-9a-f]{8}-[0-9a-f-]{27})(?=/|$)')
+
+
+class ThrottlingRetry(Retry):
+    """Retry idempotent requests on the configured statuses, and any request on 429
+
+    A request rejected with 429 Too Many Requests was not processed, so it is safe to send it
+    again whatever its method.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 429 and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class LatencyHistogram:
+    """Latency of the requests sent to each endpoint, in :data:`LATENCY_BUCKETS`"""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint(method, url):
+        """Return the ``METHOD /path`` of ``url`` with its ids replaced by ``:id``"""
+        return f'{method} {_PATH_ID_REGEX.sub("/:id", urlsplit(url).path)}'
+
+    def record(self, endpoint, seconds):
+        with self._lock:
+            entry = self._endpoints.setdefault(
+                endpoint, {'count': 0, 'total': 0.0, 'buckets': [0] * len(LATENCY_BUCKETS)}
+            )
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['buckets'][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    @staticmethod
+    def _percentile(entry, percent):
+        """Upper bound of the bucket holding the ``percent`` percentile"""
+        rank = entry['count'] * percent / 100
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, entry['buckets'], strict=True):
+            seen += count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+    def stats(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    'count': entry['count'],
+                    'mean': entry['total'] / entry['count'],
+                    'p50': self._percentile(entry, 50),
+                    'p95': self._percentile(entry, 95),
+                    'buckets': dict(zip(LATENCY_BUCKETS, entry['buckets'], strict=True)),
+                }
+                for endpoint, entry in self._endpoints.items()
+            }
+
+
+class HTTPSessionPool:
+    """Keep-alive ``requests.Session`` objects, one per server
+
+    :param int maxsize: number of connections kept open to a single server, should match the
+        number of threads of a worker sending requests at the same time
+    :param int retries: number of retries of a request answered with one of
+        :data:`POOL_RETRY_STATUSES` or failing to connect
+    :param float backoff_factor: delay before the first retry, doubled on every next one
+    """
+
+    def __init__(
+        self,
+        maxsize=POOL_DEFAULT_MAXSIZE,
+        retries=POOL_DEFAULT_RETRIES,
+        backoff_factor=POOL_DEFAULT_BACKOFF_FACTOR,
+    ):
+        self.maxsize = maxsize
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.latency = LatencyHistogram()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url):
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}'
+
+    def _new_session(self):
+        session = requests.Session()
+        # don't let a session cookie authenticate the requests of another user
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        retry = ThrottlingRetry(
+            total=self.retries,
+            status_forcelist=POOL_RETRY_STATUSES,
+            backoff_factor=self.backoff_factor,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.maxsize, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.hooks['response'].append(self._record_latency)
+        return session
+
+    def _record_latency(self, response, *args, **kwargs):
+        self.latency.record(
+            LatencyHistogram.endpoint(response.request.method, response.request.url),
+            response.elapsed.total_seconds(),
+        )
+
+    def session(self, url):
+        """Return the session used for the server of ``url``"""
+        key = self.make_key(url)
+        with self._lock:
+            if key not in self._sessions:
+                self._sessions[key] = self._new_session()
+            return self._sessions[key]
+
+    def request(self, method, url, **kwargs):
+        return self.session(url).request(method, url, **kwargs)
+
+    def stats(self):
+        """Return the number of open sessions and the latency of every endpoint"""
+        with self._lock:
+            sessions = len(self._sessions)
+        return {'sessions': sessions, 'latency': self.latency.stats()}
+
+    def close_all(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+class NailgunTransport:
+    """Stand-in for the ``requests`` module in ``nailgun.client``
+
+    Implements the ``requests`` shortcuts used by nailgun on top of :class:`HTTPSessionPool`,
+    everything else is looked up in ``requests``.
+    """
+
+    def request(self, method, url, **kwargs):
+        return get_pool().request(method, url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request('POST', url, data=data, json=json, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request('PUT', url, data=data, **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.request('PATCH', url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+_POOL = None
+_POOL_PID = None
+
+
+def get_pool():
+    """Return the HTTP session pool of the current process"""
+    global _POOL, _POOL_PID
+    if _POOL is None or os.getpid() != _POOL_PID:
+        from robottelo.config import settings
+
+        pool_settings = settings.server.http_pool
+        _POOL = HTTPSessionPool(
+            maxsize=pool_settings.maxsize,
+            retries=pool_settings.retries,
+            backoff_factor=pool_settings.backoff_factor,
+        )
+        _POOL_PID = os.getpid()
+    return _POOL
+
+
+def install_nailgun_transport():
+    """Send the nailgun requests through the pool when ``server.http_pool.enabled`` is set"""
+    from nailgun import client
+
+    from robottelo.config import settings
+
+    if settings.server.http_pool.enabled and not isinstance(client.requests, NailgunTransport):
+        client.requests = NailgunTransport()
+        logger.debug('nailgun requests are sent through keep-alive sessions')
+
+
+@atexit.register
+def _close_pool():
+    if _POOL is not None and os.getpid() == _POOL_PID:
+        for endpoint, latency in sorted(_POOL.stats()['latency'].items()):
+            logger.info(
+                f'{endpoint}: {latency["count"]} requests, mean {latency["mean"]:.3f}s, '
+                f'p50 <= {latency["p50"]}s, p95 <= {latency["p95"]}s'
+            )
+        _POOL.close_all()
@@ -1,12 +1,17 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import json
+import os
 from pathlib import Path
 import re
+import sqlite3
+import threading
 import time
 
 import pytest
 import requests
-from wait_for import TimedOutError, wait_for
+from requests.adapters import HTTPAdapter
+from wait_for import TimedOutError
 
 from robottelo.config import settings
 from robottelo.constants import (
@@ -37,59 +42,191 @@ mapped_response_fields = {
 
 class JiraStatusCache:
     """Handles caching of Jira issue statuses to reduce API calls.
-    This class manages a local cache of Jira issue data, allowing for
-    efficient retrieval and storage of issue statuses. The cache is
-    periodically cleaned to remove expired entries based on a configurable
-    time-to-live (TTL) value.
+
+    The issues are stored in a SQLite database next to ``jira.cache_file``, shared by all the
+    xdist workers: every update is an upsert committed in its own transaction, readers don't
+    block each other, and nothing is loaded until an issue is looked up. Entries older than
+    ``jira.cache_ttl_days`` are ignored, and deleted by a sweep at most once per hour. Entries
+    older than ``jira.cache_refresh_hours`` are still returned but fetched again from Jira by a
+    background thread.
+
+    ``jira.cache_file`` itself is the JSON export of the cache, written by :meth:`save`, e.g. to
+    provide the cache to a run without Jira api_key. It is imported when it changes.
     """
 
+    SWEEP_INTERVAL = 3600
+
     def __init__(self):
         self.cache_file = Path(settings.jira.cache_file)
+        self.db_file = self.cache_file.with_suffix('.db')
         self.cache_ttl_days = settings.jira.cache_ttl_days
-        self.cache = self._load_cache()
-
-    def _load_cache(self):
-        if self.cache_file.exists():
-            logger.debug(f"Loading Jira cache from {self.cache_file}")
-            data = json.loads(self.cache_file.read_text())
-            self._clean_expired_entries(data)
-            cache = data.get("issues", {})
-            logger.debug(f"Loaded {len(cache)} entries from Jira cache")
-            return cache
-        logger.debug("Jira cache file does not exist, using empty cache")
-        return {}
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+        self._refresh_queue = set()
+        # refreshed once per process, even if Jira can't be reached
+        self._refreshed = set()
+        self._refresh_thread = None
+        self._refreshing = False
+
+    @property
+    def _ttl(self):
+        return self.cache_ttl_days * 86400
+
+    @property
+    def _db(self):
+        """Connection of the current thread, opened on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.db_file, timeout=60, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS issues '
+                '(key TEXT PRIMARY KEY, data TEXT NOT NULL, timestamp REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value REAL NOT NULL)'
+            )
+            self._local.connection, self._local.pid = connection, os.getpid()
+            self._import_json()
+            self._sweep()
+        return connection
+
+    def _meta(self, name):
+        row = self._db.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name, value):
+        self._db.execute(
+            'INSERT INTO meta VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value',
+            (name, value),
+        )
+
+    def _upsert(self, rows):
+        """Insert or replace the ``(key, data, timestamp)`` rows in one transaction"""
+        with self._db as db:
+            db.execute('BEGIN IMMEDIATE')
+            db.executemany(
+                'INSERT INTO issues VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE SET '
+                'data = excluded.data, timestamp = excluded.timestamp '
+                'WHERE excluded.timestamp > issues.timestamp',
+                rows,
+            )
+
+    def _import_json(self):
+        try:
+            mtime = self.cache_file.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if self._meta('json_mtime') == mtime:
+            return
+        logger.debug(f"Importing Jira cache from {self.cache_file}")
+        issues = json.loads(self.cache_file.read_text()).get("issues", {})
+        self._upsert(
+            (key, json.dumps(value["data"]), value.get("timestamp", 0))
+            for key, value in issues.items()
+        )
+        self._set_meta('json_mtime', mtime)
+        logger.debug(f"Imported {len(issues)} entries from Jira cache file")
+
+    def _sweep(self):
+        """Delete the expired entries, at most once per ``SWEEP_INTERVAL`` by all the processes"""
+        now = time.time()
+        if now - (self._meta('last_sweep') or 0) < self.SWEEP_INTERVAL:
+            return
+        with self._db as db:
+            db.execute('BEGIN IMMEDIATE')
+            deleted = db.execute(
+                'DELETE FROM issues WHERE timestamp < ?', (now - self._ttl,)
+            ).rowcount
+            self._set_meta('last_sweep', now)
+        logger.debug(f"Cleaned {deleted} expired Jira cache entries")
 
     def get(self, issue_id):
-        return self.cache.get(issue_id)
+        return self.get_many([issue_id])[issue_id]
 
     def get_many(self, issue_ids):
-        results = {issue_id: self.cache.get(issue_id) for issue_id in issue_ids}
+        issue_ids = list(issue_ids)
+        now = time.time()
+        results = dict.fromkeys(issue_ids)
+        # stay below the SQLite limit of host parameters
+        for index in range(0, len(issue_ids), 500):
+            chunk = issue_ids[index : index + 500]
+            rows = self._db.execute(
+                f'SELECT key, data, timestamp FROM issues WHERE timestamp >= ? '
+                f'AND key IN ({",".join("?" * len(chunk))})',
+                (now - self._ttl, *chunk),
+            )
+            for key, data, timestamp in rows:
+                results[key] = {"data": json.loads(data), "timestamp": timestamp}
         logger.debug(
             f"Retrieved {sum(1 for v in results.values() if v is not None)} entries from cache"
         )
+        refresh_after = settings.jira.cache_refresh_hours * 3600
+        if refresh_after:
+            self.refresh(
+                key
+                for key, value in results.items()
+                if value is not None and now - value["timestamp"] > refresh_after
+            )
         return results
 
     def update(self, issue_id, data):
-        self.cache[issue_id] = {"data": data, "timestamp": time.time()}
+        self.update_many({issue_id: data})
 
     def update_many(self, issues_data):
-        for issue_id, data in issues_data.items():
-            self.update(issue_id, data)
+        """Store the data of several issues in a single transaction"""
+        now = time.time()
+        self._upsert((key, json.dumps(data), now) for key, data in issues_data.items())
 
     def save(self):
-        logger.debug(f"Saving {len(self.cache)} entries to Jira cache file")
-        self.cache_file.write_text(json.dumps({"issues": self.cache}))
-
-    def _clean_expired_entries(self, data):
-        now = time.time()
-        ttl = self.cache_ttl_days * 86400
-        old_count = len(data.get("issues", {}))
-        self.cache = {
-            key: value
-            for key, value in data.get("issues", {}).items()
-            if now - value.get("timestamp", 0) <= ttl
+        """Export the cache to ``jira.cache_file``"""
+        rows = self._db.execute(
+            'SELECT key, data, timestamp FROM issues WHERE timestamp >= ?',
+            (time.time() - self._ttl,),
+        ).fetchall()
+        logger.debug(f"Saving {len(rows)} entries to Jira cache file")
+        issues = {
+            key: {"data": json.loads(data), "timestamp": timestamp} for key, data, timestamp in rows
         }
-        logger.debug(f"Cleaned expired cache entries: {old_count} → {len(self.cache)}")
+        tmp_file = self.cache_file.with_name(f'.{self.cache_file.name}.{os.getpid()}')
+        tmp_file.write_text(json.dumps({"issues": issues}))
+        os.replace(tmp_file, self.cache_file)
+        self._set_meta('json_mtime', self.cache_file.stat().st_mtime)
+
+    def refresh(self, issue_ids):
+        """Fetch the issues again from Jira in a background thread"""
+        if not settings.jira.api_key:
+            return
+        with self._refresh_lock:
+            issue_ids = set(issue_ids) - self._refreshed
+            self._refreshed.update(issue_ids)
+            self._refresh_queue.update(issue_ids)
+            if not self._refresh_queue or self._refreshing:
+                return
+            self._refreshing = True
+            self._refresh_thread = threading.Thread(
+                target=self._refresh, name='jira_cache_refresh', daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh(self):
+        while True:
+            with self._refresh_lock:
+                issue_ids, self._refresh_queue = sorted(self._refresh_queue), set()
+                if not issue_ids:
+                    self._refreshing = False
+                    return
+            logger.debug(f"Refreshing {len(issue_ids)} stale Jira cache entries")
+            try:
+                issues = fetch_jira_issues(issue_ids, common_jira_fields)
+                self.update_many(
+                    {
+                        issue['key']: sanitized_issue_data(issue, common_jira_fields)
+                        for issue in issues
+                    }
+                )
+            except Exception as err:  # noqa: BLE001
+                logger.warning(f"Could not refresh the Jira cache: {err}")
 
 
 # Create a global instance of JiraStatusCache
@@ -284,46 +421,200 @@ def collect_dupes(jira, collected_data, cached_data=None):  # pragma: no cover
 # cannot use lru_cache in functions that has unhashable args
 CACHED_RESPONSES = defaultdict(dict)
 
+# number of attempts of a request throttled with 429 Too Many Requests, answered with a gateway
+# error or failing to connect
+JIRA_ATTEMPTS = 4
+# wait before retrying a throttled request without Retry-After header, in seconds
+JIRA_RETRY_DELAY = 20
+# wait before retrying a failed request, in seconds, doubled at each attempt
+JIRA_BACKOFF = 2
+JIRA_RETRY_STATUSES = (502, 503, 504)
+# connect and read timeouts of the requests, in seconds
+JIRA_TIMEOUT = (10, 60)
+
+
+class TokenBucket:
+    """Rate limit of the requests sent by all the threads of a process
+
+    :param float rate: number of requests allowed per second
+    :param int capacity: number of requests allowed at once after being idle
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(int(rate), 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._paused_until > now:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold all the requests for ``seconds``, e.g. as asked by a ``Retry-After`` header"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+_session = None
+_session_pid = None
+_bucket = None
+_session_lock = threading.Lock()
+
+
+def jira_session():
+    """Return the keep-alive session and token bucket of the Jira requests of this process"""
+    global _session, _session_pid, _bucket
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = requests.Session()
+            _session.headers['Authorization'] = f"Bearer {settings.jira.api_key}"
+            adapter = HTTPAdapter(pool_maxsize=settings.jira.max_workers)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+            _bucket = TokenBucket(settings.jira.requests_per_second)
+            _session_pid = os.getpid()
+        return _session, _bucket
+
+
+def _retry_after(response):
+    try:
+        return max(float(response.headers['Retry-After']), 0)
+    except (KeyError, ValueError):
+        # missing, or an HTTP date
+        return JIRA_RETRY_DELAY
+
 
-def get_jira(jql, fields=None):
+def get_jira(jql, fields=None, start_at=0, max_results=None):
     """Accepts the jql to retrieve the data from Jira for the given fields
 
     :param jql: The query for retrieving the issue(s) details from jira
     :type jql: str
     :param fields: The custom fields in query to retrieve the data for
     :type fields: list
+    :param start_at: Index of the first issue of the page to retrieve
+    :type start_at: int
+    :param max_results: Number of issues of the page, defaults to ``jira.max_results``
+    :type max_results: int
     :returns: Jira object of response after status check
     :rtype: dict
     """
-    params = {"jql": jql}
+    params = {
+        "jql": jql,
+        "startAt": start_at,
+        "maxResults": max_results or settings.jira.max_results,
+    }
     if fields:
         params.update({"fields": ",".join(fields)})
 
-    def _make_request():
+    return jira_request('GET', 'search/', params=params)
+
+
+def jira_request(method, path, **kwargs):
+    """Send a request to the Jira REST API through the shared session and rate limit
+
+    A request answered with 429 holds all the requests for its ``Retry-After`` delay, then is
+    sent again. A GET request failing to connect, timing out or answered with a gateway error is
+    sent again after an exponential backoff. Other requests may have been applied by Jira in
+    those cases, e.g. a comment added, so they are only sent again when they could not connect.
+
+    :param method: HTTP method of the request
+    :type method: str
+    :param path: Path of the endpoint under ``rest/api/latest/``
+    :type path: str
+    :returns: Response after status check
+    :rtype: requests.Response
+    """
+    session, bucket = jira_session()
+    kwargs.setdefault('timeout', JIRA_TIMEOUT)
+    idempotent = method.upper() == 'GET'
+    retried_errors = (requests.ConnectionError, requests.Timeout) if idempotent else ()
+    for attempt in range(JIRA_ATTEMPTS):
+        bucket.acquire()
         try:
-            response = requests.get(
-                f"{settings.jira.url}/rest/api/latest/search/",
-                params=params,
-                headers={"Authorization": f"Bearer {settings.jira.api_key}"},
+            response = session.request(
+                method, f"{settings.jira.url}/rest/api/latest/{path}", **kwargs
             )
-            response.raise_for_status()
-            return response
-        except requests.exceptions.HTTPError as err:
-            if err.response.status_code == 429:
-                logger.warning("Hit Jira API rate limit (429). Will retry after wait period.")
-            raise
+        except (requests.ConnectTimeout, *retried_errors) as err:
+            logger.warning(f"Jira API request failed: {err}")
+        else:
+            if response.status_code == 429:
+                delay = _retry_after(response)
+                logger.warning(f"Hit Jira API rate limit (429). Holding the requests for {delay}s.")
+                bucket.pause(delay)
+                continue
+            if not idempotent or response.status_code not in JIRA_RETRY_STATUSES:
+                response.raise_for_status()
+                return response
+            logger.warning(f"Jira API answered {response.status_code}")
+        if attempt < JIRA_ATTEMPTS - 1:
+            time.sleep(JIRA_BACKOFF * 2**attempt)
+    logger.error("Maximum retries reached when accessing Jira API")
+    raise TimedOutError(f"Jira API request still failing after {JIRA_ATTEMPTS} attempts")
+
+
+def search_jira(jql, fields=None):
+    """Return all the issues matching ``jql``, page after page
 
-    try:
-        return wait_for(
-            _make_request,
-            timeout=80,
-            delay=20,
-            attempts=4,
-            handle_exception=True,
-        ).out
-    except TimedOutError as err:
-        logger.error(f"Maximum retries reached when accessing Jira API: {err}")
-        raise
+    :param jql: The query for retrieving the issue(s) details from jira
+    :type jql: str
+    :param fields: The custom fields in query to retrieve the data for
+    :type fields: list
+    :returns: Issues of the responses
+    :rtype: list of dict
+    """
+    issues = []
+    while True:
+        data = get_jira(jql, fields, start_at=len(issues)).json()
+        page = data.get('issues') or []
+        issues.extend(page)
+        if not page or len(issues) >= data.get('total', 0):
+            return issues
+
+
+def fetch_jira_issues(issue_ids, fields=None):
+    """Return the issues of ``issue_ids``, queried in chunks of ``jira.chunk_size`` at once
+
+    Each chunk is a bounded JQL query, so none hits the URL length limit, and the chunks are
+    sent by ``jira.max_workers`` threads sharing one session and rate limit.
+
+    :param issue_ids: Jira issue ids to get data for
+    :type issue_ids: list
+    :param fields: The custom fields in query to retrieve the data for
+    :type fields: list
+    :returns: Issues of the responses
+    :rtype: list of dict
+    """
+    chunk_size = settings.jira.chunk_size
+    jqls = [
+        ' OR '.join(f"id = {issue_id}" for issue_id in issue_ids[index : index + chunk_size])
+        for index in range(0, len(issue_ids), chunk_size)
+    ]
+    if len(jqls) == 1:
+        return search_jira(jqls[0], fields)
+    with ThreadPoolExecutor(
+        max_workers=min(settings.jira.max_workers, len(jqls)), thread_name_prefix='jira'
+    ) as executor:
+        return [
+            issue
+            for issues in executor.map(search_jira, jqls, [fields] * len(jqls))
+            for issue in issues
+        ]
 
 
 def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no cover
@@ -371,9 +662,7 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
         # Provide default data for collected Jira's.
         default_data = [get_default_jira(issue_id) for issue_id in remaining_issues]
         # Update cache with defaults
-        for issue in default_data:
-            jira_cache.update(issue['key'], issue)
-        jira_cache.save()
+        jira_cache.update_many({issue['key']: issue for issue in default_data})
 
         # Return combination of cached and default data
         return [
@@ -389,16 +678,12 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
     # Generate jql
     if isinstance(remaining_issues, str):
         remaining_issues = [issue_id.strip() for issue_id in remaining_issues.split(',')]
-    jql = ' OR '.join([f"id = {issue_id}" for issue_id in remaining_issues])
-    response = get_jira(jql, jira_fields)
-    data = response.json().get('issues')
+    data = fetch_jira_issues(remaining_issues, jira_fields)
     # Clean the data, only keep the required info.
     fetched_data = [sanitized_issue_data(issue, jira_fields) for issue in data if issue is not None]
 
     # Update cache with new data
-    for issue in fetched_data:
-        jira_cache.update(issue['key'], issue)
-    jira_cache.save()
+    jira_cache.update_many({issue['key']: issue for issue in fetched_data})
 
     # Combine cached and fetched data
     result_data = [
@@ -408,6 +693,34 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
     return result_data
 
 
+def get_data_jira_bulk(issue_ids, jira_fields=None):  # pragma: no cover
+    """Get the data of many Jira issues at once, indexed by issue id
+
+    All the issues are looked up by a single :func:`get_data_jira` call, so through the cache
+    and batched queries. Fields other than the ones of the cache are fetched from Jira and not
+    cached, as they would make cache entries without the issue status.
+
+    :param issue_ids: Jira issue ids to get data for
+    :type issue_ids: iterable
+    :param jira_fields: List of fields to be retrieved by a jira issue GET request
+    :type jira_fields: list
+    :returns: Jira data by issue id
+    :rtype: dict
+    """
+    issue_ids = sorted({issue_id.strip() for issue_id in issue_ids})
+    if not issue_ids:
+        return {}
+    if jira_fields and not set(jira_fields).issubset(common_jira_fields):
+        jira_fields = ['key', *(field for field in jira_fields if field != 'key')]
+        data = [
+            sanitized_issue_data(issue, jira_fields)
+            for issue in fetch_jira_issues(issue_ids, jira_fields)
+        ]
+    else:
+        data = get_data_jira(issue_ids, jira_fields=jira_fields)
+    return {issue['key']: issue for issue in data}
+
+
 def get_single_jira(issue_id, cached_data=None):  # pragma: no cover
     """Call Jira API to get a single Jira data and cache it
 
@@ -443,7 +756,6 @@ def get_single_jira(issue_id, cached_data=None):  # pragma: no cover
                     # Update cache with new data if found
                     if jira_data:
                         jira_cache.update(issue_id, jira_data)
-                        jira_cache.save()
         except (KeyError, TypeError):
             # Return default if anything goes wrong
             jira_data = get_default_jira(issue_id)
@@ -497,15 +809,11 @@ def add_comment_on_jira(
         return None
     if labels:
         logger.debug(f"Updating labels for {issue_id} issue. \n labels: \n {labels}")
-        response = requests.put(
-            f"{settings.jira.url}/rest/api/latest/issue/{issue_id}/",
-            json={"update": {"labels": labels}},
-            headers={"Authorization": f"Bearer {settings.jira.api_key}"},
-        )
-        response.raise_for_status()
+        jira_request('PUT', f"issue/{issue_id}/", json={"update": {"labels": labels}})
     logger.debug(f"Adding a new comment on {issue_id} Jira issue. \n comment: \n {comment}")
-    response = requests.post(
-        f"{settings.jira.url}/rest/api/latest/issue/{issue_id}/comment",
+    response = jira_request(
+        'POST',
+        f"issue/{issue_id}/comment",
         json={
             "body": comment,
             "visibility": {
@@ -513,7 +821,5 @@ def add_comment_on_jira(
                 "value": comment_visibility,
             },
         },
-        headers={"Authorization": f"Bearer {settings.jira.api_key}"},
     )
-    response.raise_for_status()
     return response.json()
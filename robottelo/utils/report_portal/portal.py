@@ -1,9 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_fixed
 
-from robottelo.config import settings
+from robottelo.config import robottelo_tmp_dir, settings
 from robottelo.logging import logger
 
+CACHE_DIR = Path(robottelo_tmp_dir) / 'report_portal'
+
 
 class ReportPortal:
     """Represents ReportPortal
@@ -33,11 +43,15 @@ class ReportPortal:
         self.rp_project = rp_project or settings.report_portal.project
         self.rp_api_key = rp_api_key or settings.report_portal.api_key
         self.rp_project_settings = None
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.verify = False
+        adapter = HTTPAdapter(pool_maxsize=settings.report_portal.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
         # fetch the project settings
-        settings_req = requests.get(
-            url=f'{self.api_url}/settings', headers=self.headers, verify=False
-        )
+        settings_req = self.session.get(url=f'{self.api_url}/settings')
         settings_req.raise_for_status()
         self.rp_project_settings = settings_req.json()
 
@@ -91,9 +105,7 @@ class ReportPortal:
                 # outside of report portal and a current launch has been already started
                 params['filter.ne.status'] = "IN_PROGRESS"
 
-        resp = requests.get(
-            url=f'{self.api_url}/launch', headers=self.headers, params=params, verify=False
-        )
+        resp = self.session.get(url=f'{self.api_url}/launch', params=params)
         resp.raise_for_status()
         # this should further filter out unfinished launches as RP API currently doesn't
         # support usage of the same filter type multiple times (filter.ne.status)
@@ -101,24 +113,35 @@ class ReportPortal:
             launch for launch in resp.json()['content'] if launch['status'] not in ['INTERRUPTED']
         ]
 
+    def _get_items_page(self, params, page):
+        logger.debug(f'Fetching page {page} of Report Portal test items')
+        resp = self.session.get(url=f'{self.api_url}/item', params={**params, 'page.page': page})
+        resp.raise_for_status()
+        return resp.json()
+
     @retry(
         stop=stop_after_attempt(6),
         wait=wait_fixed(10),
     )
-    def get_tests(self, launch=None, **test_args):
+    def get_tests(self, launch=None, fields=None, **test_args):
         """Returns tests data customized by kwargs parameters.
 
         This is a main function that will be called to retrieve the tests data
         of a particular test status or/and defect_type
 
+        The first page of test items tells the number of pages, the other pages are then fetched
+        by ``report_portal.max_workers`` threads. With ``report_portal.cache_ttl`` set, the
+        tests of a launch are cached on disk by launch UUID and filters.
+
         :param str launch: Dict of a target launch to fetch test items for
+        :param list fields: Optional, the properties of the tests to keep, all by default
         :param dict test_args: apply the given filters and their values to the search request
         :returns dict: All filtered tests dict based on params data keyed by test name and test
             properties as value, in format -
             ```{'test_name1':test1_properties_dict, 'test_name2':test2_properties_dict}```
         """
         params = {
-            'page.size': 50,
+            'page.size': settings.report_portal.page_size,
             'page.sort': 'name',
             'filter.eq.launchId': launch["id"],
             'filter.ne.type': "SUITE",
@@ -137,23 +160,16 @@ class ReportPortal:
             params['filter.has.attributeKey'] = 'team'
             params['filter.has.attributeValue'] = test_args['team']
 
-        # send HTTP request to RP API, retrieve the paginated results and join them together
-        page = 1
-        total_pages = 1
-        resp_tests = []
-        while page <= total_pages:
-            logger.debug(page)
-            params['page.page'] = page
-            resp = requests.get(
-                url=f'{self.api_url}/item',
-                headers=self.headers,
-                params=params,
-                verify=False,
-            )
-            resp.raise_for_status()
-            resp_tests.extend(resp.json()['content'])
-            total_pages = resp.json()['page']['totalPages']
-            page += 1
+        cache_file = None
+        if settings.report_portal.cache_ttl and launch.get('uuid'):
+            digest = hashlib.sha1(
+                json.dumps([params, fields], sort_keys=True).encode()
+            ).hexdigest()[:12]
+            cache_file = CACHE_DIR / f'{launch["uuid"]}-{digest}.json'
+        resp_tests = self._load_cache(cache_file)
+        if resp_tests is None:
+            resp_tests = self._fetch_tests(params, fields)
+            self._save_cache(cache_file, resp_tests)
 
         # Only select tests matching the supplied paths. This is a workaround for RP API limitation
         # - unable to combine multiple filters of a same type
@@ -164,3 +180,49 @@ class ReportPortal:
                 if any([path for path in test_args['paths'] if path in test['name']])
             ]
         return resp_tests
+
+    def _fetch_tests(self, params, fields=None):
+        """Return the test items of all the pages, keeping only ``fields`` of the tests"""
+
+        def content(page):
+            tests = page['content']
+            if fields:
+                tests = [{field: test.get(field) for field in fields} for test in tests]
+            return tests
+
+        # send HTTP request to RP API, retrieve the paginated results and join them together
+        first_page = self._get_items_page(params, 1)
+        resp_tests = content(first_page)
+        total_pages = first_page['page']['totalPages']
+        if total_pages > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(settings.report_portal.max_workers, total_pages - 1),
+                thread_name_prefix='report_portal',
+            ) as executor:
+                for page in executor.map(
+                    lambda page: self._get_items_page(params, page), range(2, total_pages + 1)
+                ):
+                    resp_tests.extend(content(page))
+        return resp_tests
+
+    @staticmethod
+    def _load_cache(cache_file):
+        if cache_file is None:
+            return None
+        try:
+            if time.time() - cache_file.stat().st_mtime > settings.report_portal.cache_ttl:
+                return None
+            tests = json.loads(cache_file.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        logger.debug(f'Using {len(tests)} Report Portal test items cached in {cache_file}')
+        return tests
+
+    @staticmethod
+    def _save_cache(cache_file, tests):
+        if cache_file is None:
+            return
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f'.{cache_file.name}.{os.getpid()}')
+        tmp_file.write_text(json.dumps(tests))
+        os.replace(tmp_file, cache_file)
@@ -0,0 +1,211 @@
+"""Load aware assignment of the xdist workers to the Satellites under test.
+
+With ``server.xdist_behavior: load-aware``, a worker is assigned the Satellite of
+``server.hostnames`` with the lowest load score, instead of the Satellite at its worker index.
+The score of a Satellite is::
+
+    (assigned workers + running foreman tasks / TASKS_PER_WORKER + load average / cpus)
+    * mean test duration on the Satellite / mean test duration on all the Satellites
+    / weight
+
+The running tasks and the load average are probed at most every
+``server.scheduler.probe_interval`` seconds, and the test durations are reported by the workers
+at the end of each test module. The weight of a Satellite is read from
+``server.scheduler.weights``, by hostname pattern or by deploy flavor of the Satellites found
+with ``server.inventory_filter``, 1 by default::
+
+    SCHEDULER:
+      WEIGHTS:
+        '*.large.example.com': 2
+        satqe-ssd.standard.std: 1.5
+
+Between test modules, a worker moves to another Satellite when its score there is lower by
+at least ``server.scheduler.rebalance_threshold``, see ``pytest_fixtures/core/xdist.py``.
+
+The state of a session is shared by its workers in a file under ``robottelo_tmp_dir``.
+"""
+
+from contextlib import contextmanager
+import fcntl
+from fnmatch import fnmatch
+import json
+import os
+from pathlib import Path
+import time
+
+from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.logging import logger
+from robottelo.utils.http_pool import get_pool
+
+SCHEDULER_DIR = Path(robottelo_tmp_dir) / 'satellite_scheduler'
+# the running foreman tasks counting as much as one more worker on a Satellite
+TASKS_PER_WORKER = 10
+# states of older sessions are removed when a new session starts
+STATE_MAX_AGE = 86400  # seconds
+
+# the hostname of the Satellite this worker was moved to after its session started
+moved_hostname = None
+
+
+def _state_path(session_id):
+    return SCHEDULER_DIR / f'{session_id}.json'
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    except ValueError as err:
+        logger.warning(f'Ignoring unreadable Satellite scheduler state {path}: {err}')
+        return {}
+
+
+@contextmanager
+def _locked_state(session_id):
+    """Yield the state of the session for update, and write it back atomically"""
+    path = _state_path(session_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_fd = os.open(path.with_suffix('.lock'), os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        state = _read(path)
+        if not state:
+            for old_state in path.parent.glob('*.json'):
+                if time.time() - old_state.stat().st_mtime > STATE_MAX_AGE:
+                    old_state.unlink(missing_ok=True)
+        state.setdefault('hosts', {})
+        state.setdefault('workers', {})
+        yield state
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}')
+        tmp_path.write_text(json.dumps(state))
+        os.replace(tmp_path, path)
+    finally:
+        os.close(lock_fd)
+
+
+def _host(state, hostname):
+    return state['hosts'].setdefault(
+        hostname, {'flavor': None, 'probe': None, 'duration': 0.0, 'tests': 0}
+    )
+
+
+def host_weight(hostname, flavor=None):
+    """Return the weight of a Satellite from ``server.scheduler.weights``"""
+    for pattern, weight in (settings.server.scheduler.weights or {}).items():
+        if fnmatch(hostname, pattern) or (flavor and pattern == flavor):
+            return float(weight)
+    return 1.0
+
+
+def probe(hostname):
+    """Return the running foreman tasks and the load average per cpu of a Satellite
+
+    A signal that cannot be read is ``None``.
+    """
+    from robottelo.hosts import Satellite
+
+    result = {'tasks': None, 'load': None, 'time': time.time()}
+    try:
+        response = get_pool().request(
+            'GET',
+            f'{settings.server.scheme}://{hostname}/foreman_tasks/api/tasks',
+            params={'search': 'state = running', 'per_page': 1},
+            auth=(settings.server.admin_username, settings.server.admin_password),
+            verify=settings.server.verify_ca,
+            timeout=30,
+        )
+        response.raise_for_status()
+        result['tasks'] = response.json()['subtotal']
+    except Exception as err:  # noqa: BLE001
+        logger.warning(f'Could not read the running tasks of {hostname}: {err}')
+    try:
+        output = Satellite(hostname).execute('cat /proc/loadavg && nproc', timeout='30s')
+        load_average, cpus = output.stdout.split('\n')[:2]
+        result['load'] = float(load_average.split()[0]) / int(cpus)
+    except Exception as err:  # noqa: BLE001
+        logger.warning(f'Could not read the load average of {hostname}: {err}')
+    return result
+
+
+def score(state, hostname, workers=0):
+    """Return the load score of a Satellite, with ``workers`` more workers assigned to it"""
+    host = _host(state, hostname)
+    load = workers + sum(1 for assigned in state['workers'].values() if assigned == hostname)
+    if host['probe']:
+        load += (host['probe']['tasks'] or 0) / TASKS_PER_WORKER + (host['probe']['load'] or 0)
+    total_duration = sum(other['duration'] for other in state['hosts'].values())
+    total_tests = sum(other['tests'] for other in state['hosts'].values())
+    if host['tests'] and total_duration:
+        # a Satellite running the tests slower than the others counts as more loaded
+        load *= (host['duration'] / host['tests']) / (total_duration / total_tests)
+    return load / host_weight(hostname, host['flavor'])
+
+
+def _probe_stale(session_id, hostnames):
+    """Probe the Satellites not probed since ``server.scheduler.probe_interval`` seconds"""
+    with _locked_state(session_id) as state:
+        now = time.time()
+        stale = [
+            hostname
+            for hostname in hostnames
+            if not (probed := _host(state, hostname)['probe'])
+            or now - probed['time'] > settings.server.scheduler.probe_interval
+        ]
+        # the other workers do not probe them again in the meantime
+        for hostname in stale:
+            _host(state, hostname)['probe'] = {'tasks': None, 'load': None, 'time': now}
+    # probed without holding the state lock, a probe may take seconds
+    probes = {hostname: probe(hostname) for hostname in stale}
+    if probes:
+        with _locked_state(session_id) as state:
+            for hostname, result in probes.items():
+                _host(state, hostname)['probe'] = result
+
+
+def assign(session_id, worker_id, hostnames, flavors=None):
+    """Assign the Satellite with the lowest load score to the worker and return its hostname"""
+    _probe_stale(session_id, hostnames)
+    with _locked_state(session_id) as state:
+        state['workers'].pop(worker_id, None)
+        for hostname, flavor in (flavors or {}).items():
+            _host(state, hostname)['flavor'] = flavor
+        hostname = min(hostnames, key=lambda name: (score(state, name, workers=1), name))
+        state['workers'][worker_id] = hostname
+    logger.info(f'{worker_id=}: Satellite scheduler assigned {hostname}')
+    return hostname
+
+
+def rebalance(session_id, worker_id, hostnames):
+    """Move the worker to a Satellite with a lower load score if any, return its hostname"""
+    threshold = settings.server.scheduler.rebalance_threshold
+    if not threshold:
+        return None
+    _probe_stale(session_id, hostnames)
+    with _locked_state(session_id) as state:
+        current = state['workers'].pop(worker_id, None)
+        best = min(hostnames, key=lambda name: (score(state, name, workers=1), name))
+        if current in hostnames and (
+            score(state, best, workers=1) + threshold > score(state, current, workers=1)
+        ):
+            best = current
+        state['workers'][worker_id] = best
+    if best != current:
+        logger.info(f'{worker_id=}: Satellite scheduler moved the worker from {current} to {best}')
+    return best
+
+
+def report(session_id, hostname, duration, tests):
+    """Add the duration of ``tests`` tests run on a Satellite"""
+    if not tests:
+        return
+    with _locked_state(session_id) as state:
+        host = _host(state, hostname)
+        host['duration'] += duration
+        host['tests'] += tests
+
+
+def release(session_id, worker_id):
+    """Remove the worker from its Satellite"""
+    with _locked_state(session_id) as state:
+        state['workers'].pop(worker_id, None)
@@ -0,0 +1,72 @@
+"""Content addressed cache of the hammer and API schemas of the Satellites under test.
+
+The hammer help and the apipie apidoc of a Satellite only change when the Satellite is upgraded,
+yet every process used to fetch and parse them again. Entries of this cache are stored once under
+``robottelo_tmp_dir``, in a file named after the Satellite version and a checksum of the schema
+source (the installed hammer packages, the apipie checksum of the API), so the xdist workers
+and later sessions against the same Satellite all share them::
+
+    from robottelo.utils import schema_cache
+
+    data = schema_cache.load('apidoc', '6.16.0-1.el9', checksum)
+    if data is None:
+        data = fetch_apidoc()
+        schema_cache.store('apidoc', '6.16.0-1.el9', checksum, data)
+
+Files are written atomically and never modified afterwards, they are read and parsed at most
+once per process.
+
+Run ``make warm-schema-cache`` to fill the cache for the configured Satellite before a session.
+"""
+
+import json
+import os
+from pathlib import Path
+import re
+import threading
+
+from robottelo.config import robottelo_tmp_dir
+from robottelo.logging import logger
+
+CACHE_DIR = Path(robottelo_tmp_dir) / 'schema_cache'
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def cache_path(kind, version, checksum):
+    """Return the path of the ``kind`` entry for ``version`` and ``checksum``"""
+    name = re.sub(r'[^\w.-]', '_', f'{version}-{checksum}')
+    return CACHE_DIR / kind / f'{name}.json'
+
+
+def load(kind, version, checksum):
+    """Return the cached ``kind`` entry, or ``None`` when it was not stored yet"""
+    path = cache_path(kind, version, checksum)
+    with _lock:
+        if path in _loaded:
+            return _loaded[path]
+    try:
+        value = json.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except ValueError as err:
+        logger.warning(f'Ignoring unreadable schema cache file {path}: {err}')
+        return None
+    with _lock:
+        return _loaded.setdefault(path, value)
+
+
+def store(kind, version, checksum, value):
+    """Store ``value`` as the ``kind`` entry for ``version`` and ``checksum``
+
+    Concurrent writers of the same entry are safe, the file is replaced atomically.
+    """
+    path = cache_path(kind, version, checksum)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}')
+    tmp_path.write_text(json.dumps(value))
+    os.replace(tmp_path, path)
+    with _lock:
+        _loaded[path] = value
+    return path
@@ -14,6 +14,15 @@ recoverable, the main watcher will fail and release all other processes.
 It is recommended to use this class as a context manager, as it will automatically register and
 report when the process is done.
 
+The state of the resource is kept by a coordination backend, chosen with the
+``robottelo.shared_resource_backend`` setting:
+
+- ``file`` (default): an append-only log of state changes in the /tmp file. Each change is
+  appended as a single line, and readers only parse the lines added since their last read.
+  Waiting processes are woken up by inotify when the file changes, instead of polling it.
+- ``redis``: a hash on the redis server configured for ``shared_function``. Changes are
+  published on a channel the waiting processes are subscribed to.
+
 Example:
     >>> with SharedResource("target_sat.hostname", upgrade_action, **upgrade_kwargs) as resource:
     ...     # Do pre-upgrade setup steps
@@ -22,23 +31,291 @@ Example:
     ...     # Do post-upgrade cleanup steps if any
 """
 
+import contextlib
+import ctypes
+import ctypes.util
 import datetime
 import json
 import os
 from pathlib import Path
+import select
 import time
 from uuid import uuid4
 
-from broker.helpers import FileLock
 from wait_for import wait_for
 
 from robottelo.config import settings
 
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# inotify events waking up the processes waiting on a file resource
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_DELETE_SELF = 0x00000400
+# used to wait when inotify is not available, or the file does not exist yet
+FALLBACK_POLL_INTERVAL = 1  # seconds
+
 
 class SharedResourceError(Exception):
     """An exception class for SharedResource errors."""
 
 
+class SharedResourceRemovedError(SharedResourceError, FileNotFoundError):
+    """The shared resource was removed, e.g. by a failing main watcher."""
+
+
+def _initial_state():
+    return {"watchers": [], "statuses": {}, "main_watcher": None, "main_status": "waiting"}
+
+
+def _apply_change(state, change):
+    """Apply a single state change of the log of a file resource"""
+    op, watcher_id = change["op"], change.get("id")
+    if op == "create":
+        state["main_watcher"] = watcher_id
+    elif op == "register":
+        state["watchers"].append(watcher_id)
+        state["statuses"][watcher_id] = "pending"
+    elif op == "unregister":
+        if watcher_id in state["watchers"]:
+            state["watchers"].remove(watcher_id)
+        state["statuses"].pop(watcher_id, None)
+    elif op == "status":
+        state["statuses"][watcher_id] = change["status"]
+    elif op == "main_status":
+        state["main_status"] = change["status"]
+    # every process replays the log in the same order, so the first take over wins
+    elif op == "take_over" and state["main_status"] in ("action_error", "error"):
+        state["main_watcher"] = watcher_id
+        state["main_status"] = "recovering"
+
+
+class _FileWatch:
+    """Wait for changes of a file with inotify, or sleep when inotify is not available"""
+
+    _libc = None
+
+    def __init__(self, path):
+        self.fd = None
+        try:
+            if _FileWatch._libc is None:
+                _FileWatch._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        mask = IN_MODIFY | IN_ATTRIB | IN_DELETE_SELF
+        if self._libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+            os.close(fd)
+            return
+        self.fd = fd
+
+    def wait(self, timeout):
+        if self.fd is None:
+            time.sleep(min(timeout, FALLBACK_POLL_INTERVAL))
+            return
+        if select.select([self.fd], [], [], timeout)[0]:
+            with contextlib.suppress(BlockingIOError):
+                os.read(self.fd, 4096)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class FileCoordinationBackend:
+    """State of a shared resource kept as an append-only log of changes in a file
+
+    :param str resource_name: the name of the shared resource, the file is
+        ``/tmp/<resource_name>.shared``
+    """
+
+    def __init__(self, resource_name):
+        self.path = Path(f"/tmp/{resource_name}.shared")
+        self._state = _initial_state()
+        self._offset = 0
+        self._inode = None
+
+    def _append(self, *changes):
+        data = "".join(f"{json.dumps(change)}\n" for change in changes).encode()
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        except FileNotFoundError as err:
+            raise SharedResourceRemovedError(f"{self.path} was removed") from err
+        try:
+            # a single write to a file opened with O_APPEND is not interleaved with others
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def state(self):
+        """Return the current state, reading only the changes appended since the last call"""
+        try:
+            with self.path.open("rb") as log_file:
+                inode = os.fstat(log_file.fileno()).st_ino
+                if inode != self._inode:
+                    # the file was created again
+                    self._state, self._offset, self._inode = _initial_state(), 0, inode
+                log_file.seek(self._offset)
+                data = log_file.read()
+        except FileNotFoundError as err:
+            raise SharedResourceRemovedError(f"{self.path} was removed") from err
+        # only consume complete lines, the last one may still be being written
+        complete = data[: data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            _apply_change(self._state, json.loads(line))
+        self._offset += len(complete)
+        return self._state
+
+    def register(self, watcher_id):
+        """Register a watcher, return True if it is the first one and becomes the main watcher"""
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            self._append({"op": "register", "id": watcher_id})
+            return False
+        try:
+            os.write(fd, f'{json.dumps({"op": "create", "id": watcher_id})}\n'.encode())
+        finally:
+            os.close(fd)
+        self._append({"op": "register", "id": watcher_id})
+        return True
+
+    def unregister(self, watcher_id):
+        self._append({"op": "unregister", "id": watcher_id})
+
+    def set_status(self, watcher_id, status):
+        self._append({"op": "status", "id": watcher_id, "status": status})
+
+    def set_main_status(self, status):
+        self._append({"op": "main_status", "status": status})
+
+    def take_over(self, watcher_id):
+        """Become the main watcher after a failure of the action, return True on success"""
+        self._append({"op": "take_over", "id": watcher_id})
+        return self.state()["main_watcher"] == watcher_id
+
+    def wait_until(self, predicate, timeout=None, on_wait=None):
+        """Block until ``predicate(state)`` is true and return the state
+
+        :param float timeout: maximum seconds between two checks of the state, changes are
+            usually noticed at once
+        :param on_wait: called with the state every time it is checked and still not matching
+        """
+        timeout = FALLBACK_POLL_INTERVAL if timeout is None else timeout
+        watch = _FileWatch(self.path)
+        try:
+            while not predicate(state := self.state()):
+                if on_wait:
+                    on_wait(state)
+                watch.wait(timeout)
+            return state
+        finally:
+            watch.close()
+
+    def remove(self):
+        self.path.unlink(missing_ok=True)
+
+
+class RedisCoordinationBackend:
+    """State of a shared resource kept in redis, changes are published to the waiting processes
+
+    :param str resource_name: the name of the shared resource
+    """
+
+    # take over only when the main watcher failed, atomically
+    TAKE_OVER_SCRIPT = """
+        local status = redis.call('HGET', KEYS[1], 'main_status')
+        if status == 'action_error' or status == 'error' then
+            redis.call('HSET', KEYS[1], 'main_status', 'recovering', 'main_watcher', ARGV[1])
+            return 1
+        end
+        return 0
+    """
+
+    def __init__(self, resource_name):
+        if redis is None:
+            raise SharedResourceError("The redis shared resource backend requires redis")
+        config = settings.shared_function
+        self.client = redis.StrictRedis(
+            host=config.redis_host,
+            port=config.redis_port,
+            db=config.redis_db,
+            password=config.redis_password,
+            decode_responses=True,
+        )
+        self.key = f"shared_resource:{resource_name}"
+        self.statuses_key = f"{self.key}:statuses"
+        self.channel = f"{self.key}:changes"
+
+    def _changed(self):
+        self.client.publish(self.channel, "changed")
+
+    def state(self):
+        main = self.client.hgetall(self.key)
+        if not main:
+            raise SharedResourceRemovedError(f"{self.key} was removed")
+        statuses = self.client.hgetall(self.statuses_key)
+        return {
+            "watchers": list(statuses),
+            "statuses": statuses,
+            "main_watcher": main.get("main_watcher"),
+            "main_status": main.get("main_status"),
+        }
+
+    def register(self, watcher_id):
+        pipeline = self.client.pipeline()
+        pipeline.hsetnx(self.key, "main_watcher", watcher_id)
+        pipeline.hsetnx(self.key, "main_status", "waiting")
+        pipeline.hset(self.statuses_key, watcher_id, "pending")
+        is_main = bool(pipeline.execute()[0])
+        self._changed()
+        return is_main
+
+    def unregister(self, watcher_id):
+        self.client.hdel(self.statuses_key, watcher_id)
+        self._changed()
+
+    def set_status(self, watcher_id, status):
+        self.client.hset(self.statuses_key, watcher_id, status)
+        self._changed()
+
+    def set_main_status(self, status):
+        self.client.hset(self.key, "main_status", status)
+        self._changed()
+
+    def take_over(self, watcher_id):
+        taken = self.client.eval(self.TAKE_OVER_SCRIPT, 1, self.key, watcher_id)
+        self._changed()
+        return bool(taken)
+
+    def wait_until(self, predicate, timeout=None, on_wait=None):
+        """Block until ``predicate(state)`` is true and return the state, see the file backend"""
+        timeout = FALLBACK_POLL_INTERVAL if timeout is None else timeout
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        try:
+            while not predicate(state := self.state()):
+                if on_wait:
+                    on_wait(state)
+                pubsub.get_message(timeout=timeout)
+            return state
+        finally:
+            pubsub.close()
+
+    def remove(self):
+        self.client.delete(self.key, self.statuses_key)
+        self._changed()
+
+
+_backends = {"file": FileCoordinationBackend, "redis": RedisCoordinationBackend}
+
+
 class SharedResource:
     """A class representing a shared resource.
 
@@ -48,7 +325,9 @@ class SharedResource:
         action_kwargs (dict): The keyword arguments to be passed to the action function.
         action_is_recoverable (bool): Whether the action is recoverable or not.
         id (str): The unique identifier of the shared resource.
-        resource_file (Path): The path to the file representing the shared resource.
+        backend: The coordination backend keeping the state of the shared resource.
+        resource_file (Path): The path to the file representing the shared resource, with the
+            file backend.
         is_main (bool): Whether the current instance is the main watcher or not.
         is_recovering (bool): Whether the current instance is recovering from an error or not.
     """
@@ -72,8 +351,8 @@ class SharedResource:
             action_validator (function): The function to validate the action results.
             action_kwargs (dict): The keyword arguments to be passed to the action function.
         """
-        self.resource_file = Path(f"/tmp/{resource_name}.shared")
-        self.lock_file = FileLock(self.resource_file)
+        self.backend = _backends[settings.robottelo.shared_resource_backend](resource_name)
+        self.resource_file = getattr(self.backend, "path", None)
         self.id = str(uuid4().fields[-1])
         self.action = action
         self.action_validator = action_validator
@@ -102,11 +381,8 @@ class SharedResource:
         Args:
             status (str): The new status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            curr_data["statuses"][self.id] = status
-            self.log(f"Updating watcher status to {status}")
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self.log(f"Updating watcher status to {status}")
+        self.backend.set_status(self.id, status)
 
     def _update_main_status(self, status):
         """Updates the main status of the shared resource.
@@ -114,10 +390,11 @@ class SharedResource:
         Args:
             status (str): The new main status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            curr_data["main_status"] = status
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self.backend.set_main_status(status)
+
+    @staticmethod
+    def _all_status(state, status):
+        return all(state["statuses"].get(watcher_id) == status for watcher_id in state["watchers"])
 
     def _check_all_status(self, status):
         """Checks if all watchers have the specified status.
@@ -128,12 +405,7 @@ class SharedResource:
         Returns:
             bool: True if all watchers have the specified status, False otherwise.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            for watcher_id in curr_data["watchers"]:
-                if curr_data["statuses"].get(watcher_id) != status:
-                    return False
-            return True
+        return self._all_status(self.backend.state(), status)
 
     def _wait_for_status(self, status):
         """Waits until all watchers have the specified status.
@@ -141,65 +413,44 @@ class SharedResource:
         Args:
             status (str): The status to wait for.
         """
-        while not self._check_all_status(status):
+
+        def log_waiting(state):
             if status == "done":
                 self.log("Main worker still waiting for all workers to report status 'done'.")
-            time.sleep(1)
+
+        self.backend.wait_until(lambda state: self._all_status(state, status), on_wait=log_waiting)
 
     def _wait_for_main_watcher(self):
         """Waits for the main watcher to finish."""
         while True:
-            curr_data = json.loads(self.resource_file.read_text())
+            curr_data = self.backend.wait_until(
+                lambda state: state["main_status"] in ("error", "action_error", "done"),
+                timeout=settings.robottelo.shared_resource_wait,
+            )
             if curr_data["main_status"] == "error":
                 raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
             if curr_data["main_status"] == "action_error":
                 self._try_take_over()
-            elif curr_data["main_status"] != "done":
-                time.sleep(settings.robottelo.shared_resource_wait)
             else:
                 self.log("Main status now done, breaking wait loop")
                 break
 
     def _try_take_over(self):
         """Tries to take over as the main watcher."""
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            if curr_data["main_status"] in ("action_error", "error"):
-                curr_data["main_status"] = "recovering"
-                curr_data["main_watcher"] = self.id
-                self.resource_file.write_text(json.dumps(curr_data, indent=4))
-                self.is_main = True
-                self.is_recovering = True
+        if self.backend.take_over(self.id):
+            self.is_main = True
+            self.is_recovering = True
         self.wait()
 
     def register(self):
         """Registers the current process as a watcher."""
-        with self.lock_file:
-            if self.resource_file.exists():
-                curr_data = json.loads(self.resource_file.read_text())
-                self.is_main = False
-            else:  # First watcher to register, becomes the main watcher, and creates the file
-                curr_data = {
-                    "watchers": [],
-                    "statuses": {},
-                    "main_watcher": self.id,
-                    "main_status": "waiting",
-                }
-                self.is_main = True
-            curr_data["watchers"].append(self.id)
-            curr_data["statuses"][self.id] = "pending"
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        # the first watcher to register becomes the main watcher
+        self.is_main = self.backend.register(self.id)
 
     def unregister(self):
         """Unregisters the current process as a watcher."""
         self.log(f"Unregistering {os.environ.get('PYTEST_XDIST_WORKER')}")
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            self.log("Removing watcher ID from resource file")
-            curr_data["watchers"].remove(self.id)
-            del curr_data["statuses"][self.id]
-            self.log("Writing new resource file")
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self.backend.unregister(self.id)
 
     def ready(self):
         """Marks the current process as ready to perform the action."""
@@ -221,7 +472,7 @@ class SharedResource:
         except Exception as err:
             if not self.action_is_recoverable:
                 self._update_main_status("error")
-                self.resource_file.unlink()
+                self.backend.remove()
                 raise SharedResourceError('Main worker failed during action') from err
             self._update_main_status('action_error')
             raise SharedResourceError('Recoverable failures in main worker') from err
@@ -260,7 +511,7 @@ class SharedResource:
                 f'watcher ID: {getattr(self, "watcher_id", "unknown")}): {e}'
             )
 
-        if exc_type is FileNotFoundError:
+        if exc_type is not None and issubclass(exc_type, FileNotFoundError):
             self.log(
                 f'{os.environ.get("PYTEST_XDIST_WORKER")} did not find resource file. has it already been deleted?'
             )
@@ -271,14 +522,14 @@ class SharedResource:
             if self.is_main:
                 self._wait_for_status("done")
                 self.log("All workers done, removing resource file")
-                self.resource_file.unlink()
+                self.backend.remove()
         else:
             self._update_status("error")
             if self.is_main:
                 if self._check_all_status("error"):
                     # All have failed, delete the file
                     self.log("All workers FAILED, removing resource file")
-                    self.resource_file.unlink()
+                    self.backend.remove()
                 else:
                     self.log("Setting main status to ERROR")
                     self._update_main_status("error")
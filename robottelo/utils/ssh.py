@@ -1,6 +1,7 @@
 """Utility module to handle the shared ssh connection."""
 
 from robottelo.cli import hammer
+from robottelo.utils.ssh_pool import get_pool, pool_enabled
 
 
 def get_client(
@@ -13,16 +14,22 @@ def get_client(
 
     Processes ssh credentials in the order: password, key_filename, ssh_key
     Config validation enforces one of the three must be set in settings.server
+    The host is never shared through :mod:`robottelo.utils.ssh_pool`, the caller may keep it.
     """
-    from robottelo.config import settings
     from robottelo.hosts import ContentHost
 
-    return ContentHost(
-        hostname=hostname or settings.server.hostname,
-        username=username or settings.server.ssh_username,
-        password=password or settings.server.ssh_password,
-        port=port or settings.server.ssh_client.port,
-    )
+    return ContentHost(**_client_kwargs(hostname, username, password, port))
+
+
+def _client_kwargs(hostname=None, username=None, password=None, port=22):
+    from robottelo.config import settings
+
+    return {
+        'hostname': hostname or settings.server.hostname,
+        'username': username or settings.server.ssh_username,
+        'password': password or settings.server.ssh_password,
+        'port': port or settings.server.ssh_client.port,
+    }
 
 
 def command(
@@ -43,13 +50,17 @@ def command(
     :param int timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
     """
-    client = get_client(
-        hostname=hostname,
-        username=username,
-        password=password,
-        port=port,
-    )
-    result = client.execute(cmd, timeout=timeout)
+    if pool_enabled():
+        with get_pool().connection(**_client_kwargs(hostname, username, password, port)) as client:
+            result = client.execute(cmd, timeout=timeout)
+    else:
+        client = get_client(
+            hostname=hostname,
+            username=username,
+            password=password,
+            port=port,
+        )
+        result = client.execute(cmd, timeout=timeout)
 
     if output_format and result.status == 0:
         if output_format == 'csv':
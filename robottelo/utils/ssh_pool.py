@@ -0,0 +1,278 @@
+"""Per-process pool of reusable ssh connections.
+
+Every hammer call made through :meth:`robottelo.cli.base.Base.execute` ends up in
+:func:`robottelo.ssh.command`, which used to build a new ``ContentHost`` (and therefore a new
+ssh handshake) for every single command. This module keeps the connected hosts around, keyed
+by ``(hostname, username, password, port, net_type)``, so the handshake is paid once per worker.
+A libssh2 session is not thread safe, so a connection runs one command at a time: threads
+borrowing it at once wait for their turn.
+
+Usage::
+
+    from robottelo.utils.ssh_pool import get_pool
+
+    with get_pool().connection(hostname='sat.example.com') as client:
+        client.execute('hammer ping')
+
+    get_pool().stats()  # {'hits': 1, 'misses': 1, 'handshake_time': 0.42, ...}
+
+Each xdist worker is a separate process, so each worker owns its own pool. The pool is
+rebuilt transparently after a fork.
+"""
+
+import atexit
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import hashlib
+import os
+import threading
+import time
+
+from robottelo.logging import logger
+
+POOL_DEFAULT_MAX_CHANNELS = 1
+POOL_DEFAULT_IDLE_TIMEOUT = 300  # seconds
+POOL_DEFAULT_KEEPALIVE_INTERVAL = 60  # seconds
+POOL_HEALTH_CHECK_COMMAND = 'true'
+POOL_HEALTH_CHECK_TIMEOUT = 10  # seconds
+
+
+@dataclass
+class PooledConnection:
+    """A connected host with its pool bookkeeping"""
+
+    key: tuple
+    client: object
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    channels: int = 0
+    commands: int = 0
+    # held while a command runs, libssh2 sessions must not be used by two threads at once
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception as err:  # a dead connection must not break eviction
+            logger.debug(f'Error while closing pooled ssh connection {self.key}: {err}')
+
+
+class SSHConnectionPool:
+    """Pool of connected hosts, keyed by ``(hostname, username, password, port, net_type)``
+
+    :param client_factory: callable receiving the connection kwargs and returning a
+        ``broker.hosts.Host`` like object (e.g. ``ContentHost``)
+    :param int max_channels: maximum number of borrowers of a single connection, another
+        connection for the same key is opened beyond that. The commands of the borrowers of a
+        connection run one after the other.
+    :param int idle_timeout: connections not used for this many seconds are closed
+    :param int keepalive_interval: connections idle for longer than this are health checked
+        before being handed out again
+    """
+
+    def __init__(
+        self,
+        client_factory,
+        max_channels=POOL_DEFAULT_MAX_CHANNELS,
+        idle_timeout=POOL_DEFAULT_IDLE_TIMEOUT,
+        keepalive_interval=POOL_DEFAULT_KEEPALIVE_INTERVAL,
+    ):
+        self.client_factory = client_factory
+        self.max_channels = max_channels
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self._connections = {}
+        self._lock = threading.RLock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'health_check_failures': 0,
+            'handshakes': 0,
+            'handshake_time': 0.0,
+        }
+
+    @staticmethod
+    def make_key(hostname, username, port, net_type, password=None):
+        # a connection is only shared by callers with the same credentials, without keeping
+        # the password itself in the key
+        password_digest = hashlib.sha256(password.encode()).hexdigest() if password else None
+        return (
+            hostname,
+            username,
+            password_digest,
+            int(port or 22),
+            str(net_type) if net_type else None,
+        )
+
+    def _connect(self, key, client_kwargs):
+        """Create a new host object and establish its ssh session"""
+        client = self.client_factory(**client_kwargs)
+        start = time.monotonic()
+        # accessing the session performs the handshake
+        client.session  # noqa: B018
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self._counters['handshakes'] += 1
+            self._counters['handshake_time'] += elapsed
+        logger.debug(f'Opened pooled ssh connection to {key[0]} in {elapsed:.3f}s')
+        return PooledConnection(key=key, client=client)
+
+    def _is_healthy(self, conn):
+        """Check a connection that was idle for too long is still usable"""
+        if time.monotonic() - conn.last_used < self.keepalive_interval:
+            return True
+        try:
+            result = conn.client.execute(
+                POOL_HEALTH_CHECK_COMMAND, timeout=POOL_HEALTH_CHECK_TIMEOUT
+            )
+        except Exception as err:  # any failure means the connection is gone
+            logger.debug(f'Pooled ssh connection to {conn.key[0]} failed health check: {err}')
+            return False
+        return result.status == 0
+
+    def _discard(self, conn):
+        with self._lock:
+            conns = self._connections.get(conn.key, [])
+            if conn in conns:
+                conns.remove(conn)
+                self._counters['evictions'] += 1
+        conn.close()
+
+    def evict_idle(self):
+        """Close all connections that are not in use and idle longer than ``idle_timeout``"""
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                conn
+                for conns in self._connections.values()
+                for conn in conns
+                if not conn.channels and now - conn.last_used > self.idle_timeout
+            ]
+        for conn in idle:
+            self._discard(conn)
+
+    def acquire(self, **client_kwargs):
+        """Borrow a connection for ``client_kwargs``, opening one if needed
+
+        The returned :class:`PooledConnection` must be given back with :meth:`release`.
+        """
+        key = self.make_key(
+            client_kwargs['hostname'],
+            client_kwargs.get('username'),
+            client_kwargs.get('port'),
+            client_kwargs.get('net_type'),
+            client_kwargs.get('password'),
+        )
+        self.evict_idle()
+        while True:
+            with self._lock:
+                candidates = [
+                    conn
+                    for conn in self._connections.get(key, [])
+                    if conn.channels < self.max_channels
+                ]
+                conn = min(candidates, key=lambda c: c.channels, default=None)
+                if conn is not None:
+                    conn.channels += 1
+            if conn is None:
+                break
+            if self._is_healthy(conn):
+                with self._lock:
+                    self._counters['hits'] += 1
+                return conn
+            with self._lock:
+                self._counters['health_check_failures'] += 1
+                conn.channels -= 1
+            self._discard(conn)
+        conn = self._connect(key, client_kwargs)
+        conn.channels += 1
+        with self._lock:
+            self._counters['misses'] += 1
+            self._connections.setdefault(key, []).append(conn)
+        return conn
+
+    def release(self, conn, discard=False):
+        """Give back a connection borrowed with :meth:`acquire`
+
+        :param bool discard: close the connection instead of returning it to the pool, used when
+            the command failed on transport level
+        """
+        with self._lock:
+            conn.channels = max(conn.channels - 1, 0)
+            conn.commands += 1
+            conn.last_used = time.monotonic()
+        if discard:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self, **client_kwargs):
+        """Context manager yielding a pooled, connected host object"""
+        conn = self.acquire(**client_kwargs)
+        discard = False
+        try:
+            with conn.lock:
+                yield conn.client
+        except Exception:
+            # the host object raises on transport failures, command failures are only a status
+            discard = True
+            raise
+        finally:
+            # also release when a generator holding the connection is closed early
+            self.release(conn, discard=discard)
+
+    def stats(self):
+        """Return the pool counters together with the number of open connections"""
+        with self._lock:
+            return {
+                **self._counters,
+                'connections': sum(len(conns) for conns in self._connections.values()),
+            }
+
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            conns = [conn for conns in self._connections.values() for conn in conns]
+            self._connections.clear()
+        for conn in conns:
+            conn.close()
+
+
+_POOL = None
+_POOL_PID = None
+
+
+def _default_client_factory(**client_kwargs):
+    from robottelo.hosts import ContentHost
+
+    return ContentHost(**client_kwargs)
+
+
+def get_pool():
+    """Return the ssh connection pool of the current process"""
+    global _POOL, _POOL_PID
+    if _POOL is None or os.getpid() != _POOL_PID:
+        from robottelo.config import settings
+
+        pool_settings = settings.server.ssh_client.pool
+        _POOL = SSHConnectionPool(
+            _default_client_factory,
+            max_channels=pool_settings.max_channels,
+            idle_timeout=pool_settings.idle_timeout,
+            keepalive_interval=pool_settings.keepalive_interval,
+        )
+        _POOL_PID = os.getpid()
+    return _POOL
+
+
+def pool_enabled():
+    from robottelo.config import settings
+
+    return settings.server.ssh_client.pool.enabled
+
+
+@atexit.register
+def _close_pool():
+    if _POOL is not None and os.getpid() == _POOL_PID:
+        logger.info(f'ssh connection pool stats: {_POOL.stats()}')
+        _POOL.close_all()
@@ -11,7 +11,7 @@
 import click
 import testimony
 
-from robottelo.utils.issue_handlers.jira import get_data_jira
+from robottelo.utils.issue_handlers.jira import get_data_jira_bulk
 
 
 @click.group()
@@ -63,12 +63,17 @@ def query_jira(data):
     """
     output = []
     sfdc_counter_field = 'customfield_12313440'
+    # fetch all the verified issues at once
+    jira_data = get_data_jira_bulk(
+        (issue_id for tests in data.values() for test in tests for issue_id in test[1].split(',')),
+        jira_fields=[sfdc_counter_field],
+    )
     with click.progressbar(data.items()) as bar:
         for path, tests in bar:
             for test in tests:
-                jira_data = get_data_jira(test[1], jira_fields=[sfdc_counter_field])
-                for data in jira_data:
-                    customer_cases = int(float(data[sfdc_counter_field]))
+                for issue_id in test[1].split(','):
+                    issue = jira_data.get(issue_id.strip())
+                    customer_cases = issue and int(float(issue[sfdc_counter_field] or 0))
                     if customer_cases and customer_cases >= 1:
                         output.append(f'{path} {test}')
                         break
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Generate robottelo/cli/registry.py, the static index of the hammer cli classes.
+
+``Satellite.cli`` and ``Capsule.cli`` use the registry to import a cli module only when one of
+its classes is accessed. The modules are parsed, not imported, so the registry can be generated
+without any robottelo configuration. Run it after adding, renaming or moving a cli class, the
+pre-commit hook fails when the registry is outdated.
+"""
+
+import ast
+from pathlib import Path
+import sys
+
+import click
+
+CLI_DIR = Path(__file__).resolve().parent.parent / 'robottelo' / 'cli'
+REGISTRY_FILE = CLI_DIR / 'registry.py'
+HEADER = '''"""Static index of the hammer cli classes, mapping each class name to its module.
+
+Generated by scripts/generate_cli_registry.py, do not edit by hand.
+"""
+
+CLI_CLASSES = {
+'''
+
+
+def _base_names(node):
+    for base in node.bases:
+        if isinstance(base, ast.Name):
+            yield base.id
+        elif isinstance(base, ast.Attribute):
+            yield base.attr
+
+
+def collect_cli_classes(cli_dir=CLI_DIR):
+    """Return a mapping of every ``Base`` subclass name defined in ``cli_dir`` to its module"""
+    classes = []
+    for path in sorted(cli_dir.glob('*.py')):
+        if path.name.startswith('_') or path == REGISTRY_FILE:
+            continue
+        tree = ast.parse(path.read_text(), filename=str(path))
+        classes.extend(
+            (node.name, f'robottelo.cli.{path.stem}', set(_base_names(node)))
+            for node in tree.body
+            if isinstance(node, ast.ClassDef)
+        )
+    cli_names = {'Base'}
+    registry = {'Base': 'robottelo.cli.base'}
+    changed = True
+    while changed:
+        changed = False
+        for name, module, bases in classes:
+            if bases & cli_names and registry.get(name) != module:
+                if name in registry and name != 'Base':
+                    raise click.ClickException(
+                        f'{name} is defined in both {registry[name]} and {module}'
+                    )
+                cli_names.add(name)
+                registry[name] = module
+                changed = True
+    return dict(sorted(registry.items()))
+
+
+def render(registry):
+    lines = [f"    '{name}': '{module}',\n" for name, module in registry.items()]
+    return HEADER + ''.join(lines) + '}\n'
+
+
+@click.command()
+@click.option('--check', is_flag=True, help='Only check the registry is up to date.')
+def generate_cli_registry(check):
+    """Write robottelo/cli/registry.py from the classes defined in robottelo/cli."""
+    content = render(collect_cli_classes())
+    current = REGISTRY_FILE.read_text() if REGISTRY_FILE.exists() else ''
+    if content == current:
+        return
+    if check:
+        click.echo(f'{REGISTRY_FILE} is outdated, run scripts/generate_cli_registry.py')
+        sys.exit(1)
+    REGISTRY_FILE.write_text(content)
+    click.echo(f'{REGISTRY_FILE} updated')
+
+
+if __name__ == '__main__':
+    generate_cli_registry()
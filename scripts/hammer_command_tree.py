@@ -1,25 +1,22 @@
 """Generate hammer command tree in json format by inspecting every command's
 help.
 
+The help of every command is read with a single ``hammer full-help`` call and shared with the
+hammer option schema cache, see :mod:`robottelo.cli.schema`.
 """
 
 import json
 
-from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import schema
 from robottelo.config import settings
 
 
-def generate_command_tree(command):
-    """Recursively walk through the hammer commands and subcommands and fetch
-    their help. Return a dictionary with the contents.
-    """
-    output = ssh.command(f'{command} --help', hostname=settings.server.hostnames[0]).stdout
-    contents = hammer.parse_help(output)
-    if len(contents['subcommands']) > 0:
-        for subcommand in contents['subcommands']:
-            subcommand.update(generate_command_tree('{} {}'.format(command, subcommand['name'])))
-    return contents
+def generate_command_tree(command='hammer'):
+    """Return a dictionary with the help of the hammer command and all its subcommands."""
+    hammer_schema = schema.get_schema(settings.server.hostnames[0])
+    if hammer_schema is None:
+        raise RuntimeError('Unable to read the hammer help from the Satellite')
+    return hammer_schema.command_tree(command)
 
 
 # Generate the json file in the working directory
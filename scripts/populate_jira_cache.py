@@ -71,9 +71,7 @@ def populate_jira_cache(tests_dir, fresh):
     jira_data = get_data_jira(list(new_issues))
 
     # Update cache with new data
-    for issue in jira_data:
-        jira_cache.update(issue['key'], issue)
-
+    jira_cache.update_many({issue['key']: issue for issue in jira_data})
     jira_cache.save()
     click.echo(f"Cache updated with {len(jira_data)} issues")
 
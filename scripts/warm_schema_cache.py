@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+"""Fill the hammer help and API apidoc schema cache for the configured Satellite.
+
+Run it once before a session so that none of the xdist workers has to fetch them, every worker
+then only reads the cached files, see :mod:`robottelo.utils.schema_cache`.
+"""
+
+import click
+
+from robottelo.cli import schema
+from robottelo.config import settings
+from robottelo.hosts import Satellite
+
+
+@click.command()
+@click.option('--hostname', help='Satellite to read the schemas from, defaults to server.hostname')
+def warm_schema_cache(hostname):
+    """Fetch the hammer and apidoc schemas of a Satellite into the schema cache."""
+    hostname = hostname or settings.server.hostname
+    hammer_schema = schema.get_schema(hostname)
+    if hammer_schema is None:
+        raise click.ClickException(f'Unable to read the hammer help of {hostname}')
+    click.echo(f'hammer: {len(hammer_schema.commands)} commands cached')
+    apidoc = Satellite(hostname=hostname).apidoc
+    click.echo(f'apidoc: {len(apidoc.get("docs", {}).get("resources", {}))} resources cached')
+
+
+if __name__ == '__main__':
+    warm_schema_cache()
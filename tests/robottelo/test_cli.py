@@ -1,16 +1,24 @@
+import base64
 from functools import partial
+import importlib
+from pathlib import Path
 import unittest
 from unittest import mock
 
 import pytest
 
+from robottelo.cli import schema
 from robottelo.cli.base import Base
+from robottelo.cli.batch import BATCH_MARKER, BATCH_SKIPPED_STATUS, HammerBatch
+from robottelo.cli.namespace import CLINamespace
+from robottelo.cli.registry import CLI_CLASSES
 from robottelo.exceptions import (
     CLIBaseError,
     CLIDataBaseError,
     CLIError,
     CLIReturnCodeError,
 )
+from robottelo.utils import schema_cache
 
 
 class CLIClass(Base):
@@ -285,6 +293,49 @@ class BaseCliTestCase(unittest.TestCase):
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
         assert response is handle_resp.return_value
 
+    @mock.patch('robottelo.cli.base.hammer_daemon.install')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_daemon_backend(self, settings, command, install):
+        """Check execute wraps the hammer arguments for the resident hammer process"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.performance.hammer_backend = 'daemon'
+        settings.performance.hammer_daemon_idle_timeout = 60
+        settings.server.ssh_client.command_timeout = 300000
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        response = Base.execute('some_cmd', hostname='sat.example.com', return_raw_response=True)
+        install.assert_called_once_with('sat.example.com')
+        ssh_cmd = command.call_args.args[0]
+        assert "printf '%s\\0' -v -u admin -p password  some_cmd > $R/args" in ssh_cmd
+        assert 'fallback() { exec env LANG=en_US hammer -v -u admin -p password  some_cmd; }' in (
+            ssh_cmd
+        )
+        # the arguments hold the password
+        assert ssh_cmd.startswith('umask 077\n')
+        # the wait is bounded by the command timeout, in seconds
+        assert 'DEADLINE=$(( $(date +%s) + 300 ))' in ssh_cmd
+        assert response is command.return_value
+
+    @mock.patch.dict('robottelo.cli.hammer_daemon._installed_on', clear=True)
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_without_daemon_installed(self, settings, command):
+        """Check execute runs hammer directly when the daemon could not be uploaded"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.performance.hammer_backend = 'daemon'
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        command.return_value = mock.Mock(status=1, stderr='No space left on device')
+        for _ in range(2):
+            Base.execute('some_cmd', hostname='sat.example.com', return_raw_response=True)
+        # the upload is only tried once
+        assert command.call_count == 3
+        assert 'ROBOTTELO_EOF' in command.call_args_list[0].args[0]
+        assert command.call_args.args[0] == 'LANG=en_US  hammer -v -u admin -p password  some_cmd'
+
     @mock.patch('robottelo.cli.base.Base.list')
     def test_exists_without_option_and_empty_return(self, lst_method):
         """Check exists method without options and empty return"""
@@ -302,6 +353,41 @@ class BaseCliTestCase(unittest.TestCase):
         lst_method.assert_called_once_with(my_options)
         assert response == 1
 
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_exists_paginated(self, lst_method):
+        """Check exists only asks for the first record of the classes paginating it"""
+        from robottelo.cli.host import Host
+
+        lst_method.return_value = [1]
+        response = Host.exists(search=['name', 'host'])
+        lst_method.assert_called_once_with({'search': 'name=\\"host\\"', 'page': 1, 'per-page': 1})
+        assert response == 1
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_paginate(self, lst_method):
+        """Check paginate walks the pages lazily and stops at the first short page"""
+        pages = {1: [1, 2], 2: [3, 4], 3: [5], 4: []}
+        lst_method.side_effect = lambda options: pages[options['page']]
+        records = Base.paginate({'search': 'foo=bar'}, page_size=2)
+        assert next(records) == 1
+        assert lst_method.call_count == 1
+        assert list(records) == [2, 3, 4, 5]
+        lst_method.assert_called_with({'search': 'foo=bar', 'page': 3, 'per-page': 2})
+        assert lst_method.call_count == 3
+        # another output format is passed through to list()
+        lst_method.side_effect = lambda options, output_format: pages[options['page']]
+        assert list(Base.paginate(page_size=2, output_format='json')) == [1, 2, 3, 4, 5]
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_exists_with_list_override(self, execute):
+        """Check exists works for the subclasses overriding list() without output_format"""
+        from robottelo.cli.contentview import ContentView
+        from robottelo.cli.lifecycleenvironment import LifecycleEnvironment
+
+        execute.return_value = [{'name': 'x'}]
+        assert ContentView.exists(search=('name', 'x')) == {'name': 'x'}
+        assert LifecycleEnvironment.exists(search=('name', 'x')) == {'name': 'x'}
+
     @mock.patch('robottelo.cli.base.Base.command_requires_org')
     def test_info_requires_organization_id(self, _):  # noqa: PT019 - not a fixture
         """Check info raises CLIError with organization-id is not present in
@@ -387,6 +473,29 @@ class BaseCliTestCase(unittest.TestCase):
             options={'organization-id': 1},
         )
 
+    @mock.patch('robottelo.cli.base.ssh.stream')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_iter_list(self, settings, stream):
+        """Check iter_list yields parsed rows while reading and raises hammer errors at the end"""
+        settings.robottelo.locale = 'en_US'
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        settings.performance.validate_hammer_options = False
+        output = mock.MagicMock(status=0, stderr='')
+        output.__iter__.return_value = iter(['ID,Na', 'me\n1,foo\n2,b', 'ar\n'])
+        stream.return_value = output
+        rows = Base.iter_list({'organization-id': 1}, row_cls=tuple)
+        assert next(rows)['name'] == 'foo'
+        assert [row.as_dict() for row in rows] == [{'id': '2', 'name': 'bar'}]
+        cmd = stream.call_args.args[0]
+        assert cmd.startswith('LANG=en_US hammer -v -u admin -p password --output=csv')
+        assert '--organization-id="1" --per-page="10000"' in cmd
+
+        output.__iter__.return_value = iter([])
+        output.status, output.stderr = 70, 'Error: not found'
+        with pytest.raises(CLIReturnCodeError):
+            list(Base.iter_list())
+
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_puppet_classes(self, construct, execute):
@@ -488,3 +597,281 @@ class CLIBaseErrorTestCase(unittest.TestCase):
         """Check if message is exposed to assertRaisesRegex"""
         with pytest.raises(CLIBaseError, match='msg'):
             raise CLIBaseError(1, 'stderr', 'msg')
+
+
+class BatchOrg(CLIClass):
+    command_base = 'organization'
+
+
+class BatchProduct(CLIClass):
+    command_base = 'product'
+
+
+def _batch_output(*commands):
+    """Build the stdout of a batch script from ``(index, status, stdout, stderr)`` tuples"""
+    lines = []
+    for index, status, stdout, stderr in commands:
+        lines.append(f'{BATCH_MARKER} {index} {status}')
+        lines.append(base64.b64encode(stdout.encode()).decode())
+        lines.append(base64.b64encode(stderr.encode()).decode())
+    return '\n'.join(lines)
+
+
+class TestHammerBatch:
+    """Tests for the HammerBatch cli class"""
+
+    @pytest.fixture(autouse=True)
+    def settings(self):
+        with mock.patch('robottelo.cli.batch.settings') as settings:
+            settings.robottelo.locale = 'en_US'
+            settings.server.hostname = 'sat.example.com'
+            yield settings
+
+    def test_build_script_with_reference(self):
+        """Check referenced values are extracted before running the dependent command"""
+        batch = HammerBatch()
+        org = batch.add(BatchOrg, 'create', {'name': 'org'}, output_format='csv')
+        batch.add(BatchProduct, 'create', {'organization-id': org.ref('id')})
+        script = batch.build_script()
+        assert 'organization create --name="org"' in script
+        assert 'R0_id=$(extract $B/0.out csv id' in script
+        assert 'product create --organization-id="${R0_id}"' in script
+        assert f'echo {BATCH_SKIPPED_STATUS} >$B/1.rc' in script
+
+    def test_reference_requires_parsable_output(self):
+        """Check only csv and json outputs can be referenced"""
+        batch = HammerBatch()
+        org = batch.add(BatchOrg, 'info', {'id': 1})
+        with pytest.raises(CLIError):
+            org.ref('id')
+
+    @mock.patch('robottelo.cli.batch.ssh.command')
+    def test_execute(self, command):
+        """Check every command gets its own parsed result or error"""
+        command.return_value = mock.Mock(
+            stdout=_batch_output(
+                (0, 0, 'Message,Id\nOrganization created.,42\n', ''),
+                (1, 0, 'Id: 7\nName: prod\n', 'warning'),
+                (2, 65, '', 'Error: product not found'),
+            ),
+            stderr='',
+            status=0,
+        )
+        with HammerBatch(raise_on_error=False) as batch:
+            org = batch.add(BatchOrg, 'create', {'name': 'org'}, output_format='csv')
+            info = batch.add(BatchProduct, 'info', {'organization-id': org.ref('id')})
+            missing = batch.add(BatchProduct, 'info', {'id': 99})
+        command.assert_called_once_with(mock.ANY, hostname='sat.example.com', timeout=None)
+        assert org.result == [{'message': 'Organization created.', 'id': '42'}]
+        assert info.result == {'id': '7', 'name': 'prod'}
+        with pytest.raises(CLIReturnCodeError, match='product not found'):
+            missing.result  # noqa: B018
+
+    @mock.patch('robottelo.cli.batch.ssh.command')
+    def test_execute_malformed_output(self, command):
+        """Check commands with an empty rc file or a cut off output get the batch failure"""
+        complete = _batch_output((0, 0, 'Id: 1\n', ''))
+        command.return_value = mock.Mock(
+            # hammer killed before writing its rc, then the output cut by the ssh timeout
+            stdout=f'{complete}\n{BATCH_MARKER} 1 \n\n\n{BATCH_MARKER} 2 0\nSWQ6',
+            stderr='timed out',
+            status=1,
+        )
+        with HammerBatch(raise_on_error=False) as batch:
+            first = batch.add(BatchOrg, 'info', {'id': 1})
+            killed = batch.add(BatchOrg, 'info', {'id': 2})
+            cut = batch.add(BatchOrg, 'info', {'id': 3})
+        assert first.result == {'id': '1'}
+        for cmd in (killed, cut):
+            with pytest.raises(CLIReturnCodeError, match='batch failed'):
+                cmd.result  # noqa: B018
+
+    @mock.patch('robottelo.cli.batch.ssh.command')
+    def test_execute_raise_on_error(self, command):
+        """Check the first error is raised when the batch did not run at all"""
+        command.return_value = mock.Mock(stdout='', stderr='connection lost', status=1)
+        with (  # noqa: PT012
+            pytest.raises(CLIReturnCodeError, match='connection lost'),
+            BatchOrg.batch() as batch,
+        ):
+            batch.add(BatchOrg, 'list')
+
+
+FULL_HELP = """Hammer CLI help
+hammer organization >
+--------------------
+Usage:
+    hammer organization [OPTIONS] SUBCOMMAND [ARG] ...
+
+Subcommands:
+ create                        Create organization
+
+hammer organization create
+--------------------------
+Usage:
+    hammer organization create [OPTIONS]
+
+Options:
+ --description VALUE           Description
+ --ignore-types LIST           List of resources types that will be automatically associated
+ --name VALUE                  Name
+ --parent-id, --parent-organization-id NUMBER Parent ID
+ --simple-content-access BOOLEAN Whether to turn on Simple Content Access
+ --status ENUM                 Status
+                               Possible value(s): 'active', 'disabled'
+ -h, --help                    Print help
+"""
+
+
+class TestHammerSchema:
+    """Tests for the hammer option schema"""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path):
+        with (
+            mock.patch('robottelo.utils.schema_cache.CACHE_DIR', tmp_path),
+            mock.patch.dict('robottelo.utils.schema_cache._loaded', clear=True),
+            mock.patch.dict('robottelo.cli.schema._schemas', clear=True),
+        ):
+            yield tmp_path
+
+    def test_parse_full_help(self):
+        """Check every command of the full help is parsed"""
+        commands = schema.parse_full_help(FULL_HELP)
+        assert list(commands) == ['hammer organization', 'hammer organization create']
+        assert commands['hammer organization']['subcommands'][0]['name'] == 'create'
+        options = schema._option_types(commands['hammer organization create'])
+        assert options['parent-id'] == 'NUMBER'
+        assert options['parent-organization-id'] == 'NUMBER'
+        assert options['status'] == ['active', 'disabled']
+
+    def test_validate(self):
+        """Check unknown options and invalid values are rejected locally"""
+        hammer_schema = schema.HammerSchema(
+            '6.16.0-1', '0123abcd', schema.parse_full_help(FULL_HELP)
+        )
+        command = hammer_schema.command('organization', 'create')
+        command.validate(
+            {
+                'name': 'org',
+                'parent-id': 1,
+                'simple-content-access': 'yes',
+                'status': 'active',
+                'ignore-types': ['a', 'b'],
+                'description': None,
+            }
+        )
+        command.validate({'name': 'org', 'parent-organization-id': 1})
+        # options left out of the command line are not checked
+        command.validate({'name': 'org', 'parent-id': None, 'unused': False})
+        with pytest.raises(CLIError) as error:
+            command.validate({'nmae': 'org', 'parent-id': 'one', 'status': 'gone'})
+        message = str(error.value)
+        assert 'unknown option --nmae' in message
+        assert "--parent-id expects a number, got 'one'" in message
+        assert '--status expects one of active, disabled' in message
+        assert hammer_schema.command('organization', 'unknown') is None
+
+    @mock.patch('robottelo.cli.schema.ssh.command')
+    def test_get_schema_is_cached(self, command, cache_dir):
+        """Check the full help is only fetched once per Satellite version and hammer checksum"""
+        command.side_effect = [
+            mock.Mock(status=0, stdout='6.16.0-1.el9\n0123abcd\n'),
+            mock.Mock(status=0, stdout=FULL_HELP),
+        ]
+        first = schema.get_schema('sat.example.com')
+        assert (cache_dir / 'hammer' / '6.16.0-1.el9-0123abcd.json').exists()
+        schema._schemas.clear()
+        schema_cache._loaded.clear()
+        command.side_effect = [mock.Mock(status=0, stdout='6.16.0-1.el9\n0123abcd\n')]
+        second = schema.get_schema('sat.example.com')
+        assert second.commands == first.commands
+        assert command.call_count == 3
+        # a different hammer checksum means the help has to be read again
+        schema._schemas.clear()
+        command.side_effect = [
+            mock.Mock(status=0, stdout='6.16.0-1.el9\nffffffff\n'),
+            mock.Mock(status=0, stdout=FULL_HELP),
+        ]
+        schema.get_schema('sat.example.com')
+        assert command.call_count == 5
+
+    def test_command_tree(self):
+        """Check the command tree has the format of the hammer_commands.json data file"""
+        hammer_schema = schema.HammerSchema(
+            '6.16.0-1', '0123abcd', schema.parse_full_help(FULL_HELP)
+        )
+        tree = hammer_schema.command_tree('hammer organization')
+        create = tree['subcommands'][0]
+        assert create['name'] == 'create'
+        assert create['description'] == 'Create organization'
+        assert {option['name'] for option in create['options']} >= {'name', 'parent-id'}
+
+    def test_schema_cache_load_store(self, cache_dir):
+        """Check entries are stored atomically and parsed once per process"""
+        assert schema_cache.load('apidoc', '6.16', 'abc') is None
+        path = schema_cache.store('apidoc', '6.16', 'abc', {'docs': {}})
+        assert path == cache_dir / 'apidoc' / '6.16-abc.json'
+        schema_cache._loaded.clear()
+        loaded = schema_cache.load('apidoc', '6.16', 'abc')
+        assert loaded == {'docs': {}}
+        assert schema_cache.load('apidoc', '6.16', 'abc') is loaded
+        path.write_text('')
+        schema_cache._loaded.clear()
+        assert schema_cache.load('apidoc', '6.16', 'abc') is None
+
+    @mock.patch('robottelo.cli.base.schema.validate')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_construct_command_validates_options(self, settings, validate):
+        """Check the options are validated before the command is built"""
+        settings.performance.validate_hammer_options = True
+        validate.side_effect = CLIError('unknown option --nmae')
+        with pytest.raises(CLIError, match='nmae'):
+            BatchOrg._construct_command({'nmae': 'org'})
+        validate.assert_called_once_with(
+            settings.server.hostname, 'organization', mock.ANY, {'nmae': 'org'}
+        )
+
+
+class TestCLINamespace:
+    """Tests for the lazily populated cli namespace"""
+
+    def test_registry_is_complete(self):
+        """Check the registry lists every cli class and only cli classes"""
+        for name, module in CLI_CLASSES.items():
+            assert issubclass(getattr(importlib.import_module(module), name), Base)
+        for path in Path(importlib.import_module('robottelo.cli').__path__[0]).glob('*.py'):
+            module = importlib.import_module(f'robottelo.cli.{path.stem}')
+            for name, obj in vars(module).items():
+                if isinstance(obj, type) and issubclass(obj, Base):
+                    assert name in CLI_CLASSES, 'run scripts/generate_cli_registry.py'
+
+    def test_classes_are_bound_on_first_access(self):
+        """Check classes are bound to the hostname once per namespace"""
+        cli = CLINamespace('sat1.example.com')
+        assert 'Org' not in vars(cli)
+        org = cli.Org
+        assert org.hostname == 'sat1.example.com'
+        assert org.command_base == 'organization'
+        assert 'Org' in vars(cli)
+        assert cli.Org is org
+        assert CLINamespace('sat2.example.com').Org is not org
+        assert 'Org' in list(cli)
+        with pytest.raises(AttributeError):
+            cli.NotACliClass  # noqa: B018
+
+    def test_module_prefix_and_omitting_credentials(self):
+        """Check a namespace only exposes the classes of its modules and their credentials mode"""
+        cli = CLINamespace('caps.example.com', module_prefix='robottelo.cli.sm_')
+        assert cli.Health.hostname == 'caps.example.com'
+        with pytest.raises(AttributeError):
+            cli.Org  # noqa: B018
+        cli.set_omitting_credentials(True)
+        assert cli.Health.omitting_credentials is True
+        assert cli.Backup.omitting_credentials is True
+        # another namespace of the same host keeps its credentials
+        other = CLINamespace('caps.example.com', module_prefix='robottelo.cli.sm_')
+        assert other.Health.omitting_credentials is False
+        assert cli.Health.omitting_credentials is True
+        cli.set_omitting_credentials(False)
+        assert cli.Health.omitting_credentials is False
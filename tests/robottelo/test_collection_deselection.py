@@ -0,0 +1,88 @@
+"""Tests and collection-time benchmark of the deselection by ``rerun_rp`` and
+``select_random_tests``."""
+
+import random
+import time
+from unittest import mock
+
+import pytest
+
+from pytest_plugins import select_random_tests
+from pytest_plugins.rerun_rp import rerun_rp
+from robottelo.utils import normalize_nodeid, normalized_item_name
+
+ITEMS_COUNT = 30000
+RP_TESTS_COUNT = 5000
+
+
+class Item:
+    def __init__(self, index):
+        module = f'tests/foreman/api/test_module_{index // 1000}.py'
+        name = f'TestClass.test_{index % 1000}[rhel{index % 3 + 8}]'
+        self.location = (module, index, name)
+        self.nodeid = f'{module}::{name.replace(".", "::")}'
+
+
+def make_config(**options):
+    config = mock.Mock(args=[])
+    config.getoption.side_effect = lambda name, default=None: options.get(name, default)
+    config.getini.return_value = ''
+    return config
+
+
+def test_normalize_nodeid():
+    item = Item(1)
+    assert normalized_item_name(item) == normalize_nodeid(item.nodeid)
+    assert normalize_nodeid(item.nodeid) == (
+        'tests/foreman/api/test_module_0.py.TestClass.test_1[rhel9]'
+    )
+
+
+@pytest.fixture
+def rp_tests(monkeypatch):
+    items = [Item(index) for index in range(ITEMS_COUNT)]
+    tests = [{'name': items[index].nodeid} for index in range(0, ITEMS_COUNT, 6)]
+    rp = mock.Mock(defect_types={})
+    rp.get_launches.return_value = [
+        {'id': 1, 'name': 'launch', 'statistics': {'executions': {'failed': 1, 'total': 10}}}
+    ]
+    rp.get_tests.return_value = tests
+    monkeypatch.setattr(rerun_rp, 'ReportPortal', lambda **kwargs: rp)
+    monkeypatch.setattr(rerun_rp.settings.report_portal, 'fail_threshold', 20, raising=False)
+    return items, tests
+
+
+def test_rerun_rp_deselection(rp_tests, capsys):
+    items, tests = rp_tests
+    config = make_config(only_failed='all', rp_reference_launch_uuid='uuid')
+    start = time.perf_counter()
+    rerun_rp.pytest_collection_modifyitems.__wrapped__(items, config)
+    elapsed = time.perf_counter() - start
+    assert len(items) == len(tests)
+    # the collection order is kept
+    assert [item.nodeid for item in items] == [test['name'] for test in tests]
+    assert len(config.hook.pytest_deselected.call_args.kwargs['items']) == ITEMS_COUNT - len(tests)
+    with capsys.disabled():
+        print(f'\nrerun_rp: {ITEMS_COUNT} items, {len(tests)} RP tests in {elapsed * 1000:.0f}ms')
+
+
+@pytest.fixture
+def random_state():
+    """Restore the state of the global random generator, seeded by the plugin"""
+    state = random.getstate()
+    yield
+    random.setstate(state)
+
+
+def test_select_random_tests_deselection(random_state, capsys):
+    items = [Item(index) for index in range(ITEMS_COUNT)]
+    config = make_config(select_random_tests='10%', random_seed='seed')
+    start = time.perf_counter()
+    select_random_tests.pytest_collection_modifyitems(items, config)
+    elapsed = time.perf_counter() - start
+    assert len(items) == ITEMS_COUNT // 10
+    deselected = config.hook.pytest_deselected.call_args.kwargs['items']
+    assert len(deselected) == ITEMS_COUNT - len(items)
+    assert not set(deselected) & set(items)
+    with capsys.disabled():
+        print(f'\nselect_random_tests: {ITEMS_COUNT} items in {elapsed * 1000:.0f}ms')
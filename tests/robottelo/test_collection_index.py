@@ -0,0 +1,162 @@
+"""Tests for module ``robottelo.utils.collection_index``."""
+
+import importlib.util
+import inspect
+import os
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import collection_index
+
+SAMPLE_MODULE = '''"""Sample tests
+
+:CaseComponent: Repositories
+
+:Team: Phoenix
+"""
+import pytest
+
+from robottelo.utils.issue_handlers import is_open
+
+
+def setup_module():
+    if is_open('BZ:1'):
+        pass
+
+
+class TestSample:
+    """Sample class
+
+    :CaseImportance: High
+    """
+
+    @pytest.mark.parametrize('value', [1, 2])
+    def test_positive(self, value):
+        """Sample test
+
+        :BlockedBy: SAT-2, SAT-3
+
+        :Verifies: SAT-4
+        """
+        if not is_open('BZ:5'):
+            pass
+
+    def test_no_docstring(self):
+        pass
+
+
+class TestInherited(TestSample):
+    def test_positive(self, value):
+        pass
+'''
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    with (
+        mock.patch.object(collection_index, 'INDEX_DIR', tmp_path / 'index'),
+        mock.patch.object(collection_index, '_entries', {}),
+        mock.patch.object(collection_index, 'settings') as settings,
+    ):
+        settings.performance.collection_index = True
+        yield tmp_path / 'index'
+
+
+@pytest.fixture
+def sample(tmp_path):
+    path = tmp_path / 'test_sample.py'
+    path.write_text(SAMPLE_MODULE)
+    return path
+
+
+@pytest.fixture
+def sample_module(sample):
+    spec = importlib.util.spec_from_file_location('test_sample', sample)
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict('sys.modules', {'test_sample': module}):
+        spec.loader.exec_module(module)
+        yield module
+
+
+class TestParseModule:
+    def test_docstring_tokens(self):
+        docstrings = collection_index.parse_module(SAMPLE_MODULE)['docstrings']
+        assert docstrings[''] == {'component': ['Repositories'], 'team': ['Phoenix']}
+        assert docstrings['TestSample'] == {'importance': ['High']}
+        assert docstrings['TestSample.test_positive'] == {
+            'blocked_by': ['SAT-2, SAT-3'],
+            'verifies': ['SAT-4'],
+        }
+        assert 'TestSample.test_no_docstring' not in docstrings
+
+    def test_workarounds(self):
+        entry = collection_index.parse_module(SAMPLE_MODULE)
+        assert entry['workarounds']['setup_module'] == {
+            'is_open': [['BZ', '1']],
+            'not is_open': [],
+        }
+        assert entry['workarounds']['TestSample.test_positive'] == {
+            'is_open': [],
+            'not is_open': [['BZ', '5']],
+        }
+        assert entry['workarounds']['TestSample.test_no_docstring'] == {}
+        assert entry['component'] == 'Repositories'
+
+
+class TestGetEntry:
+    def test_unchanged_module_is_not_parsed_again(self, index_dir, sample):
+        with mock.patch.object(
+            collection_index, 'parse_module', wraps=collection_index.parse_module
+        ) as parse:
+            entry = collection_index.get_entry(sample)
+            collection_index._entries.clear()
+            assert collection_index.get_entry(sample) == entry
+            # touched, same content
+            os.utime(sample, ns=(0, 0))
+            collection_index._entries.clear()
+            assert collection_index.get_entry(sample) == entry
+            assert parse.call_count == 1
+        assert len(list(index_dir.iterdir())) == 1
+
+    def test_modified_module_is_parsed_again(self, index_dir, sample):
+        collection_index.get_entry(sample)
+        sample.write_text(SAMPLE_MODULE.replace('Repositories', 'Hosts'))
+        collection_index._entries.clear()
+        assert collection_index.get_entry(sample)['component'] == 'Hosts'
+
+    def test_invalid_module(self, index_dir, tmp_path):
+        path = tmp_path / 'test_invalid.py'
+        path.write_text('def test_invalid(:\n')
+        assert collection_index.get_entry(path) is None
+
+
+class TestLookup:
+    def test_same_tokens_as_inspect(self, index_dir, sample_module):
+        for obj in (
+            sample_module,
+            sample_module.TestSample,
+            sample_module.TestSample.test_positive,
+            sample_module.TestSample.test_no_docstring,
+            sample_module.TestInherited.test_positive,
+        ):
+            assert collection_index.docstring_tokens(obj) == collection_index.parse_tokens(
+                inspect.getdoc(obj)
+            )
+        assert len(list(index_dir.iterdir())) == 1
+
+    def test_workarounds(self, index_dir, sample_module):
+        with mock.patch.object(collection_index.inspect, 'getsource') as getsource:
+            assert collection_index.workarounds(sample_module.setup_module)['is_open'] == [
+                ['BZ', '1']
+            ]
+            assert collection_index.workarounds(sample_module)['not is_open'] == [['BZ', '5']]
+            assert collection_index.module_component(sample_module) == 'Repositories'
+        getsource.assert_not_called()
+
+    def test_disabled(self, index_dir, sample_module):
+        collection_index.settings.performance.collection_index = False
+        assert collection_index.docstring_tokens(sample_module.TestSample) == {
+            'importance': ['High']
+        }
+        assert not index_dir.exists()
@@ -0,0 +1,141 @@
+"""Tests for module ``robottelo.utils.collection_plan``."""
+
+from collections import defaultdict
+import enum
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import collection_plan
+from robottelo.utils.collection_plan import CollectionPlan
+
+
+class FakeItem:
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+        self.own_markers = []
+        self.user_properties = []
+
+    def add_marker(self, marker):
+        self.own_markers.append(marker.mark)
+
+
+def collect():
+    return [FakeItem(f'tests/foreman/api/test_sample.py::test_{index}') for index in range(4)]
+
+
+def modifyitems(items, config):
+    """Deselect the first item, reverse the others and mark them"""
+    deselected = items[0]
+    items[:] = items[:0:-1]
+    for item in items:
+        item.add_marker(pytest.mark.skip(reason='SAT-1'))
+        item.user_properties.append(('BaseOS', '9.6'))
+    config.hook.pytest_deselected(items=[deselected])
+    pytest.sample_issue_data = defaultdict(lambda: {'data': {}, 'used_in': []})
+    pytest.sample_issue_data['SAT-1']['data']['is_open'] = True
+
+
+@pytest.fixture
+def plan_dir(tmp_path):
+    with mock.patch.object(collection_plan, 'PLAN_DIR', tmp_path):
+        yield tmp_path
+    if hasattr(pytest, 'sample_issue_data'):
+        del pytest.sample_issue_data
+
+
+class TestCollectionPlan:
+    def test_replay_recorded_step(self, plan_dir):
+        recorder = CollectionPlan(plan_dir / 'session.json')
+        recorder.acquire()
+        recorded = collect()
+        recorder.record(
+            'sample', modifyitems, recorded, ['sample_issue_data'], recorded, mock.Mock()
+        )
+        recorder.write()
+        del pytest.sample_issue_data
+
+        replayer = CollectionPlan(plan_dir / 'session.json')
+        replayer.acquire()
+        assert replayer.replaying
+        config = mock.Mock()
+        items = collect()
+        assert replayer.replay('sample', items, config)
+        assert [item.nodeid for item in items] == [item.nodeid for item in recorded]
+        assert [item.own_markers for item in items] == [item.own_markers for item in recorded]
+        assert items[0].user_properties == [('BaseOS', '9.6')]
+        assert config.hook.pytest_deselected.call_args.kwargs['items'][0].nodeid.endswith('test_0')
+        assert pytest.sample_issue_data == {'SAT-1': {'data': {'is_open': True}, 'used_in': []}}
+        assert isinstance(pytest.sample_issue_data, defaultdict)
+        assert pytest.sample_issue_data['SAT-2'] == {'data': {}, 'used_in': []}
+        pytest.sample_issue_data['SAT-3']['used_in'].append('test')
+        assert pytest.sample_issue_data['SAT-4']['used_in'] == []
+
+    @pytest.mark.parametrize(
+        'value', [('a', 'b'), enum.Enum('Color', 'RED').RED, len], ids=['tuple', 'enum', 'callable']
+    )
+    def test_non_json_step_is_not_replayed(self, plan_dir, value):
+        def mark_items(items, config):
+            for item in items:
+                item.add_marker(pytest.mark.parametrize('x', [value]))
+
+        recorder = CollectionPlan(plan_dir / 'session.json')
+        recorder.acquire()
+        recorded = collect()
+        recorder.record('sample', mark_items, recorded, [], recorded, mock.Mock())
+        recorder.write()
+
+        replayer = CollectionPlan(plan_dir / 'session.json')
+        replayer.acquire()
+        items = collect()
+        # the hook runs again instead of replaying markers with other values
+        assert not replayer.replay('sample', items, mock.Mock())
+        assert not any(item.own_markers for item in items)
+
+    def test_different_items_are_not_replayed(self, plan_dir):
+        recorder = CollectionPlan(plan_dir / 'session.json')
+        recorder.acquire()
+        recorded = collect()
+        recorder.record('sample', modifyitems, recorded, [], recorded, mock.Mock())
+        items = collect()[1:]
+        assert not recorder.replay('sample', items, mock.Mock())
+        assert not recorder.replay('other', collect(), mock.Mock())
+        recorder.release()
+
+
+class TestPlanned:
+    def test_hook_runs_without_xdist(self, plan_dir):
+        hook = mock.Mock()
+
+        @collection_plan.planned('sample')
+        def pytest_collection_modifyitems(items, config):
+            hook(items, config)
+
+        config = mock.Mock(spec=[])
+        pytest_collection_modifyitems(['item'], config)
+        hook.assert_called_once_with(['item'], config)
+        assert not list(plan_dir.iterdir())
+
+    def test_hook_runs_once_per_session(self, plan_dir):
+        calls = []
+
+        @collection_plan.planned('sample', attributes=['sample_issue_data'])
+        def pytest_collection_modifyitems(items, config):
+            calls.append(config)
+            modifyitems(items, config)
+
+        config = mock.Mock(workerinput={'testrunuid': 'abc'})
+        with (
+            mock.patch.object(collection_plan, 'settings') as settings,
+            mock.patch.object(collection_plan, '_plan', None),
+        ):
+            settings.performance.collection_plan = True
+            pytest_collection_modifyitems(collect(), config)
+            collection_plan.get_plan(config).write()
+            # another worker
+            collection_plan._plan = None
+            items = collect()
+            pytest_collection_modifyitems(items, config)
+        assert len(calls) == 1
+        assert len(items) == 3
+        assert (plan_dir / 'abc.json').exists()
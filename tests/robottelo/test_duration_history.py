@@ -0,0 +1,64 @@
+"""Tests for module ``robottelo.utils.duration_history``."""
+
+from robottelo.utils import duration_history
+
+NODEIDS = [
+    'tests/foreman/api/test_light.py::TestA::test_1',
+    'tests/foreman/api/test_light.py::TestA::test_2',
+    'tests/foreman/api/test_light.py::TestB::test_1',
+    'tests/foreman/api/test_light.py::test_function',
+    'tests/foreman/api/test_heavy.py::TestC::test_1',
+    'tests/foreman/api/test_heavy.py::TestD::test_1',
+    'tests/foreman/api/test_new.py::test_function',
+]
+
+HISTORY = {
+    'tests/foreman/api/test_light.py::TestA::test_1': {'duration': 1.0, 'heavy': False},
+    'tests/foreman/api/test_light.py::TestA::test_2': {'duration': 3.0, 'heavy': False},
+    'tests/foreman/api/test_light.py::TestB::test_1': {'duration': 5.0, 'heavy': False},
+    'tests/foreman/api/test_heavy.py::TestC::test_1': {'duration': 600.0, 'heavy': True},
+    'tests/foreman/api/test_heavy.py::TestD::test_1': {'duration': 60.0, 'heavy': False},
+}
+
+
+class TestDurationHistory:
+    def test_predict(self):
+        predicted = duration_history.predict(NODEIDS, HISTORY)
+        assert predicted['tests/foreman/api/test_light.py::TestA::test_2'] == 3.0
+        # mean of the module
+        assert predicted['tests/foreman/api/test_light.py::test_function'] == 3.0
+        assert predicted['tests/foreman/api/test_new.py::test_function'] == (
+            duration_history.DEFAULT_DURATION
+        )
+
+    def test_work_units(self):
+        units = duration_history.work_units(NODEIDS, HISTORY)
+        assert [(unit, duration) for unit, duration, _ in units] == [
+            # the whole module runs on one worker
+            ('tests/foreman/api/test_heavy.py', 660.0),
+            ('tests/foreman/api/test_new.py', 10.0),
+            ('tests/foreman/api/test_light.py::TestB', 5.0),
+            ('tests/foreman/api/test_light.py::TestA', 4.0),
+            ('tests/foreman/api/test_light.py', 3.0),
+        ]
+        assert sorted(nodeid for _, _, nodeids in units for nodeid in nodeids) == sorted(NODEIDS)
+
+    def test_makespan(self):
+        assert duration_history.makespan([5, 4, 3, 3, 3], 2) == 10
+        assert duration_history.makespan([5, 4], 4) == 5
+        assert duration_history.makespan([], 2) == 0
+
+    def test_update(self, tmp_path):
+        path = tmp_path / 'durations.json'
+        duration_history.update({'test.py::test_1': {'duration': 10.0, 'heavy': False}}, path)
+        duration_history.update(
+            {
+                'test.py::test_1': {'duration': 20.0, 'heavy': True},
+                'test.py::test_2': {'duration': 1.0, 'heavy': False},
+            },
+            path,
+        )
+        assert duration_history.load(path) == {
+            'test.py::test_1': {'duration': 15.0, 'heavy': True},
+            'test.py::test_2': {'duration': 1.0, 'heavy': False},
+        }
@@ -186,6 +186,25 @@ def simple_scoped_locking_function():
     return
 
 
+@func_locker.lock_function(mode=func_locker.LOCK_MODE_SHARED)
+def simple_shared_lock_function():
+    """Return the process id, the lock is held in shared mode"""
+    return os.getpid()
+
+
+@func_locker.lock_function(shard_key=lambda key: key)
+def simple_sharded_lock_function(key):
+    """Return the content of the lock file of ``key``"""
+    with open(_get_function_lock_path(f'simple_sharded_lock_function.{key}')) as rf:
+        return rf.read()
+
+
+@func_locker.lock_function(timeout=1)
+def simple_exclusive_lock_function():
+    """Return the process id, waiting at most 1 second for the lock"""
+    return os.getpid()
+
+
 def simple_function_not_locked():
     """This function do nothing, when called with locking, exception must be
     raised that this function is not locked
@@ -419,3 +438,34 @@ class TestFuncLocker:
             func_locker.locking_function(simple_function_not_locked),
         ):
             pass
+
+    def test_shared_lock_function(self, count_and_pool):
+        """Shared holders do not wait for each other, exclusive ones wait for them"""
+        with func_locker.locking_function(
+            simple_shared_lock_function, mode=func_locker.LOCK_MODE_SHARED
+        ):
+            res = count_and_pool.apply_async(simple_shared_lock_function, ())
+            assert res.get(timeout=5) != os.getpid()
+        with func_locker.locking_function(
+            simple_exclusive_lock_function, mode=func_locker.LOCK_MODE_SHARED
+        ):
+            res = count_and_pool.apply_async(simple_exclusive_lock_function, ())
+            with pytest.raises(func_locker.FunctionLockerError, match=r'.*Could not lock.*'):
+                res.get(timeout=5)
+
+    def test_sharded_lock_function(self, count_and_pool):
+        """Only the calls with the same shard key are locked together"""
+        assert simple_sharded_lock_function('first') == str(os.getpid())
+        with func_locker.locking_function(simple_sharded_lock_function, shard_key='first'):
+            res = count_and_pool.apply_async(simple_sharded_lock_function, ('second',))
+            assert res.get(timeout=5) != str(os.getpid())
+        assert os.path.exists(_get_function_lock_path('simple_sharded_lock_function.second'))
+
+    def test_lock_stats(self):
+        name = _get_function_name_string('simple_shared_lock_function')
+        acquired = func_locker.get_lock_stats().get(name, {}).get('acquired', 0)
+        simple_shared_lock_function()
+        stats = func_locker.get_lock_stats()[name]
+        assert stats['acquired'] == acquired + 1
+        assert stats['hold_time'] >= 0
+        assert stats['max_wait_time'] <= stats['wait_time']
@@ -1,6 +1,8 @@
+from importlib import import_module
 import multiprocessing
 import os
 import time
+from unittest import mock
 
 from fauxfactory import gen_integer, gen_string
 import pytest
@@ -8,17 +10,22 @@ import pytest
 from robottelo.utils.decorators.func_shared.file_storage import (
     TEMP_FUNC_SHARED_DIR,
     TEMP_ROOT_DIR,
+    FileStorageHandler,
     get_temp_dir,
 )
 from robottelo.utils.decorators.func_shared.shared import (
     _NAMESPACE_SCOPE_KEY_TYPE,
     SharedFunctionException,
     _set_configured,
+    clear_memo,
     enable_shared_function,
     set_default_scope,
     shared,
 )
 
+# the package exports the shared decorator under the name of its module
+shared_module = import_module('robottelo.utils.decorators.func_shared.shared')
+
 DEFAULT_POOL_SIZE = 8
 SIMPLE_TIMEOUT_VALUE = 3
 
@@ -143,6 +150,17 @@ def basic_shared_counter_string(prefix='', suffix='', counter=0, increment_by=1)
     return f'{prefix}_{counter + increment_by}_{suffix}'
 
 
+@shared
+def simple_shared_list(value=0):
+    """return a list that the callers may modify"""
+    return [value]
+
+
+@shared(function_kw=['prefix'])
+def simple_shared_prefix(prefix=''):
+    return prefix
+
+
 class NotRestorableException(Exception):
     """this exception is not restorable as need mote args"""
 
@@ -554,3 +572,36 @@ class TestFuncShared:
                 suffix=suffix, prefix=prefix, counter=counter_value
             )
             assert inc_string == inc_string_2
+
+    def test_ready_result_served_from_memory(self):
+        """The storage is not locked again once the result is ready in this process"""
+        counter_value = gen_integer(min_value=2, max_value=10000)
+        result = simple_shared_list(counter_value)
+        result.append('modified by the caller')
+        with mock.patch.object(FileStorageHandler, 'lock', side_effect=AssertionError):
+            assert simple_shared_list(counter_value + 1) == [counter_value]
+        # forgotten results are read again from storage
+        clear_memo()
+        locked_keys = []
+        storage_lock = FileStorageHandler.lock
+
+        def lock(storage, key):
+            locked_keys.append(key)
+            return storage_lock(storage, key)
+
+        with mock.patch.object(FileStorageHandler, 'lock', lock):
+            assert simple_shared_list(counter_value + 1) == [counter_value]
+            assert simple_shared_list(counter_value + 1) == [counter_value]
+        assert len(locked_keys) == 1
+
+    def test_memo_least_recently_used_eviction(self):
+        """Only the most recently used results are kept in memory"""
+        clear_memo()
+        with mock.patch.object(shared_module, 'MEMO_SIZE', 2):
+            for prefix in ('first', 'second', 'first', 'third'):
+                assert simple_shared_prefix(prefix=prefix) == prefix
+            assert len(shared_module._memo) == 2
+            assert [value['result'] for value, _ in shared_module._memo.values()] == [
+                'first',
+                'third',
+            ]
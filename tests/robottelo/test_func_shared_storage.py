@@ -0,0 +1,160 @@
+"""Tests for the codecs and the storage handlers of ``robottelo.utils.decorators.func_shared``."""
+
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from robottelo.utils.decorators.func_shared import base, mmap_storage
+from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.utils.decorators.func_shared.mmap_storage import MmapStorageHandler
+
+# a shared setup result, as returned by the shared functions of the tests
+SETUP_RESULT = {
+    'state': 'READY',
+    'result': {
+        'org': {'id': 12, 'name': 'org_name', 'label': 'org_label'},
+        'repos': [
+            {'id': index, 'name': f'repo_{index}', 'url': f'https://example.com/repo_{index}'}
+            for index in range(200)
+        ],
+        'content_view': {'id': 3, 'version': '1.0', 'repository_ids': list(range(200))},
+    },
+    'error': None,
+    'pid': 1234,
+    'creation_datetime': '2025-01-01T00:00:00',
+}
+
+
+@pytest.fixture(params=base.get_codecs())
+def codec(request):
+    return request.param
+
+
+@pytest.fixture(params=[FileStorageHandler, MmapStorageHandler])
+def storage(request, tmp_path):
+    return request.param(root_dir=str(tmp_path))
+
+
+def _append_values(root_dir, index):
+    storage = MmapStorageHandler(root_dir=root_dir)
+    for value in range(20):
+        with storage.lock(f'key_{index}'):
+            storage.set(f'key_{index}', {'index': index, 'value': value})
+    return os.getpid()
+
+
+class TestCodecs:
+    def test_encode_decode(self, codec):
+        storage = base.BaseStorageHandler()
+        encoded = storage.encode(SETUP_RESULT, codec=codec)
+        assert isinstance(encoded, bytes)
+        assert storage.decode(encoded, codec=codec) == SETUP_RESULT
+
+    def test_json_is_not_tagged(self):
+        """Values stored before the codecs existed are still read"""
+        storage = base.BaseStorageHandler()
+        assert storage.encode({'index': 1}) == b'{"index": 1}'
+        assert storage.decode('{"index": 1}') == {'index': 1}
+
+    def test_codec_read_from_value(self):
+        writer = base.BaseStorageHandler()
+        writer.codec = base.CODEC_JSON_ZLIB
+        assert base.BaseStorageHandler().decode(writer.encode([1, 2])) == [1, 2]
+
+    def test_pickle_not_trusted(self, monkeypatch):
+        """Pickle values are only loaded by the readers configured for pickle"""
+        encoded = base.BaseStorageHandler().encode((1, 2), codec=base.CODEC_PICKLE)
+        reader = base.BaseStorageHandler()
+        with pytest.raises(ValueError, match='not allowed'):
+            reader.decode(encoded)
+        assert reader.decode(encoded, codec=base.CODEC_PICKLE) == (1, 2)
+        monkeypatch.setattr(base, 'ALLOW_PICKLE', True)
+        assert reader.decode(encoded) == (1, 2)
+
+    def test_unknown_codec(self):
+        storage = base.BaseStorageHandler()
+        with pytest.raises(ValueError, match='not available'):
+            storage.encode({}, codec='unknown')
+        with pytest.raises(ValueError, match='not available'):
+            storage.decode(base.CODEC_HEADER + b'unknown\n{}')
+
+
+class TestStorage:
+    def test_set_get(self, storage, codec):
+        assert storage.get('key') is None
+        with storage.lock('key'):
+            storage.set('key', SETUP_RESULT, codec=codec)
+        assert storage.get('key', codec=codec) == SETUP_RESULT
+        storage.set('key', {'index': 2})
+        assert storage.get('key') == {'index': 2}
+
+
+class TestMmapStorage:
+    def test_values_shared_by_processes(self, tmp_path):
+        with multiprocessing.Pool(4) as pool:
+            pool.starmap(_append_values, [(str(tmp_path), index) for index in range(8)])
+        storage = MmapStorageHandler(root_dir=str(tmp_path))
+        for index in range(8):
+            assert storage.get(f'key_{index}') == {'index': index, 'value': 19}
+        assert [path.name for path in tmp_path.iterdir() if not path.name.endswith('.lock')] == [
+            mmap_storage.STORE_FILE_NAME
+        ]
+
+    def test_interrupted_append_is_ignored(self, tmp_path):
+        storage = MmapStorageHandler(root_dir=str(tmp_path))
+        storage.set('key', {'index': 1})
+        with open(tmp_path / mmap_storage.STORE_FILE_NAME, 'ab') as store:
+            store.write(mmap_storage._record('key', b'{"index": 2}')[:-3])
+        assert storage.get('key') == {'index': 1}
+        storage.set('other', {'index': 3})
+        assert storage.get('key') == {'index': 1}
+        assert storage.get('other') == {'index': 3}
+
+    def test_compaction(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(mmap_storage, 'COMPACT_MIN_SIZE', 1024)
+        storage = MmapStorageHandler(root_dir=str(tmp_path))
+        other = MmapStorageHandler(root_dir=str(tmp_path))
+        other._store = mmap_storage._Store(other._store.path)
+        assert other.get('key') is None
+        for index in range(100):
+            storage.set('key', {'index': index})
+        storage.set('other', {'index': 100})
+        assert (tmp_path / mmap_storage.STORE_FILE_NAME).stat().st_size < 1024 * 3
+        # a process reading the store before the compaction
+        assert other.get('key') == {'index': 99}
+        assert other.get('other') == {'index': 100}
+
+
+def test_codecs_and_storages_benchmark(tmp_path, capsys):
+    """Compare the time to store and read a shared setup result with each codec and storage
+
+    Run with ``pytest -s`` to see the results, no timing is asserted.
+    """
+    iterations = 50
+    results = []
+    for storage_class in (FileStorageHandler, MmapStorageHandler):
+        for codec in base.get_codecs():
+            root_dir = tmp_path / f'{storage_class.__name__}_{codec}'
+            root_dir.mkdir()
+            storage = storage_class(root_dir=str(root_dir))
+            start = time.perf_counter()
+            for index in range(iterations):
+                with storage.lock(f'key_{index}'):
+                    storage.set(f'key_{index}', SETUP_RESULT, codec=codec)
+            write_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for index in range(iterations):
+                with storage.lock(f'key_{index}'):
+                    assert storage.get(f'key_{index}', codec=codec) == SETUP_RESULT
+            read_time = time.perf_counter() - start
+            size = len(storage.encode(SETUP_RESULT, codec=codec))
+            results.append((storage_class.__name__, codec, write_time, read_time, size))
+    with capsys.disabled():
+        print(f'\n{"storage":<20}{"codec":<12}{"write ms":>10}{"read ms":>10}{"bytes":>10}')
+        for storage_name, codec, write_time, read_time, size in results:
+            print(
+                f'{storage_name:<20}{codec:<12}{write_time * 1000 / iterations:>10.3f}'
+                f'{read_time * 1000 / iterations:>10.3f}{size:>10}'
+            )
@@ -110,6 +110,75 @@ class TestParseJSON:
         assert hammer.parse_json(json_output) == hammer.parse_csv(csv_ouput_lines)[0]
 
 
+def _chunks(output, size):
+    return [output[i : i + size] for i in range(0, len(output), size)]
+
+
+class TestStreamingParsers:
+    """Tests for the incremental hammer list output parsers"""
+
+    csv_output = '\n'.join(
+        [
+            'ID,Name,Content View',
+            '1,first,"multi',
+            'line, value"',
+            '',
+            '2,"""quoted""",chårs',
+            '',
+        ]
+    )
+    json_output = """[
+      {
+        "ID": 1,
+        "Name": "first",
+        "Content View": {"ID": 3, "Name": "cv [1]"}
+      },
+      {
+        "ID": 2,
+        "Name": "}, {",
+        "Content View": null
+      }
+    ]
+    """
+
+    def test_iter_csv_matches_parse_csv(self):
+        expected = hammer.parse_csv(self.csv_output)
+        assert list(hammer.iter_csv(self.csv_output)) == expected
+        for size in (1, 2, 7):
+            assert list(hammer.iter_csv(_chunks(self.csv_output, size))) == expected
+
+    def test_iter_json_matches_parse_json(self):
+        expected = hammer.parse_json(self.json_output)
+        for size in (1, 3, len(self.json_output)):
+            assert list(hammer.iter_json(_chunks(self.json_output, size))) == expected
+
+    def test_iter_json_scalar_split_across_chunks(self):
+        for chunks in (['[12', '3]'], ['[1', '2, 4', '5', '6, tr', 'ue]'], ['[1.', '5e', '3]']):
+            assert list(hammer.iter_json(chunks)) == hammer.parse_json(''.join(chunks))
+        # the last number of a list that is not closed
+        assert list(hammer.iter_json(['[12', '3'])) == list(hammer.iter_json('[123'))
+
+    def test_iter_json_single_object(self):
+        output = '{\n  "ID": 1\n}\n'
+        assert list(hammer.iter_json(_chunks(output, 4))) == [{'id': '1'}]
+
+    def test_empty_output(self):
+        assert list(hammer.iter_csv([])) == []
+        assert list(hammer.iter_json(['', '  \n'])) == []
+        assert list(hammer.iter_json('[]')) == []
+
+    def test_compact_rows(self):
+        rows = list(hammer.iter_csv(_chunks(self.csv_output, 5), row_cls=tuple))
+        assert rows[0]['name'] == 'first'
+        assert rows[1][0] == '2'
+        assert rows[1].get('missing') is None
+        assert [row.as_dict() for row in rows] == hammer.parse_csv(self.csv_output)
+        # the header is shared by all the rows of the output
+        assert type(rows[0]) is type(rows[1])
+        json_rows = list(hammer.iter_json(self.json_output, row_cls=tuple))
+        assert json_rows[0]['content-view'] == {'id': '3', 'name': 'cv [1]'}
+
+
 class TestParseHelp:
     """Tests for parsing hammer help output"""
 
@@ -182,6 +251,7 @@ class TestParseHelp:
                     'shortname': None,
                     'value': None,
                     'help': 'An option with a deprecation name',
+                    'deprecation_name': 'deprecation-name',
                 },
                 {
                     'name': 'csv',
@@ -0,0 +1,63 @@
+"""Tests for module ``robottelo.utils.host_facts``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import host_facts
+
+
+@pytest.fixture
+def facts_dir(tmp_path):
+    with (
+        mock.patch.object(host_facts, 'FACTS_DIR', tmp_path),
+        mock.patch.object(host_facts, 'settings') as settings,
+    ):
+        settings.performance.host_facts_ttl = 60
+        yield tmp_path
+
+
+class TestHostFacts:
+    def test_fact_is_read_once(self, facts_dir):
+        read = mock.Mock(return_value={'VERSION_ID': '9.6'})
+        assert host_facts.cached('sat.example.com', 'os_release', read) == {'VERSION_ID': '9.6'}
+        assert host_facts.cached('sat.example.com', 'os_release', read) == {'VERSION_ID': '9.6'}
+        read.assert_called_once()
+        assert (facts_dir / 'sat.example.com.json').exists()
+
+    def test_expired_fact_is_read_again(self, facts_dir):
+        read = mock.Mock(return_value='6.17.0')
+        with mock.patch.object(host_facts.time, 'time', return_value=1000):
+            host_facts.cached('sat.example.com', 'version', read)
+        with mock.patch.object(host_facts.time, 'time', return_value=1061):
+            host_facts.cached('sat.example.com', 'version', read)
+        assert read.call_count == 2
+
+    def test_empty_fact_is_not_stored(self, facts_dir):
+        host_facts.cached('sat.example.com', 'version', lambda: '')
+        assert host_facts.get('sat.example.com', 'version') is None
+
+    def test_invalidate(self, facts_dir):
+        host_facts.store('sat.example.com', 'version', '6.17.0')
+        host_facts.store('sat.example.com', 'is_upstream', False)
+        host_facts.invalidate('sat.example.com', 'version')
+        assert host_facts.get('sat.example.com', 'version') is None
+        assert host_facts.get('sat.example.com', 'is_upstream') is False
+        host_facts.invalidate('sat.example.com')
+        assert host_facts.get('sat.example.com', 'is_upstream') is None
+
+    def test_disabled(self, facts_dir):
+        host_facts.settings.performance.host_facts_ttl = 0
+        read = mock.Mock(return_value='6.17.0')
+        host_facts.cached('sat.example.com', 'version', read)
+        host_facts.cached('sat.example.com', 'version', read)
+        assert read.call_count == 2
+        assert not list(facts_dir.iterdir())
+
+    def test_unreachable(self, facts_dir):
+        assert not host_facts.is_unreachable('sat.example.com')
+        host_facts.set_unreachable('sat.example.com')
+        assert host_facts.is_unreachable('sat.example.com')
+        with mock.patch.object(host_facts.time, 'time', return_value=host_facts.time.time() + 301):
+            assert not host_facts.is_unreachable('sat.example.com')
+        assert not host_facts.is_unreachable(None)
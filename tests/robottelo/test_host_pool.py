@@ -0,0 +1,104 @@
+"""Tests for module ``robottelo.utils.host_pool``."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo.utils.host_pool import ContentHostPool, pool_key
+
+RHEL9 = {'workflow': 'deploy-rhel', 'deploy_rhel_version': '9'}
+RHEL8 = {'workflow': 'deploy-rhel', 'deploy_rhel_version': '8'}
+
+
+class FakeBroker:
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.checked_out = []
+        self.checked_in = []
+        self.lock = threading.Lock()
+
+    def checkout(self, conf):
+        if conf['deploy_rhel_version'] in self.fail:
+            raise Exception('no capacity')
+        host = mock.Mock(conf=conf, _skip_context_checkin=False)
+        with self.lock:
+            self.checked_out.append(host)
+        return host
+
+    def checkin(self, host):
+        with self.lock:
+            self.checked_in.append(host)
+
+
+@pytest.fixture
+def broker():
+    return FakeBroker()
+
+
+def make_pool(broker, size):
+    return ContentHostPool(size, checkout=broker.checkout, checkin=broker.checkin)
+
+
+class TestContentHostPool:
+    def test_prefill_up_to_size(self, broker):
+        pool = make_pool(broker, 3)
+        pool.add_demand(RHEL9, 5)
+        pool.add_demand(RHEL8, 1)
+        pool.close()
+        assert len(broker.checked_out) == 3
+        # the unused hosts are checked in without teardown
+        assert sorted(broker.checked_in, key=id) == sorted(broker.checked_out, key=id)
+        assert not any(host.teardown.called for host in broker.checked_in)
+
+    def test_host_from_pool(self, broker):
+        pool = make_pool(broker, 2)
+        pool.add_demand(RHEL9, 2)
+        with pool.host(RHEL9) as host:
+            assert host in broker.checked_out
+            assert host.conf == RHEL9
+        host.teardown.assert_called_once()
+        with pool.host(RHEL9):
+            pass
+        pool.close()
+        # both hosts came from the pool, and none is left
+        assert len(broker.checked_out) == 2
+        assert len(broker.checked_in) == 2
+
+    def test_surplus_checked_in(self, broker):
+        pool = make_pool(broker, 4)
+        pool.add_demand(RHEL9, 3)
+        with pool.host(RHEL9):
+            pass
+        # the last test of this configuration runs on another worker
+        key = pool_key(RHEL9)
+        with pool._condition:
+            pool._demand[key] = 0
+            pool._condition.wait_for(lambda: not pool._provisioning[key])
+        with pool.host(RHEL9):
+            pass
+        assert not pool._ready[key]
+        pool.close()
+        assert len(broker.checked_in) == len(broker.checked_out) == 3
+
+    def test_skip_context_checkin(self, broker):
+        pool = make_pool(broker, 1)
+        pool.add_demand(RHEL9, 1)
+        with pool.host(RHEL9) as host:
+            # kept for the post upgrade tests
+            host._skip_context_checkin = True
+        pool.close()
+        host.teardown.assert_called_once()
+        assert broker.checked_in == []
+
+    def test_failed_checkout(self):
+        broker = FakeBroker(fail=('8',))
+        pool = make_pool(broker, 2)
+        pool.add_demand(RHEL8, 2)
+        with pytest.raises(Exception, match='no capacity'), pool.host(RHEL8):
+            pass
+        # the test would check out its host itself, which works again for RHEL 9
+        with pool.host(RHEL9) as host:
+            assert host.conf == RHEL9
+        pool.close()
+        assert broker.checked_in == [host]
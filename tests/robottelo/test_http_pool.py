@@ -0,0 +1,135 @@
+"""Tests for module ``robottelo.utils.http_pool``."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo.utils.http_pool import HTTPSessionPool, LatencyHistogram, NailgunTransport
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append((self.client_address, self.headers.get('Cookie')))
+        self.send_response(200)
+        self.send_header('Set-Cookie', '_session_id=admin; Path=/')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def do_POST(self):
+        self.server.requests.append((self.client_address, self.headers.get('Cookie')))
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RecordingHandler)
+    httpd.requests = []
+    httpd.statuses = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestHTTPSessionPool:
+    def test_connection_is_kept_alive(self, server):
+        pool = HTTPSessionPool(maxsize=2)
+        url = f'http://127.0.0.1:{server.server_port}'
+        for _ in range(3):
+            assert pool.request('GET', f'{url}/api/status').text == 'ok'
+        assert len({client for client, _ in server.requests}) == 1
+        assert pool.session(f'{url}/api/hosts') is pool.session(url)
+        pool.close_all()
+
+    def test_cookies_are_not_stored(self, server):
+        pool = HTTPSessionPool()
+        url = f'http://127.0.0.1:{server.server_port}/api/status'
+        pool.request('GET', url)
+        pool.request('GET', url)
+        assert [cookie for _, cookie in server.requests] == [None, None]
+        pool.close_all()
+
+    def test_one_session_per_server(self):
+        pool = HTTPSessionPool()
+        assert pool.session('https://sat1.example.com/api') is not pool.session(
+            'https://sat2.example.com/api'
+        )
+
+    def test_throttled_requests_are_retried(self, server):
+        pool = HTTPSessionPool(retries=2, backoff_factor=0)
+        url = f'http://127.0.0.1:{server.server_port}/api/hosts'
+        server.statuses = [429, 429]
+        assert pool.request('POST', url, data='{}').status_code == 200
+        assert len(server.requests) == 3
+
+    def test_unavailable_post_is_not_retried(self, server):
+        pool = HTTPSessionPool(retries=2, backoff_factor=0)
+        url = f'http://127.0.0.1:{server.server_port}/api/hosts'
+        server.statuses = [503]
+        assert pool.request('POST', url, data='{}').status_code == 503
+        assert len(server.requests) == 1
+
+    def test_latency_is_recorded_per_endpoint(self, server):
+        pool = HTTPSessionPool()
+        url = f'http://127.0.0.1:{server.server_port}'
+        pool.request('GET', f'{url}/api/hosts/1')
+        pool.request('GET', f'{url}/api/hosts/2?per_page=1')
+        latency = pool.stats()['latency']
+        assert list(latency) == ['GET /api/hosts/:id']
+        assert latency['GET /api/hosts/:id']['count'] == 2
+        pool.close_all()
+
+
+class TestLatencyHistogram:
+    def test_endpoint(self):
+        assert (
+            LatencyHistogram.endpoint(
+                'PUT', 'https://sat/api/v2/hosts/12/parameters/3e4a0c9d-1c2b-4f4e-9d8a-123456789abc'
+            )
+            == 'PUT /api/v2/hosts/:id/parameters/:id'
+        )
+        assert LatencyHistogram.endpoint('GET', 'https://sat/api/v2/hosts') == 'GET /api/v2/hosts'
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.01, 0.02, 0.2, 0.3, 7):
+            histogram.record('GET /api/status', seconds)
+        stats = histogram.stats()['GET /api/status']
+        assert stats['count'] == 5
+        assert stats['p50'] == 0.25
+        assert stats['p95'] == 10
+        assert stats['buckets'][0.05] == 2
+
+
+class TestNailgunTransport:
+    @mock.patch('robottelo.utils.http_pool.get_pool')
+    def test_shortcuts_use_the_pool(self, get_pool):
+        transport = NailgunTransport()
+        transport.get('https://sat.example.com/api/hosts', {'per_page': 1}, verify=False)
+        get_pool.return_value.request.assert_called_once_with(
+            'GET', 'https://sat.example.com/api/hosts', params={'per_page': 1}, verify=False
+        )
+        transport.post('https://sat.example.com/api/hosts', data='{}')
+        get_pool.return_value.request.assert_called_with(
+            'POST', 'https://sat.example.com/api/hosts', data='{}', json=None
+        )
+
+    def test_other_attributes_come_from_requests(self):
+        import requests
+
+        assert NailgunTransport().HTTPError is requests.HTTPError
@@ -0,0 +1,230 @@
+"""Tests for the Jira API calls of module ``robottelo.utils.issue_handlers.jira``."""
+
+import multiprocessing
+import re
+from unittest import mock
+
+import pytest
+import requests
+from wait_for import TimedOutError
+
+from robottelo.utils.issue_handlers import jira
+
+
+def issue(key):
+    return {
+        'key': key,
+        'fields': {
+            'summary': f'Summary of {key}',
+            'status': {'name': 'New'},
+            'labels': [],
+            'resolution': None,
+            'fixVersions': [],
+            'customfield_12313440': 2.0,
+        },
+    }
+
+
+class FakeJira:
+    """Answer the search requests from a set of issues, one page of ``max_results`` at a time
+
+    The first requests are throttled, then fail with the exceptions or status codes of
+    ``failures``. Other requests than searches are answered with an empty 201.
+    """
+
+    def __init__(self, keys, throttled=0, failures=()):
+        self.issues = {key: issue(key) for key in keys}
+        self.throttled = throttled
+        self.failures = list(failures)
+        self.requests = []
+
+    def request(self, method, url, timeout, params=None, json=None):
+        assert timeout
+        self.requests.append(params or json)
+        response = mock.Mock(headers={})
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            response.status_code = failure
+            response.raise_for_status.side_effect = requests.HTTPError(str(failure))
+            return response
+        if self.throttled:
+            self.throttled -= 1
+            response.status_code = 429
+            response.headers = {'Retry-After': '0.01'}
+            return response
+        if method != 'GET':
+            response.status_code = 201
+            return response
+        keys = re.findall(r'id = (\S+)', params['jql'])
+        matching = [self.issues[key] for key in keys if key in self.issues]
+        start = params['startAt']
+        response.status_code = 200
+        response.json.return_value = {
+            'total': len(matching),
+            'issues': matching[start : start + params['maxResults']],
+        }
+        return response
+
+
+@pytest.fixture
+def fake_jira(monkeypatch):
+    settings = mock.Mock()
+    settings.jira.chunk_size = 3
+    settings.jira.max_results = 2
+    settings.jira.max_workers = 2
+    monkeypatch.setattr(jira, 'settings', settings)
+    monkeypatch.setattr(jira, 'JIRA_BACKOFF', 0)
+
+    def make(keys, throttled=0, failures=()):
+        fake = FakeJira(keys, throttled, failures)
+        session = mock.Mock(request=fake.request)
+        monkeypatch.setattr(jira, 'jira_session', lambda: (session, jira.TokenBucket(1000)))
+        return fake
+
+    return make
+
+
+class TestJiraFetch:
+    def test_chunks_and_pages(self, fake_jira):
+        keys = [f'SAT-{number}' for number in range(7)]
+        fake = fake_jira(keys)
+        issues = jira.fetch_jira_issues(keys + ['SAT-404'], jira.common_jira_fields)
+        assert sorted(found['key'] for found in issues) == sorted(keys)
+        # 3 chunks of at most 3 issues, each of at most 2 pages of 2 issues
+        assert all(len(re.findall('id = ', params['jql'])) <= 3 for params in fake.requests)
+        assert len({params['jql'] for params in fake.requests}) == 3
+        assert len(fake.requests) == 5
+
+    def test_bulk_custom_fields(self, fake_jira, monkeypatch):
+        fake_jira(['SAT-1', 'SAT-2'])
+        update_many = mock.Mock()
+        monkeypatch.setattr(jira.jira_cache, 'update_many', update_many)
+        data = jira.get_data_jira_bulk([' SAT-2', 'SAT-1 ', 'SAT-2'], ['customfield_12313440'])
+        assert data == {
+            'SAT-1': {'key': 'SAT-1', 'customfield_12313440': 2.0},
+            'SAT-2': {'key': 'SAT-2', 'customfield_12313440': 2.0},
+        }
+        # the custom fields are not cached with the issue statuses
+        update_many.assert_not_called()
+
+    def test_throttled(self, fake_jira):
+        fake = fake_jira(['SAT-1'], throttled=2)
+        assert [found['key'] for found in jira.fetch_jira_issues(['SAT-1'])] == ['SAT-1']
+        assert len(fake.requests) == 3
+
+    def test_throttled_too_long(self, fake_jira):
+        fake_jira(['SAT-1'], throttled=jira.JIRA_ATTEMPTS)
+        with pytest.raises(TimedOutError):
+            jira.fetch_jira_issues(['SAT-1'])
+
+    def test_failed_requests_retried(self, fake_jira):
+        failures = [requests.ConnectionError('reset'), requests.Timeout('read'), 503]
+        fake = fake_jira(['SAT-1'], failures=failures)
+        assert [found['key'] for found in jira.fetch_jira_issues(['SAT-1'])] == ['SAT-1']
+        assert len(fake.requests) == 4
+
+    def test_failing_too_long(self, fake_jira):
+        fake_jira(['SAT-1'], failures=[502] * jira.JIRA_ATTEMPTS)
+        with pytest.raises(TimedOutError):
+            jira.fetch_jira_issues(['SAT-1'])
+
+    def test_client_error_not_retried(self, fake_jira):
+        fake = fake_jira(['SAT-1'], failures=[404])
+        with pytest.raises(requests.HTTPError):
+            jira.fetch_jira_issues(['SAT-1'])
+        assert len(fake.requests) == 1
+
+    @pytest.mark.parametrize('failure', [requests.ReadTimeout('read'), 502])
+    def test_comment_not_sent_twice(self, fake_jira, failure):
+        """A comment which may have been added is not posted again"""
+        fake = fake_jira([], failures=[failure])
+        with pytest.raises((requests.ReadTimeout, requests.HTTPError)):
+            jira.jira_request('POST', 'issue/SAT-1/comment', json={'body': 'passed'})
+        assert len(fake.requests) == 1
+
+    def test_comment_retried_when_not_sent(self, fake_jira):
+        fake = fake_jira([], throttled=1, failures=[requests.ConnectTimeout('connect')])
+        response = jira.jira_request('POST', 'issue/SAT-1/comment', json={'body': 'passed'})
+        assert response.status_code == 201
+        assert len(fake.requests) == 3
+
+
+class TestTokenBucket:
+    def test_rate(self):
+        bucket = jira.TokenBucket(rate=100, capacity=1)
+        with mock.patch.object(jira.time, 'sleep', wraps=jira.time.sleep) as sleep:
+            for _ in range(3):
+                bucket.acquire()
+        assert sleep.call_count >= 2
+
+    def test_pause(self):
+        bucket = jira.TokenBucket(rate=1000)
+        bucket.pause(0.05)
+        start = jira.time.monotonic()
+        bucket.acquire()
+        assert jira.time.monotonic() - start >= 0.05
+
+
+@pytest.fixture
+def jira_cache(monkeypatch, tmp_path):
+    settings = mock.Mock()
+    settings.jira.cache_file = str(tmp_path / 'jira_status_cache.json')
+    settings.jira.cache_ttl_days = 7
+    settings.jira.cache_refresh_hours = 0
+    settings.jira.api_key = None
+    monkeypatch.setattr(jira, 'settings', settings)
+    return jira.JiraStatusCache()
+
+
+class TestJiraStatusCache:
+    def test_update_many(self, jira_cache):
+        jira_cache.update_many({'SAT-1': {'key': 'SAT-1'}, 'SAT-2': {'key': 'SAT-2'}})
+        jira_cache.update('SAT-1', {'key': 'SAT-1', 'status': 'Closed'})
+        cached = jira_cache.get_many(['SAT-1', 'SAT-2', 'SAT-3'])
+        assert cached['SAT-1']['data'] == {'key': 'SAT-1', 'status': 'Closed'}
+        assert cached['SAT-2']['data'] == {'key': 'SAT-2'}
+        assert cached['SAT-3'] is None
+        # another process sees the updates
+        assert jira.JiraStatusCache().get('SAT-2')['data'] == {'key': 'SAT-2'}
+
+    def test_concurrent_processes(self, jira_cache):
+        def update(index):
+            jira_cache.update_many({f'SAT-{index}-{n}': {'n': n} for n in range(50)})
+
+        processes = [
+            multiprocessing.get_context('fork').Process(target=update, args=(index,))
+            for index in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        cached = jira_cache.get_many([f'SAT-{index}-{n}' for index in range(4) for n in range(50)])
+        assert all(value is not None for value in cached.values())
+
+    def test_expired(self, jira_cache):
+        jira_cache.update('SAT-1', {'key': 'SAT-1'})
+        jira_cache._db.execute('UPDATE issues SET timestamp = 0')
+        assert jira_cache.get('SAT-1') is None
+        jira_cache._set_meta('last_sweep', 0)
+        jira_cache._sweep()
+        assert jira_cache._db.execute('SELECT COUNT(*) FROM issues').fetchone() == (0,)
+
+    def test_json_export_and_import(self, jira_cache):
+        jira_cache.update('SAT-1', {'key': 'SAT-1'})
+        jira_cache.save()
+        jira_cache.db_file.unlink()
+        assert jira.JiraStatusCache().get('SAT-1')['data'] == {'key': 'SAT-1'}
+
+    def test_background_refresh(self, jira_cache):
+        jira_cache.update('SAT-1', {'key': 'SAT-1', 'status': 'New'})
+        jira_cache._db.execute('UPDATE issues SET timestamp = timestamp - 7200')
+        jira.settings.jira.cache_refresh_hours = 1
+        jira.settings.jira.api_key = 'key'
+        with mock.patch.object(jira, 'fetch_jira_issues', return_value=[issue('SAT-1')]):
+            # the stale entry is returned meanwhile
+            assert jira_cache.get('SAT-1')['data']['status'] == 'New'
+            jira_cache._refresh_thread.join()
+        assert jira_cache.get('SAT-1')['data']['summary'] == 'Summary of SAT-1'
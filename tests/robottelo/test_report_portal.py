@@ -0,0 +1,72 @@
+"""Tests for module ``robottelo.utils.report_portal.portal``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo.utils.report_portal import portal
+
+LAUNCH = {'id': 1, 'uuid': '3d3b198b-4c8a-424e-98a8-8c3c3114100a'}
+
+
+class FakeSession:
+    """Answer the test items requests from ``count`` tests, ``page.size`` at a time"""
+
+    def __init__(self, count):
+        self.tests = [
+            {'name': f'tests/foreman/api/test_a.py::test_{index:03}', 'status': 'FAILED'}
+            for index in range(count)
+        ]
+        self.headers = {}
+        self.pages = []
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, params=None):
+        response = mock.Mock()
+        if url.endswith('/item'):
+            self.pages.append(params['page.page'])
+            size = params['page.size']
+            start = (params['page.page'] - 1) * size
+            response.json.return_value = {
+                'content': self.tests[start : start + size],
+                'page': {'totalPages': -(-len(self.tests) // size)},
+            }
+        return response
+
+
+@pytest.fixture
+def report_portal(monkeypatch, tmp_path):
+    settings = mock.Mock()
+    settings.report_portal.page_size = 10
+    settings.report_portal.max_workers = 3
+    settings.report_portal.cache_ttl = 0
+    monkeypatch.setattr(portal, 'settings', settings)
+    monkeypatch.setattr(portal, 'CACHE_DIR', tmp_path)
+    session = FakeSession(95)
+    monkeypatch.setattr(portal.requests, 'Session', lambda: session)
+    return portal.ReportPortal(rp_url='https://rp.example.com', rp_api_key='key', rp_project='p')
+
+
+class TestReportPortal:
+    def test_get_tests_pages(self, report_portal):
+        tests = report_portal.get_tests(launch=LAUNCH, fields=['name'], status=['failed'])
+        assert tests == [{'name': test['name']} for test in report_portal.session.tests]
+        assert sorted(report_portal.session.pages) == list(range(1, 11))
+        # the first page is fetched first, to learn the number of pages
+        assert report_portal.session.pages[0] == 1
+
+    def test_get_tests_paths(self, report_portal):
+        tests = report_portal.get_tests(launch=LAUNCH, paths=['test_a.py::test_01'])
+        assert len(tests) == 10
+        assert tests[0]['status'] == 'FAILED'
+
+    def test_get_tests_cache(self, report_portal):
+        portal.settings.report_portal.cache_ttl = 3600
+        tests = report_portal.get_tests(launch=LAUNCH, status=['failed'])
+        assert report_portal.get_tests(launch=LAUNCH, status=['failed']) == tests
+        assert len(report_portal.session.pages) == 10
+        # other filters are cached apart
+        report_portal.get_tests(launch=LAUNCH, status=['skipped'])
+        assert len(report_portal.session.pages) == 20
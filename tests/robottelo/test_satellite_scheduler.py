@@ -0,0 +1,77 @@
+"""Tests for module ``robottelo.utils.satellite_scheduler``."""
+
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import satellite_scheduler
+
+HOSTNAMES = ['sat1.example.com', 'sat2.example.com']
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    probes = {hostname: {'tasks': 0, 'load': 0.0} for hostname in HOSTNAMES}
+    with (
+        mock.patch.object(satellite_scheduler, 'SCHEDULER_DIR', tmp_path),
+        mock.patch.object(satellite_scheduler, 'settings') as settings,
+        mock.patch.object(
+            satellite_scheduler,
+            'probe',
+            side_effect=lambda hostname: dict(
+                probes[hostname], time=satellite_scheduler.time.time()
+            ),
+        ) as probe,
+    ):
+        settings.server.scheduler.probe_interval = 60
+        settings.server.scheduler.weights = {}
+        settings.server.scheduler.rebalance_threshold = 1
+        probe.probes = probes
+        yield probe
+
+
+class TestSatelliteScheduler:
+    def test_workers_spread(self, scheduler):
+        assigned = [
+            satellite_scheduler.assign('run', f'gw{index}', HOSTNAMES) for index in range(4)
+        ]
+        assert sorted(assigned) == sorted(HOSTNAMES * 2)
+        # probed once per interval
+        assert scheduler.call_count == 2
+
+    def test_running_tasks_and_load(self, scheduler):
+        scheduler.probes['sat1.example.com'] = {'tasks': 20, 'load': 1.5}
+        assigned = [
+            satellite_scheduler.assign('run', f'gw{index}', HOSTNAMES) for index in range(3)
+        ]
+        assert assigned == ['sat2.example.com'] * 3
+
+    def test_weights(self, scheduler):
+        satellite_scheduler.settings.server.scheduler.weights = {'large': 3}
+        assigned = [
+            satellite_scheduler.assign(
+                'run', f'gw{index}', HOSTNAMES, flavors={'sat1.example.com': 'large'}
+            )
+            for index in range(4)
+        ]
+        assert assigned.count('sat1.example.com') == 3
+
+    def test_rebalance(self, scheduler):
+        for index in range(4):
+            satellite_scheduler.assign('run', f'gw{index}', HOSTNAMES)
+        # sat1 runs the tests three times slower
+        satellite_scheduler.report('run', 'sat1.example.com', 30, 10)
+        satellite_scheduler.report('run', 'sat2.example.com', 10, 10)
+        moved = {
+            worker_id: satellite_scheduler.rebalance('run', worker_id, HOSTNAMES)
+            for worker_id in ('gw0', 'gw1', 'gw2', 'gw3')
+        }
+        assert list(moved.values()).count('sat2.example.com') == 3
+        satellite_scheduler.settings.server.scheduler.rebalance_threshold = 0
+        assert satellite_scheduler.rebalance('run', 'gw0', HOSTNAMES) is None
+
+    def test_release(self, scheduler):
+        satellite_scheduler.assign('run', 'gw0', HOSTNAMES)
+        satellite_scheduler.release('run', 'gw0')
+        with satellite_scheduler._locked_state('run') as state:
+            assert state['workers'] == {}
@@ -1,10 +1,12 @@
 import multiprocessing
 from pathlib import Path
 import random
-from threading import Thread
+from threading import Thread, Timer
 import time
 
-from robottelo.utils.shared_resource import SharedResource
+import pytest
+
+from robottelo.utils.shared_resource import FileCoordinationBackend, SharedResource
 
 
 def upgrade_action(*args, **kwargs):
@@ -67,3 +69,52 @@ def test_shared_resource_multithreading():
     t2.join()
 
     assert not Path("/tmp/test_resource_th.shared").exists()
+
+
+def test_file_backend_reads_changes_incrementally():
+    """The file backend appends every change and replays only the new ones."""
+    main, other = FileCoordinationBackend("test_backend"), FileCoordinationBackend("test_backend")
+    try:
+        assert main.register("1")
+        assert not other.register("2")
+        other.set_status("2", "ready")
+        assert main.state()["statuses"] == {"1": "pending", "2": "ready"}
+        offset = main._offset
+        main.set_status("1", "ready")
+        assert main.state()["statuses"]["1"] == "ready"
+        assert main._offset > offset
+        assert len(main.path.read_text().splitlines()) == 5
+    finally:
+        main.remove()
+    with pytest.raises(FileNotFoundError):
+        other.state()
+
+
+def test_file_backend_take_over():
+    """Only the first watcher taking over after an action error becomes the main watcher."""
+    backends = [FileCoordinationBackend("test_take_over") for _ in range(3)]
+    try:
+        for watcher_id, backend in enumerate(backends):
+            backend.register(str(watcher_id))
+        assert not backends[1].take_over("1")
+        backends[0].set_main_status("action_error")
+        assert backends[1].take_over("1")
+        assert not backends[2].take_over("2")
+        assert backends[0].state()["main_watcher"] == "1"
+        assert backends[0].state()["main_status"] == "recovering"
+    finally:
+        backends[0].remove()
+
+
+def test_file_backend_wait_is_woken_up():
+    """Waiting processes are woken up by the change, not by the timeout."""
+    waiter, setter = FileCoordinationBackend("test_wait"), FileCoordinationBackend("test_wait")
+    try:
+        waiter.register("1")
+        Timer(0.2, setter.set_main_status, args=("done",)).start()
+        start = time.monotonic()
+        state = waiter.wait_until(lambda state: state["main_status"] == "done", timeout=30)
+        assert state["main_status"] == "done"
+        assert time.monotonic() - start < 5
+    finally:
+        waiter.remove()
@@ -1,8 +1,13 @@
 """Tests for module ``robottelo.utils.ssh``."""
 
+import threading
+import time
 from unittest import mock
 
+import pytest
+
 from robottelo import ssh
+from robottelo.utils.ssh_pool import SSHConnectionPool
 
 
 class MockChannel:
@@ -99,6 +104,188 @@ class TestSSH:
         settings.server.ssh_password = 'test_password'
         settings.server.ssh_client.command_timeout = 300000
         settings.server.ssh_client.connection_timeout = 10000
+        settings.server.ssh_client.pool.enabled = False
 
         ret = ssh.command('ls -la')
         assert ret[1].cmd == 'ls -la'
+
+
+class MockPooledHost(MockSSHClient):
+    """A mock host counting its ssh sessions, as used by the connection pool."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.hostname = kwargs.get('hostname')
+        self.session_ = 0
+        self.healthy = True
+
+    @property
+    def session(self):
+        self.session_ += 1
+        return self
+
+    def execute(self, cmd, *args, **kwargs):
+        if not self.healthy:
+            raise ConnectionError('connection is gone')
+        return mock.Mock(status=0, stdout=cmd)
+
+
+class TestSSHConnectionPool:
+    """Tests for class ``robottelo.utils.ssh_pool.SSHConnectionPool``."""
+
+    @pytest.fixture
+    def pool(self):
+        return SSHConnectionPool(MockPooledHost, max_channels=2, keepalive_interval=0)
+
+    def test_connection_reused(self, pool):
+        for _ in range(3):
+            with pool.connection(hostname='example.com', username='root') as client:
+                client.execute('ls')
+        stats = pool.stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 2
+        assert stats['handshakes'] == 1
+        assert stats['connections'] == 1
+
+    def test_connection_per_key(self, pool):
+        clients = []
+        for client_kwargs in (
+            {'username': 'root'},
+            {'username': 'admin'},
+            {'username': 'root', 'port': 22},
+            {'username': 'root', 'password': 'other'},
+        ):
+            with pool.connection(hostname='example.com', **client_kwargs) as client:
+                clients.append(client)
+        first, second, third, fourth = clients
+        assert first is not second
+        assert first is third
+        assert fourth is not first
+        assert pool.stats()['connections'] == 3
+
+    def test_commands_serialized(self, pool):
+        running = []
+        overlaps = []
+
+        def run():
+            with pool.connection(hostname='example.com') as client:
+                running.append(client)
+                overlaps.append(running.count(client))
+                time.sleep(0.01)
+                running.remove(client)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # max_channels=2 lets two threads share a connection, but not run at once on it
+        assert max(overlaps) == 1
+
+    def test_max_channels(self, pool):
+        conns = [pool.acquire(hostname='example.com') for _ in range(3)]
+        assert conns[0] is conns[1]
+        assert conns[2] is not conns[0]
+        for conn in conns:
+            pool.release(conn)
+        assert pool.stats()['connections'] == 2
+
+    def test_unhealthy_connection_replaced(self, pool):
+        with pool.connection(hostname='example.com') as client:
+            pass
+        client.healthy = False
+        with pool.connection(hostname='example.com') as new_client:
+            pass
+        assert new_client is not client
+        stats = pool.stats()
+        assert stats['health_check_failures'] == 1
+        assert stats['evictions'] == 1
+        assert stats['connections'] == 1
+
+    def test_failed_command_discards_connection(self, pool):
+        with (  # noqa: PT012
+            pytest.raises(ConnectionError),
+            pool.connection(hostname='example.com') as client,
+        ):
+            client.healthy = False
+            client.execute('ls')
+        assert pool.stats()['connections'] == 0
+
+    def test_idle_eviction(self, pool):
+        pool.idle_timeout = 0
+        conn = pool.acquire(hostname='example.com')
+        # a borrowed connection is never closed under its user
+        pool.evict_idle()
+        assert pool.stats()['connections'] == 1
+        pool.release(conn)
+        pool.evict_idle()
+        assert pool.stats()['connections'] == 0
+
+
+class MockStreamChannel:
+    """A non-blocking channel answering reads of each stream from a script, ``None`` is EAGAIN."""
+
+    def __init__(self, stdout, stderr):
+        self.stdout = list(stdout)
+        self.stderr = list(stderr)
+
+    def execute(self, cmd):
+        self.cmd = cmd
+
+    @staticmethod
+    def _read(script):
+        if not script:
+            return 0, b''
+        data = script.pop(0)
+        return (-37, b'') if data is None else (len(data), data)
+
+    def read(self):
+        return self._read(self.stdout)
+
+    def read_stderr(self):
+        return self._read(self.stderr)
+
+    def eof(self):
+        return not (self.stdout or self.stderr)
+
+    def close(self):
+        pass
+
+    def wait_closed(self):
+        pass
+
+    def get_exit_status(self):
+        return 0
+
+
+class TestCommandStream:
+    """Tests for class ``robottelo.ssh.CommandStream``."""
+
+    def test_streams_read_in_turn(self):
+        # stdout only goes on once stderr has been read
+        channel = MockStreamChannel([b'a', None, None, b'b\xc3', b'\xa9'], [b'x' * 10, b'y'])
+        raw_session = mock.Mock(
+            **{'get_timeout.return_value': 5, 'get_blocking.return_value': True}
+        )
+        raw_session.open_session.return_value = channel
+        client = mock.Mock(
+            hostname='example.com', default_timeout=1000, session=mock.Mock(sock=None)
+        )
+        command = ssh.CommandStream('ls')
+        assert ''.join(command._read_channel(client, raw_session)) == 'abé'
+        assert command.stderr == 'x' * 10 + 'y'
+        assert command.status == 0
+        # the pooled session is given back as it was
+        assert raw_session.set_timeout.call_args_list[-1] == mock.call(5)
+        assert raw_session.set_blocking.call_args_list[-1] == mock.call(True)
+
+    def test_timeout(self):
+        channel = MockStreamChannel([None] * 100, [None] * 100)
+        raw_session = mock.Mock(
+            **{'get_timeout.return_value': 0, 'get_blocking.return_value': True}
+        )
+        raw_session.open_session.return_value = channel
+        client = mock.Mock(hostname='example.com', default_timeout=1, session=mock.Mock(sock=None))
+        with pytest.raises(TimeoutError):
+            list(ssh.CommandStream('sleep 10')._read_channel(client, raw_session))
+        assert raw_session.set_timeout.call_args_list[-1] == mock.call(0)